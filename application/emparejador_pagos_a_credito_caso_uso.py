@@ -1,8 +1,9 @@
 # application/emparejador_pagos_a_credito_caso_uso.py
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple
 from application.ports.interfaces import (
     AbstractExtractorPagos,
     AbstractGeneradorReporte,
@@ -10,6 +11,10 @@ from application.ports.interfaces import (
 )
 from domain.models.models import Cliente, Pago, Pedido
 from domain.services.aplicador_de_pagos import AplicadorDePagos
+from domain.services.indice_nit import IndiceNit
+
+# Tipos de cuenta que procesa ejecutar_todas por defecto, en orden
+TIPOS_CUENTA = ("ahorros", "corriente")
 
 
 class EmparejadorPagosACreditoCasoUso:
@@ -23,6 +28,10 @@ class EmparejadorPagosACreditoCasoUso:
     - repositorio_pedidos: Interfaz para el acceso a los pedidos.
     - generador_reporte: Interfaz para la generación de reportes.
     - aplicador_pagos: Servicio de dominio para aplicar pagos a los pedidos.
+    - materializacion_perezosa: Si es True, sólo se piden al repositorio los pedidos de los
+      NIT que aparecen en los pagos (incluidas sus variantes con DV), en lugar de toda la cartera.
+    - solapar_descarga_pedidos: Si es True (y no hay materialización perezosa), los pedidos se
+      descargan en un hilo aparte mientras se extraen los pagos del extracto.
     """
 
     def __init__(
@@ -31,11 +40,15 @@ class EmparejadorPagosACreditoCasoUso:
         repositorio_pedidos: AbstractRepositorioPedidos,
         generador_reporte: AbstractGeneradorReporte,
         aplicador_pagos: AplicadorDePagos,  # Inyectamos el servicio de dominio
+        materializacion_perezosa: bool = False,
+        solapar_descarga_pedidos: bool = False,
     ):
         self.extractor_pagos = extractor_pagos
         self.repositorio_pedidos = repositorio_pedidos
         self.generador_reporte = generador_reporte
         self.aplicador_pagos = aplicador_pagos
+        self.materializacion_perezosa = bool(materializacion_perezosa)
+        self.solapar_descarga_pedidos = bool(solapar_descarga_pedidos)
 
     def ejecutar(self, fecha_pago: date, tipo_cuenta: str) -> None:
         """
@@ -43,26 +56,129 @@ class EmparejadorPagosACreditoCasoUso:
         Extrae los pagos, obtiene los pedidos de crédito y aplica los pagos a los pedidos.
         Genera un reporte con los resultados.
         """
-        tipo_cuenta = tipo_cuenta.lower()
-        if tipo_cuenta not in ["ahorros", "corriente"]:
-            raise ValueError("Tipo de cuenta no válido. Debe ser 'ahorros' o 'corriente'.")
+        tipo_cuenta = self._validar_tipo_cuenta(tipo_cuenta)
 
         # 1. Obtener pagos y pedidos
-        pagos: List[Pago] = self.extractor_pagos.obtener_pagos(fecha_pago, tipo_cuenta)
-        pedidos: List[Pedido] = self.repositorio_pedidos.obtener_pedidos_credito()
+        pagos_por_cuenta, pedidos = self._obtener_pagos_y_pedidos(fecha_pago, [tipo_cuenta])
 
         # 2. Agrupar pedidos por NIT de cliente
+        pedidos_por_cliente = self._agrupar_por_cliente(pedidos)
+
+        # Índice de variantes del NIT (con DV o ceros a la izquierda) hacia el NIT de los pedidos
+        indice_nit = IndiceNit(pedidos_por_cliente.keys())
+
+        self._emparejar(pagos_por_cuenta[tipo_cuenta], pedidos_por_cliente, indice_nit, tipo_cuenta, copiar=False)
+
+    def ejecutar_todas(self, fecha_pago: date, tipos_cuenta: Sequence[str] = TIPOS_CUENTA) -> None:
+        """
+        Ejecuta el caso de uso para varios tipos de cuenta de la misma fecha con un solo
+        contexto de datos: los pedidos (y la cartera del repositorio) se obtienen una vez, y
+        la agrupación por NIT y el IndiceNit se construyen una vez, para todas las pasadas.
+        Con materialización perezosa se piden los pedidos de los NIT que pagan en cualquiera
+        de las cuentas.
+
+        El AplicadorDePagos modifica los pedidos en sitio, así que cada pasada trabaja sobre
+        copias profundas de los pedidos de los clientes que pagan (la última, sobre los originales).
+
+        Si falla la extracción de una cuenta (p. ej. no hay extracto de corriente ese día), se
+        registra y se procesan las demás; sólo si fallan todas se propaga el error.
+        """
+        tipos_cuenta = [self._validar_tipo_cuenta(tipo_cuenta) for tipo_cuenta in tipos_cuenta]
+        pagos_por_cuenta, pedidos = self._obtener_pagos_y_pedidos(fecha_pago, tipos_cuenta, tolerar_fallos=True)
+        pedidos_por_cliente = self._agrupar_por_cliente(pedidos)
+        indice_nit = IndiceNit(pedidos_por_cliente.keys())
+        tipos_extraidos = [tipo_cuenta for tipo_cuenta in tipos_cuenta if tipo_cuenta in pagos_por_cuenta]
+        for numero, tipo_cuenta in enumerate(tipos_extraidos):
+            self._emparejar(
+                pagos_por_cuenta[tipo_cuenta], pedidos_por_cliente, indice_nit, tipo_cuenta,
+                copiar=numero < len(tipos_extraidos) - 1,
+            )
+
+    @staticmethod
+    def _validar_tipo_cuenta(tipo_cuenta: str) -> str:
+        tipo_cuenta = tipo_cuenta.lower()
+        if tipo_cuenta not in TIPOS_CUENTA:
+            raise ValueError("Tipo de cuenta no válido. Debe ser 'ahorros' o 'corriente'.")
+        return tipo_cuenta
+
+    def _extraer_pagos(
+        self, fecha_pago: date, tipos_cuenta: Sequence[str], tolerar_fallos: bool = False
+    ) -> Dict[str, List[Pago]]:
+        """
+        Pagos de cada tipo de cuenta. Con tolerar_fallos, una cuenta cuya extracción falla se
+        registra y se omite del resultado; si fallan todas se propaga el último error.
+        """
+        pagos_por_cuenta: Dict[str, List[Pago]] = {}
+        ultimo_error = None
+        for tipo_cuenta in tipos_cuenta:
+            try:
+                pagos_por_cuenta[tipo_cuenta] = self.extractor_pagos.obtener_pagos(fecha_pago, tipo_cuenta)
+            except Exception as e:
+                if not tolerar_fallos:
+                    raise
+                print(f"Error extrayendo los pagos de {tipo_cuenta} ({fecha_pago}): {e}. Se continúa con las demás cuentas.")
+                ultimo_error = e
+        if ultimo_error is not None and not pagos_por_cuenta:
+            raise ultimo_error
+        return pagos_por_cuenta
+
+    def _obtener_pagos_y_pedidos(
+        self, fecha_pago: date, tipos_cuenta: Sequence[str], tolerar_fallos: bool = False
+    ) -> Tuple[Dict[str, List[Pago]], List[Pedido]]:
+        """Extrae los pagos de cada tipo de cuenta y obtiene los pedidos con una sola consulta al repositorio."""
+        if self.solapar_descarga_pedidos and not self.materializacion_perezosa:
+            # La descarga (E/S) avanza mientras se extraen los extractos
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                descarga = pool.submit(self.repositorio_pedidos.obtener_pedidos_credito)
+                pagos_por_cuenta = self._extraer_pagos(fecha_pago, tipos_cuenta, tolerar_fallos)
+                return pagos_por_cuenta, descarga.result()
+
+        pagos_por_cuenta = self._extraer_pagos(fecha_pago, tipos_cuenta, tolerar_fallos)
+        if self.materializacion_perezosa:
+            # NIT canónicos posibles de cada pago: la referencia normalizada y, si termina en
+            # un DV válido, la referencia sin él
+            nits_pagadores = {
+                candidato
+                for pagos in pagos_por_cuenta.values()
+                for pago in pagos
+                for candidato in IndiceNit.candidatos(pago.nit_cliente)
+            }
+            return pagos_por_cuenta, self.repositorio_pedidos.obtener_pedidos_credito_para_nits(nits_pagadores)
+        return pagos_por_cuenta, self.repositorio_pedidos.obtener_pedidos_credito()
+
+    @staticmethod
+    def _agrupar_por_cliente(pedidos: List[Pedido]) -> Dict[str, List[Pedido]]:
         pedidos_por_cliente: Dict[str, List[Pedido]] = defaultdict(list)
         for pedido in pedidos:
             pedidos_por_cliente[pedido.nit_cliente].append(pedido)
+        return pedidos_por_cliente
+
+    def _emparejar(
+        self,
+        pagos: List[Pago],
+        pedidos_por_cliente: Dict[str, List[Pedido]],
+        indice_nit: IndiceNit,
+        tipo_cuenta: str,
+        copiar: bool,
+    ) -> None:
+        """Aplica cada pago a los pedidos de su cliente y genera los reportes de la pasada."""
+        # Pedidos de la pasada por NIT: los pagos del mismo cliente ven los abonos anteriores
+        pedidos_pasada: Dict[str, List[Pedido]] = {}
 
         # 3. Procesar cada pago
         for pago in pagos:
-            nit = pago.nit_cliente
-            if nit not in pedidos_por_cliente:
+            nit = indice_nit.resolver(pago.nit_cliente)
+            if nit is None:
                 continue  # No hay pedidos para este NIT
+            if nit != pago.nit_cliente:
+                pago = pago.model_copy(update={"nit_cliente": nit})
 
-            pedidos_cliente = pedidos_por_cliente[nit]
+            pedidos_cliente = pedidos_pasada.get(nit)
+            if pedidos_cliente is None:
+                pedidos_cliente = pedidos_por_cliente[nit]
+                if copiar:
+                    pedidos_cliente = [pedido.model_copy(deep=True) for pedido in pedidos_cliente]
+                pedidos_pasada[nit] = pedidos_cliente
 
             # Se crea el cliente a partir de los pedidos
             cliente = Cliente(
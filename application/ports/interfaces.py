@@ -1,9 +1,10 @@
 # application/ports/interfaces.py
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List
 from datetime import date
 from domain.models.models import Pago, Pedido, ResultadoPagoCliente
+from domain.services.indice_nit import normalizar_nit
 
 # Interfaces abstractas para los adaptadores de entrada y salida
 
@@ -13,6 +14,18 @@ class AbstractRepositorioPedidos(ABC):
         """Obtiene todos los pedidos de crédito."""
         pass
 
+    def obtener_pedidos_credito_para_nits(self, nits: Iterable[str]) -> List[Pedido]:
+        """
+        Obtiene los pedidos de crédito de los NIT indicados (comparados con normalizar_nit).
+        Por defecto filtra obtener_pedidos_credito(); los repositorios pueden sobreescribirlo
+        para construir sólo los pedidos de esos NIT.
+        """
+        nits_normalizados = {normalizar_nit(nit) for nit in nits}
+        return [
+            pedido for pedido in self.obtener_pedidos_credito()
+            if normalizar_nit(pedido.nit_cliente) in nits_normalizados
+        ]
+
 
 class AbstractExtractorPagos(ABC):
     @abstractmethod
@@ -0,0 +1,74 @@
+# benchmarks/benchmark_cartera.py
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict, Optional, Sequence
+from unittest.mock import MagicMock
+
+from infrastructure.repositories.cache_cartera import CacheCartera
+from infrastructure.repositories.firebase_repositorio_pedidos import FirebaseRepositorioPedidos
+from infrastructure.repositories.r1108_repositorio_cartera import RepositorioCartera
+
+
+def generar_csv_cartera(ruta: str, filas: int, semilla: int = 0) -> None:
+    """
+    Escribe un CSV sintético con la forma del reporte r1108 (nit, Número, Valor, Aplicado,
+    Saldo y fechas), en UTF-8.
+    """
+    aleatorio = random.Random(semilla)
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        f.write("Nit,Número,Razón Social,Valor,Aplicado,Saldo,Fecha,Vencimiento,Fecha Real\n")
+        for numero in range(filas):
+            nit = aleatorio.randint(1_000_000, 999_999_999)
+            valor = aleatorio.randint(50_000, 20_000_000)
+            aplicado = aleatorio.choice((0, valor, valor // 2))
+            fecha = f"2025-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d} 00:00:00"
+            f.write(
+                f"{nit:,}".replace(",", ".") + f",{numero:07d},CLIENTE ÑANDÚ {nit},"
+                f"\"{valor:,}.00\",{aplicado}.00,{valor - aplicado}.00,{fecha},{fecha},{fecha}\n"
+            )
+
+
+def _cargar(ruta_csv: str, cache: Optional[CacheCartera]) -> float:
+    inicio = time.perf_counter()
+    RepositorioCartera(MagicMock(spec=FirebaseRepositorioPedidos), ruta_csv, cache=cache)
+    return time.perf_counter() - inicio
+
+
+def medir_carga(filas: int, repeticiones: int = 3) -> Dict[str, float]:
+    """Segundos de construir RepositorioCartera sin caché, al llenar la caché y desde la caché."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_csv = os.path.join(directorio, "r1108.csv")
+        generar_csv_cartera(ruta_csv, filas)
+        cache = CacheCartera(os.path.join(directorio, "cache"))
+        return {
+            "sin_cache_s": min(_cargar(ruta_csv, None) for _ in range(repeticiones)),
+            "llenar_cache_s": _cargar(ruta_csv, cache),
+            "desde_cache_s": min(_cargar(ruta_csv, cache) for _ in range(repeticiones)),
+        }
+
+
+def main(argumentos: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description="Mide la carga de la cartera r1108 con y sin caché.")
+    parser.add_argument("--filas", type=int, default=50_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argumentos)
+
+    resultados = medir_carga(args.filas, args.repeticiones)
+    print(f"Cartera de {args.filas} filas:")
+    for medida, segundos in resultados.items():
+        print(f"  {medida:>15}: {segundos:8.3f} s")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+    return resultados
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.benchmark_cartera --filas 50000
+    main()
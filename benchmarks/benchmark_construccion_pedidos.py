@@ -0,0 +1,108 @@
+# benchmarks/benchmark_construccion_pedidos.py
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.generador_pedidos import generar_pedidos_crudos
+from domain.models.models import Pedido
+from infrastructure.repositories.firebase_repositorio_pedidos import VALIDACIONES_PEDIDOS, FirebaseRepositorioPedidos
+
+
+class _ReferenciaFija:
+    """Referencia que devuelve siempre el mismo diccionario, para medir sólo filtro y mapeo."""
+
+    def __init__(self, pedidos_crudos: Dict[str, Any]):
+        self._pedidos_crudos = pedidos_crudos
+
+    def get(self, etag: bool = False, shallow: bool = False) -> Dict[str, Any]:
+        return self._pedidos_crudos
+
+
+def _mejor_tiempo(funcion: Callable[[], Any], repeticiones: int) -> float:
+    """Mejor tiempo de varias ejecuciones, con el recolector de basura apagado como en timeit."""
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+        finally:
+            gc.enable()
+    return min(tiempos)
+
+
+def medir_construccion(lista_campos: List[Dict[str, Any]], repeticiones: int = 5) -> Dict[str, float]:
+    """Pedidos por segundo de cada forma de construir Pedido a partir de campos ya convertidos."""
+    formas = {
+        "individual": lambda: [Pedido(**campos) for campos in lista_campos],
+        "lote": lambda: Pedido.validar_lote(lista_campos),
+        "confiable": lambda: [Pedido.construir_confiable(campos) for campos in lista_campos],
+    }
+    return {nombre: len(lista_campos) / _mejor_tiempo(funcion, repeticiones) for nombre, funcion in formas.items()}
+
+
+def medir_repositorio(pedidos_crudos: Dict[str, Any], repeticiones: int = 5) -> Dict[str, float]:
+    """Pedidos por segundo de obtener_pedidos_credito (filtro + mapeo + construcción) por validación."""
+    resultados = {}
+    for validacion in VALIDACIONES_PEDIDOS:
+        repositorio = FirebaseRepositorioPedidos(
+            firebase_reference=_ReferenciaFija(pedidos_crudos), validacion_pedidos=validacion
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            pedidos = len(repositorio.obtener_pedidos_credito())
+
+            def ejecutar():
+                repositorio.obtener_pedidos_credito()
+
+            resultados[validacion] = pedidos / _mejor_tiempo(ejecutar, repeticiones)
+    return resultados
+
+
+def medir_tabla(pedidos_crudos: Dict[str, Any], repeticiones: int = 5) -> float:
+    """Pedidos por segundo de obtener_tabla_pedidos_credito (filtro + conversión vectorizada, sin Pedido)."""
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=_ReferenciaFija(pedidos_crudos))
+    with contextlib.redirect_stdout(io.StringIO()):
+        pedidos = len(repositorio.obtener_tabla_pedidos_credito())
+        return pedidos / _mejor_tiempo(repositorio.obtener_tabla_pedidos_credito, repeticiones)
+
+
+def main(argumentos: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Compara las formas de construir Pedido (pedidos por segundo).")
+    parser.add_argument("--pedidos", type=int, default=100_000, help="Pedidos crudos generados")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argumentos)
+
+    pedidos_crudos = generar_pedidos_crudos(args.pedidos, semilla=1)
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=_ReferenciaFija(pedidos_crudos))
+    lista_campos = [
+        campos for campos, _ in (repositorio._campos_pedido(i, d) for i, d in pedidos_crudos.items()) if campos
+    ]
+
+    resultados = {
+        "construccion": medir_construccion(lista_campos, args.repeticiones),
+        "repositorio": medir_repositorio(pedidos_crudos, args.repeticiones),
+        "tabla": medir_tabla(pedidos_crudos, args.repeticiones),
+    }
+    print(f"{len(lista_campos)} pedidos a crédito de {len(pedidos_crudos)} crudos (pedidos/s)")
+    print(f"{'':>13} {'individual':>12} {'lote':>12} {'confiable':>12}")
+    for medida in ("construccion", "repositorio"):
+        valores = resultados[medida]
+        print(f"{medida:>13} " + " ".join(f"{valores[v]:>12,.0f}" for v in VALIDACIONES_PEDIDOS))
+    print(f"{'tabla':>13} {resultados['tabla']:>12,.0f}  (obtener_tabla_pedidos_credito)")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+    return resultados
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.benchmark_construccion_pedidos --pedidos 100000
+    main()
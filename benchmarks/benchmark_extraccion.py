@@ -0,0 +1,127 @@
+# benchmarks/benchmark_extraccion.py
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.generador_extractos import generar_extracto_pdf
+
+try:
+    import resource
+except ImportError:  # Windows: no hay getrusage
+    resource = None
+
+TAMANOS_PREDETERMINADOS = (10, 50, 200)
+_FECHA = "20250401"
+_TIPO_CUENTA = "corriente"
+
+
+def _rss_maximo_bytes() -> Optional[int]:
+    """RSS máximo del proceso actual (ru_maxrss está en KB en Linux y en bytes en macOS)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _medir_extraccion(directorio: str, procesos_paginas: Optional[int]) -> Dict:
+    # Se ejecuta en un proceso hijo nuevo, para que el RSS máximo sea sólo el de esta corrida
+    from infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia import (
+        ExtractorDePagosPorNitBancolombia,
+    )
+    from infrastructure.extractors.resolutor_referencias import ResolutorReferencias
+
+    resolutor = ResolutorReferencias(ruta_indice=None)
+    len(resolutor)  # Cargar la semilla fuera de la medición
+    extractor = ExtractorDePagosPorNitBancolombia(
+        directorio_bancolombia_data=directorio, resolutor=resolutor, procesos_paginas=procesos_paginas
+    )
+
+    inicio = time.perf_counter()
+    tabla = extractor.extract_transacciones(_FECHA, _TIPO_CUENTA)
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "segundos": segundos,
+        "transacciones": len(tabla),
+        "rss_maximo_bytes": _rss_maximo_bytes(),
+    }
+
+
+def medir(
+    paginas: int,
+    filas_por_pagina: int = 40,
+    repeticiones: int = 3,
+    procesos_paginas: Optional[int] = None,
+) -> Dict:
+    """
+    Genera un extracto sintético de `paginas` páginas y mide la extracción completa
+    (pypdf + parser + resolución de NIT) `repeticiones` veces, cada una en un proceso nuevo.
+
+    Returns:
+        dict: Mediana de tiempo, páginas/s, filas/s y el mayor RSS máximo observado.
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, _TIPO_CUENTA, f"{_FECHA}.pdf")
+        filas = generar_extracto_pdf(ruta, paginas, filas_por_pagina)
+        tamano_pdf = os.path.getsize(ruta)
+
+        corridas = []
+        for _ in range(repeticiones):
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                corridas.append(pool.submit(_medir_extraccion, directorio, procesos_paginas).result())
+
+    segundos = statistics.median(c["segundos"] for c in corridas)
+    rss = [c["rss_maximo_bytes"] for c in corridas if c["rss_maximo_bytes"] is not None]
+    return {
+        "paginas": paginas,
+        "filas": filas,
+        "transacciones": corridas[0]["transacciones"],
+        "tamano_pdf_bytes": tamano_pdf,
+        "procesos_paginas": procesos_paginas or 1,
+        "segundos_mediana": segundos,
+        "paginas_por_segundo": paginas / segundos,
+        "filas_por_segundo": filas / segundos,
+        "rss_maximo_bytes": max(rss) if rss else None,
+    }
+
+
+def _imprimir(resultados: List[Dict]) -> None:
+    print(f"{'páginas':>8} {'filas':>8} {'procesos':>8} {'s (med.)':>9} {'pág/s':>9} {'filas/s':>10} {'RSS máx MB':>11}")
+    for r in resultados:
+        rss = f"{r['rss_maximo_bytes'] / 2**20:.1f}" if r["rss_maximo_bytes"] else "n/d"
+        print(
+            f"{r['paginas']:>8} {r['filas']:>8} {r['procesos_paginas']:>8} {r['segundos_mediana']:>9.3f} "
+            f"{r['paginas_por_segundo']:>9.1f} {r['filas_por_segundo']:>10.0f} {rss:>11}"
+        )
+
+
+def main(argumentos: Optional[Sequence[str]] = None) -> List[Dict]:
+    parser = argparse.ArgumentParser(description="Benchmark de ExtractorDePagosPorNitBancolombia con extractos sintéticos.")
+    parser.add_argument("--paginas", type=int, nargs="+", default=list(TAMANOS_PREDETERMINADOS))
+    parser.add_argument("--filas-por-pagina", type=int, default=40)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--procesos-paginas", type=int, default=None, help="Ver config.procesos_paginas_pdf")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argumentos)
+
+    resultados = [
+        medir(paginas, args.filas_por_pagina, args.repeticiones, args.procesos_paginas)
+        for paginas in args.paginas
+    ]
+    _imprimir(resultados)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+    return resultados
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.benchmark_extraccion --paginas 10 50 200 --salida bench.json
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/benchmark_pedidos.py
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.generador_pedidos import generar_pedidos_crudos
+from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+from benchmarks.servidor_rtdb_local import ServidorRTDBLocal
+from infrastructure.repositories.firebase_repositorio_pedidos import MODOS_CONSULTA, FirebaseRepositorioPedidos
+from infrastructure.repositories.firebase_rest_repositorio_pedidos import FirebaseRestRepositorioPedidos
+from infrastructure.repositories.snapshot_pedidos import SnapshotPedidos
+
+
+def medir_modo(referencia: ReferenciaEnMemoria, modo_consulta: str, repeticiones: int = 3, **opciones) -> Dict:
+    """
+    Mide obtener_pedidos_credito con el modo de consulta dado sobre el árbol en memoria.
+    opciones se pasan a FirebaseRepositorioPedidos (p. ej. tamano_fragmento, hilos_consulta).
+    """
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia, modo_consulta=modo_consulta, **opciones)
+    tiempos, tiempos_primer_pedido = [], []
+    for _ in range(repeticiones):
+        referencia.estadisticas.reiniciar()
+        pedidos = []
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for pedido in repositorio.iter_pedidos_credito():
+                if not pedidos:
+                    tiempos_primer_pedido.append(time.perf_counter() - inicio)
+                pedidos.append(pedido)
+        tiempos.append(time.perf_counter() - inicio)
+    nodos, bytes_descargados = referencia.estadisticas.nodos, referencia.estadisticas.bytes
+
+    # Pico de memoria de Python de una ejecución adicional (tracemalloc la hace más lenta)
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        repositorio.obtener_pedidos_credito()
+    pico_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "modo_consulta": modo_consulta,
+        "pedidos": len(pedidos),
+        "nodos_descargados": nodos,
+        "bytes_descargados": bytes_descargados,
+        "segundos": min(tiempos),
+        "primer_pedido_s": min(tiempos_primer_pedido, default=None),
+        "pico_memoria_bytes": pico_bytes,
+    }
+
+
+def medir_snapshot(referencia: ReferenciaEnMemoria, pedidos_modificados: int = 20) -> Dict:
+    """
+    Mide una ejecución en caliente con SnapshotPedidos: tras la descarga en frío se modifican
+    pedidos_modificados pedidos y se mide la sincronización por deltas desde el archivo.
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "pedidos.json.gz")
+        with contextlib.redirect_stdout(io.StringIO()):
+            FirebaseRepositorioPedidos(firebase_reference=referencia, snapshot=SnapshotPedidos(ruta)).obtener_pedidos_credito()
+
+        marca = max(data.get("actualizado_en", 0) for data in referencia.get().values()) + 1
+        ids = list(referencia.get(shallow=True))[:pedidos_modificados]
+        referencia.update({f"{id_pedido}/actualizado_en": marca for id_pedido in ids})
+
+        referencia.estadisticas.reiniciar()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            pedidos = FirebaseRepositorioPedidos(
+                firebase_reference=referencia, snapshot=SnapshotPedidos(ruta)
+            ).obtener_pedidos_credito()
+        segundos = time.perf_counter() - inicio
+        tamano_archivo = os.path.getsize(ruta)
+
+    return {
+        "modo_consulta": "snapshot",
+        "pedidos": len(pedidos),
+        "nodos_descargados": referencia.estadisticas.nodos,
+        "bytes_descargados": referencia.estadisticas.bytes,
+        "segundos": segundos,
+        "tamano_snapshot_bytes": tamano_archivo,
+    }
+
+
+def medir_rest(raiz: ReferenciaEnMemoria, modo_consulta: str, repeticiones: int = 3, latencia_s: float = 0.0) -> Dict:
+    """
+    Mide obtener_pedidos_credito de FirebaseRestRepositorioPedidos contra ServidorRTDBLocal
+    (HTTP real sobre localhost, con latencia_s simulada por respuesta).
+    """
+    referencia = raiz.child("pedidos")
+    with ServidorRTDBLocal(raiz, latencia_s=latencia_s) as servidor:
+        repositorio = FirebaseRestRepositorioPedidos(servidor.url, modo_consulta=modo_consulta)
+        tiempos = []
+        for _ in range(repeticiones):
+            referencia.estadisticas.reiniciar()
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                pedidos = repositorio.obtener_pedidos_credito()
+            tiempos.append(time.perf_counter() - inicio)
+    return {
+        "modo_consulta": f"rest-{modo_consulta}",
+        "pedidos": len(pedidos),
+        "nodos_descargados": referencia.estadisticas.nodos,
+        "bytes_descargados": referencia.estadisticas.bytes,
+        "segundos": min(tiempos),
+    }
+
+
+def main(argumentos: Optional[Sequence[str]] = None) -> List[Dict]:
+    parser = argparse.ArgumentParser(description="Compara los modos de consulta de /pedidos sobre una base en memoria.")
+    parser.add_argument("--pedidos", type=int, default=50_000)
+    parser.add_argument("--dias-historia", type=int, default=730)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--tamano-fragmento", type=int, default=2000, help="Claves por fragmento del modo fragmentos")
+    parser.add_argument("--hilos", type=int, default=4, help="Fragmentos en vuelo del modo fragmentos")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argumentos)
+
+    raiz = ReferenciaEnMemoria({"pedidos": generar_pedidos_crudos(args.pedidos, dias_historia=args.dias_historia)})
+    referencia = raiz.child("pedidos")
+    opciones = {"tamano_fragmento": args.tamano_fragmento, "hilos_consulta": args.hilos}
+    resultados = [medir_modo(referencia, modo, args.repeticiones, **opciones) for modo in MODOS_CONSULTA]
+    resultados.extend(medir_rest(raiz, modo, args.repeticiones) for modo in MODOS_CONSULTA)
+    resultados.append(medir_snapshot(referencia))
+
+    print(f"{'modo':>14} {'pedidos':>8} {'nodos':>9} {'KB':>10} {'s':>8} {'1er s':>8} {'pico MB':>8}")
+    for r in resultados:
+        primer = f"{r['primer_pedido_s']:>8.3f}" if r.get("primer_pedido_s") is not None else f"{'-':>8}"
+        pico = f"{r['pico_memoria_bytes'] / 2 ** 20:>8.1f}" if "pico_memoria_bytes" in r else f"{'-':>8}"
+        print(f"{r['modo_consulta']:>14} {r['pedidos']:>8} {r['nodos_descargados']:>9} "
+              f"{r['bytes_descargados'] / 1024:>10.1f} {r['segundos']:>8.3f} {primer} {pico}")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+    return resultados
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.benchmark_pedidos --pedidos 100000
+    main()
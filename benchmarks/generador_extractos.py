@@ -0,0 +1,151 @@
+# benchmarks/generador_extractos.py
+
+import argparse
+import os
+import random
+from datetime import date, timedelta
+from typing import List, Optional, Sequence
+
+# Referencias de ejemplo: NIT con y sin ceros a la izquierda, como aparecen en los extractos
+_DESCRIPCIONES = (
+    "PAGO PSE", "TRANSFERENCIA CTA SUC VIRTUAL", "CONSIGNACION CORRESPONSAL CB",
+    "PAGO INTERBANC", "RECAUDO CONVENIO", "CONSIGNACION EFECTIVO",
+)
+_DESCRIPCIONES_DEBITO = ("COMISION PAGO PSE", "IVA CUOTA MANEJO", "RETIRO CAJERO", "GMF 4X1000")
+_SUCURSALES = ("MEDELLIN", "BOGOTA", "ENVIGADO", "ITAGUI", "RIONEGRO", "SUC VIRTUAL")
+
+
+def escribir_pdf(textos_paginas: Sequence[str]) -> bytes:
+    """
+    Escribe un PDF mínimo (PDF 1.4, fuente Helvetica estándar, sin dependencias) con una
+    página por texto y un renglón por línea. pypdf extrae el texto renglón por renglón, igual
+    que en los extractos reales.
+    """
+    objetos: List[Optional[bytes]] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Árbol de páginas, se completa al conocer todas las páginas
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    paginas = []
+    for texto in textos_paginas:
+        renglones = b"".join(
+            b"(" + _escapar(renglon).encode("cp1252", errors="replace") + b") Tj 0 -12 Td "
+            for renglon in texto.splitlines()
+        )
+        flujo = b"BT /F1 8 Tf 30 810 Td " + renglones + b"ET"
+        objetos.append(b"<< /Length %d >>\nstream\n" % len(flujo) + flujo + b"\nendstream")
+        objetos.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objetos)
+        )
+        paginas.append(len(objetos))
+    objetos[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % numero for numero in paginas), len(paginas)
+    )
+
+    salida = bytearray(b"%PDF-1.4\n")
+    posiciones = []
+    for numero, objeto in enumerate(objetos, start=1):
+        posiciones.append(len(salida))
+        salida += b"%d 0 obj\n" % numero + objeto + b"\nendobj\n"
+    inicio_xref = len(salida)
+    salida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    salida += b"".join(b"%010d 00000 n \n" % posicion for posicion in posiciones)
+    salida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objetos) + 1, inicio_xref
+    )
+    return bytes(salida)
+
+
+def _escapar(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _formato_valor(centavos: int) -> str:
+    signo = "-" if centavos < 0 else ""
+    return f"{signo}{abs(centavos) // 100:,}.{abs(centavos) % 100:02d}"
+
+
+def generar_textos_extracto(
+    paginas: int,
+    filas_por_pagina: int,
+    fecha_inicial: date = date(2025, 4, 1),
+    numero_clientes: int = 300,
+    semilla: int = 0,
+) -> List[str]:
+    """
+    Genera el texto de cada página de un extracto sintético con el formato de filas que espera
+    PATRON_TRANSACCION: "YYYY/MM/DD DESCRIPCION SUCURSAL REFERENCIA DOCUMENTO VALOR SALDO".
+
+    Cada página lleva el encabezado del banco y la tabla; alrededor de un 15 % de las filas
+    son débitos (valor negativo) y algunas son abonos de intereses, como en los extractos reales.
+    """
+    aleatorio = random.Random(semilla)
+    referencias = [
+        str(aleatorio.randint(10_000_000, 999_999_999)).zfill(aleatorio.choice((0, 10)))
+        for _ in range(numero_clientes)
+    ]
+    saldo = 50_000_000_00
+    textos = []
+    for numero_pagina in range(paginas):
+        renglones = [
+            "BANCOLOMBIA S.A. NIT 890.903.938-8",
+            f"ESTADO DE CUENTA - PAGINA {numero_pagina + 1} DE {paginas}",
+            "FECHA DESCRIPCION SUCURSAL REFERENCIA1 DCTO. VALOR SALDO",
+        ]
+        for _ in range(filas_por_pagina):
+            fecha = fecha_inicial + timedelta(days=aleatorio.randrange(28))
+            tipo = aleatorio.random()
+            if tipo < 0.15:
+                descripcion = aleatorio.choice(_DESCRIPCIONES_DEBITO)
+                centavos = -aleatorio.randint(1_000_00, 200_000_00)
+                referencia = "0"
+            elif tipo < 0.17:
+                descripcion = "ABONO INTERESES AHORROS"
+                centavos = aleatorio.randint(1_00, 5_000_00)
+                referencia = "0"
+            else:
+                descripcion = aleatorio.choice(_DESCRIPCIONES)
+                centavos = aleatorio.randint(50_000_00, 30_000_000_00)
+                referencia = aleatorio.choice(referencias)
+            saldo += centavos
+            renglones.append(
+                f"{fecha:%Y/%m/%d} {descripcion} {aleatorio.choice(_SUCURSALES)} {referencia} "
+                f"{aleatorio.randint(0, 9999)} {_formato_valor(centavos)} {_formato_valor(saldo)}"
+            )
+        textos.append("\n".join(renglones))
+    return textos
+
+
+def generar_extracto_pdf(
+    ruta: str, paginas: int, filas_por_pagina: int = 40, semilla: int = 0
+) -> int:
+    """
+    Escribe en ruta un extracto sintético de paginas x filas_por_pagina transacciones.
+
+    Returns:
+        int: Número de filas de transacción escritas.
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, "wb") as f:
+        f.write(escribir_pdf(generar_textos_extracto(paginas, filas_por_pagina, semilla=semilla)))
+    return paginas * filas_por_pagina
+
+
+def main(argumentos: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Genera un extracto Bancolombia sintético en PDF.")
+    parser.add_argument("ruta", help="Ruta del PDF a escribir, p. ej. datos/corriente/20250401.pdf")
+    parser.add_argument("--paginas", type=int, default=100)
+    parser.add_argument("--filas-por-pagina", type=int, default=40)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argumentos)
+
+    filas = generar_extracto_pdf(args.ruta, args.paginas, args.filas_por_pagina, args.semilla)
+    print(f"{args.ruta}: {args.paginas} páginas, {filas} filas")
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.generador_extractos datos/corriente/20250401.pdf --paginas 300
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/generador_pedidos.py
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+_FORMAS_PAGO_CREDITO = ("CREDITO A 30 DIAS", "Crédito a 15 días", "CREDITO A 60 DÍAS", "A 8 dias")
+_FORMAS_PAGO_CONTADO = ("CONTADO", "Efectivo", "Transferencia")
+
+
+def generar_pedidos_crudos(
+    cantidad: int,
+    numero_clientes: int = 500,
+    dias_historia: int = 730,
+    fecha_final: Optional[datetime] = None,
+    clave_fecha_ordenable: str = "fecha_despacho",
+    clave_actualizacion: str = "actualizado_en",
+    semilla: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Genera un árbol /pedidos sintético con la forma de los nodos de Firebase: nit, estado,
+    valor.neto, hora_despacho ("dd/mm/YYYY HH:MM"), forma_pago y razon, más la fecha de
+    despacho ordenable en clave_fecha_ordenable ("YYYY-MM-DD HH:MM") y la marca de última
+    modificación en clave_actualizacion (epoch en milisegundos).
+
+    Las fechas se reparten uniformemente en los últimos dias_historia días, los estados
+    siguen una distribución con mayoría de pedidos despachados y cerca de la mitad son a crédito.
+    """
+    aleatorio = random.Random(semilla)
+    fecha_final = fecha_final or datetime.now()
+    nits = [str(aleatorio.randint(1_000_000, 999_999_999)) for _ in range(numero_clientes)]
+    pedidos = {}
+    for numero in range(cantidad):
+        despacho = fecha_final - timedelta(minutes=aleatorio.randrange(dias_historia * 24 * 60))
+        estado = aleatorio.choices((1, 2, 3, 4, 5), weights=(5, 70, 10, 5, 10))[0]
+        credito = aleatorio.random() < 0.5
+        nit = aleatorio.choice(nits)
+        pedido = {
+            "nit": nit,
+            "estado": estado,
+            "valor": {"neto": aleatorio.randint(50_000, 20_000_000), "bruto": 0},
+            "forma_pago": aleatorio.choice(_FORMAS_PAGO_CREDITO if credito else _FORMAS_PAGO_CONTADO),
+            "razon": f"CLIENTE {nit}",
+            "productos": {"p1": {"codigo": "A1", "cantidad": aleatorio.randint(1, 50)}},
+            clave_actualizacion: int(despacho.timestamp() * 1000),
+        }
+        if estado != 1:  # Los pedidos sin despachar no tienen hora de despacho
+            pedido["hora_despacho"] = despacho.strftime("%d/%m/%Y %H:%M")
+            pedido[clave_fecha_ordenable] = despacho.strftime("%Y-%m-%d %H:%M")
+        pedidos[f"-P{numero:09d}"] = pedido
+    return pedidos
@@ -0,0 +1,234 @@
+# benchmarks/rtdb_en_memoria.py
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class EstadisticasLectura:
+    """
+    Contadores de lo que se habría descargado de la base de datos real.
+
+    Atributos:
+        - lecturas: Número de llamadas a get().
+        - nodos: Número de hijos devueltos en total.
+        - bytes: Tamaño JSON de las respuestas (aproximación del tráfico).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        self.lecturas = 0
+        self.nodos = 0
+        self.bytes = 0
+
+    def registrar(self, resultado: Any) -> None:
+        tamano = len(json.dumps(resultado, ensure_ascii=False, default=str))
+        with self._lock:
+            self.lecturas += 1
+            if isinstance(resultado, dict):
+                self.nodos += len(resultado)
+            self.bytes += tamano
+
+
+def _partes(ruta: str) -> List[str]:
+    return [parte for parte in ruta.strip("/").split("/") if parte]
+
+
+def _valor_en(nodo: Any, partes: List[str]) -> Any:
+    for parte in partes:
+        if not isinstance(nodo, dict) or parte not in nodo:
+            return None
+        nodo = nodo[parte]
+    return nodo
+
+
+def _clave_orden_valor(valor: Any) -> Tuple:
+    """Orden de Realtime Database: null < false < true < números < cadenas < objetos."""
+    if valor is None:
+        return (0,)
+    if valor is False:
+        return (1,)
+    if valor is True:
+        return (2,)
+    if isinstance(valor, (int, float)):
+        return (3, valor)
+    if isinstance(valor, str):
+        return (4, valor)
+    return (5,)
+
+
+def _clave_orden_llave(llave: str) -> Tuple:
+    """Las llaves que son enteros de 32 bits se ordenan numéricamente antes que el resto."""
+    try:
+        numero = int(llave)
+        if -(2 ** 31) <= numero < 2 ** 31 and str(numero) == llave:
+            return (0, numero, "")
+    except ValueError:
+        pass
+    return (1, 0, llave)
+
+
+class ConsultaEnMemoria:
+    """
+    Emula firebase_admin.db.Query: un criterio de orden más filtros start_at/end_at/equal_to
+    y límites, aplicados sobre los hijos de la referencia.
+    """
+
+    def __init__(self, referencia: "ReferenciaEnMemoria", criterio: str, ruta_hijo: Optional[str] = None):
+        self._referencia = referencia
+        self._criterio = criterio  # "child", "key" o "value"
+        self._ruta_hijo = _partes(ruta_hijo or "")
+        self._inicio: Any = None
+        self._fin: Any = None
+        self._hay_inicio = False
+        self._hay_fin = False
+        self._limite: Optional[Tuple[str, int]] = None
+
+    def _valor_orden(self, llave: str, valor: Any) -> Tuple:
+        if self._criterio == "key":
+            return _clave_orden_llave(llave)
+        nodo = valor if self._criterio == "value" else _valor_en(valor, self._ruta_hijo)
+        return _clave_orden_valor(nodo)
+
+    def _clave(self, llave: str, valor: Any) -> Tuple:
+        # Empates en el valor se resuelven por la llave
+        return self._valor_orden(llave, valor), _clave_orden_llave(llave)
+
+    def _clave_limite(self, limite: Any) -> Tuple:
+        if self._criterio == "key":
+            return _clave_orden_llave(str(limite))
+        return _clave_orden_valor(limite)
+
+    def start_at(self, inicio: Any) -> "ConsultaEnMemoria":
+        if self._hay_inicio:
+            raise ValueError("Start value is already set.")
+        self._inicio, self._hay_inicio = inicio, True
+        return self
+
+    def end_at(self, fin: Any) -> "ConsultaEnMemoria":
+        if self._hay_fin:
+            raise ValueError("End value is already set.")
+        self._fin, self._hay_fin = fin, True
+        return self
+
+    def equal_to(self, valor: Any) -> "ConsultaEnMemoria":
+        if self._hay_inicio or self._hay_fin:
+            raise ValueError("Cannot set both equal_to and start_at/end_at.")
+        return self.start_at(valor).end_at(valor)
+
+    def limit_to_first(self, limite: int) -> "ConsultaEnMemoria":
+        self._limite = ("primeros", limite)
+        return self
+
+    def limit_to_last(self, limite: int) -> "ConsultaEnMemoria":
+        self._limite = ("ultimos", limite)
+        return self
+
+    def get(self) -> "OrderedDict[str, Any]":
+        hijos = self._referencia._nodo()
+        if not isinstance(hijos, dict):
+            hijos = {}
+        items = hijos.items()
+
+        if self._hay_inicio or self._hay_fin:
+            inicio = self._clave_limite(self._inicio) if self._hay_inicio else None
+            fin = self._clave_limite(self._fin) if self._hay_fin else None
+
+            def dentro(item) -> bool:
+                valor_orden = self._valor_orden(*item)
+                if inicio is not None and valor_orden < inicio:
+                    return False
+                if fin is not None and valor_orden > fin:
+                    return False
+                return True
+
+            # Se filtra antes de ordenar: sólo se ordena lo que devuelve la consulta
+            items = [item for item in items if dentro(item)]
+        ordenados = sorted(items, key=lambda item: self._clave(*item))
+        if self._limite is not None:
+            tipo, limite = self._limite
+            ordenados = ordenados[:limite] if tipo == "primeros" else ordenados[-limite:] if limite else []
+
+        resultado = OrderedDict((llave, json.loads(json.dumps(valor))) for llave, valor in ordenados)
+        self._referencia._estadisticas.registrar(resultado)
+        return resultado
+
+
+class ReferenciaEnMemoria:
+    """
+    Sustituto local de firebase_admin.db.Reference para pruebas y benchmarks: guarda el árbol
+    en un diccionario y reproduce la semántica de consulta de Realtime Database
+    (order_by_child/order_by_key/order_by_value, start_at, end_at, equal_to, limit_to_first,
+    limit_to_last y get(shallow=True)). Cada get() devuelve una copia, como una descarga.
+
+    Atributos:
+        - estadisticas: EstadisticasLectura compartidas por todas las referencias del árbol.
+    """
+
+    def __init__(
+        self,
+        datos: Optional[Dict[str, Any]] = None,
+        ruta: str = "/",
+        _raiz: Optional[Dict[str, Any]] = None,
+        _estadisticas: Optional[EstadisticasLectura] = None,
+    ):
+        self._raiz = _raiz if _raiz is not None else {"valor": datos if datos is not None else {}}
+        self._ruta = _partes(ruta)
+        self._estadisticas = _estadisticas or EstadisticasLectura()
+
+    @property
+    def estadisticas(self) -> EstadisticasLectura:
+        return self._estadisticas
+
+    @property
+    def path(self) -> str:
+        return "/" + "/".join(self._ruta)
+
+    @property
+    def key(self) -> Optional[str]:
+        return self._ruta[-1] if self._ruta else None
+
+    def _nodo(self) -> Any:
+        return _valor_en(self._raiz["valor"], self._ruta)
+
+    def child(self, ruta: str) -> "ReferenciaEnMemoria":
+        return ReferenciaEnMemoria(
+            ruta="/".join(self._ruta + _partes(ruta)), _raiz=self._raiz, _estadisticas=self._estadisticas
+        )
+
+    def get(self, etag: bool = False, shallow: bool = False) -> Any:
+        nodo = self._nodo()
+        if shallow and isinstance(nodo, dict):
+            resultado = {llave: True if isinstance(valor, dict) else valor for llave, valor in nodo.items()}
+        else:
+            resultado = json.loads(json.dumps(nodo)) if nodo is not None else None
+        self._estadisticas.registrar(resultado)
+        return resultado
+
+    def set(self, valor: Any) -> None:
+        if not self._ruta:
+            self._raiz["valor"] = json.loads(json.dumps(valor))
+            return
+        padre = self._raiz["valor"]
+        for parte in self._ruta[:-1]:
+            padre = padre.setdefault(parte, {})
+        padre[self._ruta[-1]] = json.loads(json.dumps(valor))
+
+    def update(self, valores: Dict[str, Any]) -> None:
+        for ruta, valor in valores.items():
+            self.child(ruta).set(valor)
+
+    def order_by_child(self, ruta: str) -> ConsultaEnMemoria:
+        if not ruta or ruta.startswith("$"):
+            raise ValueError(f"Ruta de hijo inválida: {ruta!r}")
+        return ConsultaEnMemoria(self, "child", ruta)
+
+    def order_by_key(self) -> ConsultaEnMemoria:
+        return ConsultaEnMemoria(self, "key")
+
+    def order_by_value(self) -> ConsultaEnMemoria:
+        return ConsultaEnMemoria(self, "value")
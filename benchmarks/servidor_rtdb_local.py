@@ -0,0 +1,137 @@
+# benchmarks/servidor_rtdb_local.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+
+# Tamaño de cada escritura de la respuesta, para que el cliente la reciba por fragmentos
+_TAMANO_BLOQUE = 16 * 1024
+
+
+class ServidorRTDBLocal:
+    """
+    Servidor HTTP local que imita la API REST de Realtime Database ({ruta}.json con shallow,
+    orderBy, startAt, endAt, equalTo, limitToFirst y limitToLast) sobre una
+    ReferenciaEnMemoria, para probar y medir ClienteRTDBRest sin red.
+
+    Se usa como contexto: `with ServidorRTDBLocal(raiz) as servidor: servidor.url`.
+
+    Atributos:
+        - raiz: ReferenciaEnMemoria de la raíz del árbol; sus estadísticas cuentan las lecturas.
+        - latencia_s: Espera antes de cada respuesta (simula la red).
+        - fallos_pendientes: Número de próximas peticiones que responden 503 (prueba de reintentos).
+        - peticiones: Peticiones recibidas.
+    """
+
+    def __init__(self, raiz: ReferenciaEnMemoria, latencia_s: float = 0.0, fallos_pendientes: int = 0):
+        self.raiz = raiz
+        self.latencia_s = latencia_s
+        self.fallos_pendientes = fallos_pendientes
+        self.peticiones = 0
+        self._lock = threading.Lock()
+        self._servidor: Optional[ThreadingHTTPServer] = None
+        self._hilo: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def _registrar_peticion(self) -> bool:
+        """Cuenta la petición y devuelve True si debe fallar."""
+        with self._lock:
+            self.peticiones += 1
+            if self.fallos_pendientes > 0:
+                self.fallos_pendientes -= 1
+                return True
+            return False
+
+    def responder(self, ruta: str, parametros: Dict[str, str]) -> Any:
+        """Resultado de GET {ruta}.json con los parámetros de consulta dados."""
+        referencia = self.raiz.child(ruta)
+        if parametros.get("shallow") == "true":
+            return referencia.get(shallow=True)
+        if "orderBy" not in parametros:
+            return referencia.get()
+
+        orden = json.loads(parametros["orderBy"])
+        if orden == "$key":
+            consulta = referencia.order_by_key()
+        elif orden == "$value":
+            consulta = referencia.order_by_value()
+        else:
+            consulta = referencia.order_by_child(orden)
+        if "equalTo" in parametros:
+            consulta = consulta.equal_to(json.loads(parametros["equalTo"]))
+        if "startAt" in parametros:
+            consulta = consulta.start_at(json.loads(parametros["startAt"]))
+        if "endAt" in parametros:
+            consulta = consulta.end_at(json.loads(parametros["endAt"]))
+        if "limitToFirst" in parametros:
+            consulta = consulta.limit_to_first(int(parametros["limitToFirst"]))
+        if "limitToLast" in parametros:
+            consulta = consulta.limit_to_last(int(parametros["limitToLast"]))
+        return consulta.get()
+
+    def _crear_manejador(self):
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Conexiones persistentes, como el pool del cliente
+
+            def do_GET(self):
+                if servidor.latencia_s:
+                    time.sleep(servidor.latencia_s)
+                partes = urlsplit(self.path)
+                ruta = unquote(partes.path)
+                if servidor._registrar_peticion():
+                    self._enviar(503, {"error": "Servicio no disponible"})
+                    return
+                if not ruta.endswith(".json"):
+                    self._enviar(404, {"error": "Ruta no soportada"})
+                    return
+                parametros = {nombre: valores[-1] for nombre, valores in parse_qs(partes.query).items()}
+                try:
+                    resultado = servidor.responder(ruta[: -len(".json")], parametros)
+                except (ValueError, TypeError) as e:
+                    self._enviar(400, {"error": str(e)})
+                    return
+                self._enviar(200, resultado)
+
+            def _enviar(self, estado: int, cuerpo: Any) -> None:
+                contenido = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+                self.send_response(estado)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(contenido)))
+                self.end_headers()
+                for inicio in range(0, len(contenido), _TAMANO_BLOQUE):
+                    self.wfile.write(contenido[inicio:inicio + _TAMANO_BLOQUE])
+
+            def log_message(self, formato, *args):
+                pass  # Sin registro por petición
+
+        return Manejador
+
+    def iniciar(self) -> "ServidorRTDBLocal":
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), self._crear_manejador())
+        self._servidor.daemon_threads = True
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, args=(0.05,), daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self) -> None:
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+    def __enter__(self) -> "ServidorRTDBLocal":
+        return self.iniciar()
+
+    def __exit__(self, *excepcion) -> None:
+        self.detener()
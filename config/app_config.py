@@ -21,6 +21,41 @@ class AppConfig:
     # Dias máximo para considerar un pedido (en días)
     _dias_maximo_pedido = 90  # Valor predeterminado
 
+    # Consulta de /pedidos en Firebase: "completo", "estado", "fecha" o "fragmentos" (ver FirebaseRepositorioPedidos)
+    _modo_consulta_pedidos = "completo"
+    # Claves por fragmento en el modo "fragmentos"
+    _tamano_fragmento_pedidos = 5000
+    # Construcción de los Pedido descargados: "individual", "lote" o "confiable" (ver VALIDACIONES_PEDIDOS)
+    _validacion_pedidos = "lote"
+    # Hijo de cada pedido con la fecha de despacho ordenable ("YYYY-MM-DD HH:MM"), para el modo "fecha"
+    _clave_fecha_ordenable_pedidos = "fecha_despacho"
+
+    # Snapshot local de /pedidos sincronizado por deltas (None = descarga completa en cada ejecución)
+    _ruta_snapshot_pedidos = None
+    # Hijo de cada pedido con la marca de última modificación, usado como marca de agua del delta
+    _clave_actualizacion_pedidos = "actualizado_en"
+    # Cada cuánto se fuerza una descarga completa para reflejar pedidos borrados (segundos)
+    _max_edad_snapshot_pedidos = 24 * 60 * 60
+
+    # Vigencia del índice en memoria NIT -> pedidos de obtener_pedidos_por_nit (segundos)
+    _segundos_vigencia_indice_nit = 300
+
+    # Construir sólo los pedidos de los NIT que aparecen en los pagos del día
+    _materializacion_perezosa_pedidos = False
+
+    # Con materialización perezosa: descargar sólo los pedidos de los NIT pagadores con
+    # consultas order_by_child("nit").equal_to(nit) concurrentes (requiere ".indexOn": "nit")
+    _consulta_pedidos_por_nit = False
+    _hilos_consulta_pedidos = 8
+
+    # Cliente de /pedidos: "sdk" (firebase_admin) o "rest" (API REST asíncrona con pool de conexiones)
+    _backend_pedidos = "sdk"
+    _max_conexiones_rest_pedidos = 8
+    _reintentos_rest_pedidos = 3
+
+    # Descargar los pedidos en un hilo aparte mientras se extraen los pagos del extracto
+    _solapar_descarga_pedidos = False
+
     # Cuentas contables para ingresos y egresos
     _cuentas_contables_ingreso_egreso_corriente = ("11100501", "130505")
     _cuentas_contables_ingreso_egreso_ahorro = ("11200501", "130505")
@@ -28,6 +63,36 @@ class AppConfig:
     # Directorio de donde se extraen los reportes de pagos (extractos bancarios)
     _directorio_pagos = r"G:\.shortcut-targets-by-id\1A2UP-JKrQvJV0SCMSD0IDa3ts-uOUJVR\Despachos\bancolombia_data"
 
+    # Procesos para la extracción por lote de extractos (None = todos los núcleos disponibles)
+    _procesos_extraccion = None
+
+    # Procesos para extraer en paralelo las páginas de un único PDF grande (None = secuencial)
+    _procesos_paginas_pdf = None
+
+    # Caché en disco de las filas extraídas de los extractos (None desactiva la caché)
+    _directorio_cache_extractos = ".cache/extractos"
+    _tamano_maximo_cache_extractos = 256 * 1024 * 1024  # 256 MB
+
+    # Caché en disco del DataFrame de cartera ya preparado (None desactiva la caché)
+    _directorio_cache_cartera = ".cache/cartera"
+
+    # Encoding del CSV de cartera (p. ej. "cp1252"); None lo detecta sobre una muestra del archivo
+    _encoding_cartera = None
+
+    # Separador decimal de los valores de los extractos CSV ("." o ","); None lo deduce del archivo
+    _separador_decimal_extracto = None
+
+    # Índice SQLite referencia bancaria -> NIT (si no existe se usa EXTRA_REF como semilla)
+    _ruta_indice_referencias = "referencias_nit.sqlite"
+
+    # Modo vigilancia: intervalo entre revisiones, vigencia de los pedidos en memoria y estado persistido
+    _intervalo_vigilancia_segundos = 30
+    _segundos_vigencia_pedidos = 15 * 60
+    _ruta_estado_vigilante = ".cache/vigilante_extractos.json"
+    # Un extracto que falla se reintenta con espera exponencial hasta este número de intentos
+    _max_intentos_extracto = 5
+    _segundos_espera_reintento_extracto = 60
+
     # Directorio donde se guardarán los reportes generados
     _ruta_archivo_cartera = r"G:\.shortcut-targets-by-id\1dyg6svJ1m1iFvbY0rdj1F0qDTuhhljes\Cartera\r1108\r1108.csv"
 
@@ -62,6 +127,66 @@ class AppConfig:
     def dias_maximo_pedido(self):
         return self._dias_maximo_pedido
 
+    @property
+    def modo_consulta_pedidos(self):
+        return self._modo_consulta_pedidos
+
+    @property
+    def tamano_fragmento_pedidos(self):
+        return self._tamano_fragmento_pedidos
+
+    @property
+    def validacion_pedidos(self):
+        return self._validacion_pedidos
+
+    @property
+    def clave_fecha_ordenable_pedidos(self):
+        return self._clave_fecha_ordenable_pedidos
+
+    @property
+    def ruta_snapshot_pedidos(self):
+        return self._ruta_snapshot_pedidos
+
+    @property
+    def clave_actualizacion_pedidos(self):
+        return self._clave_actualizacion_pedidos
+
+    @property
+    def max_edad_snapshot_pedidos(self):
+        return self._max_edad_snapshot_pedidos
+
+    @property
+    def segundos_vigencia_indice_nit(self):
+        return self._segundos_vigencia_indice_nit
+
+    @property
+    def materializacion_perezosa_pedidos(self):
+        return self._materializacion_perezosa_pedidos
+
+    @property
+    def consulta_pedidos_por_nit(self):
+        return self._consulta_pedidos_por_nit
+
+    @property
+    def hilos_consulta_pedidos(self):
+        return self._hilos_consulta_pedidos
+
+    @property
+    def backend_pedidos(self):
+        return self._backend_pedidos
+
+    @property
+    def max_conexiones_rest_pedidos(self):
+        return self._max_conexiones_rest_pedidos
+
+    @property
+    def reintentos_rest_pedidos(self):
+        return self._reintentos_rest_pedidos
+
+    @property
+    def solapar_descarga_pedidos(self):
+        return self._solapar_descarga_pedidos
+
     @property
     def cuentas_ingreso_egreso_corriente(self):
         return self._cuentas_contables_ingreso_egreso_corriente
@@ -82,6 +207,58 @@ class AppConfig:
     def ruta_archivo_cartera(self):
         return self._ruta_archivo_cartera
 
+    @property
+    def procesos_extraccion(self):
+        return self._procesos_extraccion
+
+    @property
+    def procesos_paginas_pdf(self):
+        return self._procesos_paginas_pdf
+
+    @property
+    def directorio_cache_extractos(self):
+        return self._directorio_cache_extractos
+
+    @property
+    def tamano_maximo_cache_extractos(self):
+        return self._tamano_maximo_cache_extractos
+
+    @property
+    def directorio_cache_cartera(self):
+        return self._directorio_cache_cartera
+
+    @property
+    def encoding_cartera(self):
+        return self._encoding_cartera
+
+    @property
+    def separador_decimal_extracto(self):
+        return self._separador_decimal_extracto
+
+    @property
+    def ruta_indice_referencias(self):
+        return self._ruta_indice_referencias
+
+    @property
+    def intervalo_vigilancia_segundos(self):
+        return self._intervalo_vigilancia_segundos
+
+    @property
+    def segundos_vigencia_pedidos(self):
+        return self._segundos_vigencia_pedidos
+
+    @property
+    def ruta_estado_vigilante(self):
+        return self._ruta_estado_vigilante
+
+    @property
+    def max_intentos_extracto(self):
+        return self._max_intentos_extracto
+
+    @property
+    def segundos_espera_reintento_extracto(self):
+        return self._segundos_espera_reintento_extracto
+
     @staticmethod
     def initialize_firebase():
         """
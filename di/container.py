@@ -7,12 +7,21 @@ from infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia import (
     ExtractorDePagosPorNitBancolombia,
 )
 from infrastructure.extractors.extractor_pago_pdf import ExtractorPagosPDF
+from infrastructure.extractors.extractor_pago_tabular import ExtractorPagosTabular, formato_extracto
+from infrastructure.extractors.cache_extractos import crear_cache_extractos
+from infrastructure.extractors.resolutor_referencias import ResolutorReferencias
 from infrastructure.report_generators.generador_reporte_txt import GeneradorReporteTxt
 from firebase_admin import db
 from infrastructure.repositories.firebase_repositorio_pedidos import (
     FirebaseRepositorioPedidos,
 )
+from infrastructure.repositories.firebase_rest_repositorio_pedidos import (
+    FirebaseRestRepositorioPedidos,
+    obtener_token_firebase_admin,
+)
+from infrastructure.repositories.cache_cartera import crear_cache_cartera
 from infrastructure.repositories.r1108_repositorio_cartera import RepositorioCartera
+from infrastructure.repositories.snapshot_pedidos import crear_snapshot_pedidos
 
 
 class Container(containers.DeclarativeContainer):
@@ -26,18 +35,64 @@ class Container(containers.DeclarativeContainer):
         db.reference, path="/pedidos"
     )
     
+    # Snapshot local de pedidos sincronizado por deltas (None si no hay ruta configurada)
+    snapshot_pedidos = providers.Singleton(
+        crear_snapshot_pedidos,
+        ruta=config.ruta_snapshot_pedidos,
+        clave_actualizacion=config.clave_actualizacion_pedidos,
+        max_edad_s=config.max_edad_snapshot_pedidos,
+    )
+
     # Bind AbstractRepositorioPedidos to FirebaseRepositorioPedidos
     repositorio_pedidos_firebase = providers.Singleton(
         FirebaseRepositorioPedidos,
         firebase_reference=firebase_pedidos_reference,
+        modo_consulta=config.modo_consulta_pedidos,
+        clave_fecha_ordenable=config.clave_fecha_ordenable_pedidos,
+        snapshot=snapshot_pedidos,
+        segundos_vigencia_indice=config.segundos_vigencia_indice_nit,
+        consulta_por_nit=config.consulta_pedidos_por_nit,
+        hilos_consulta=config.hilos_consulta_pedidos,
+        tamano_fragmento=config.tamano_fragmento_pedidos,
+        validacion_pedidos=config.validacion_pedidos,
     )
     
+    # Same repository over the asyncio REST client (no snapshot support)
+    repositorio_pedidos_firebase_rest = providers.Singleton(
+        FirebaseRestRepositorioPedidos,
+        url_base=config.firebase_database_url,
+        obtener_token=providers.Object(obtener_token_firebase_admin),
+        modo_consulta=config.modo_consulta_pedidos,
+        clave_fecha_ordenable=config.clave_fecha_ordenable_pedidos,
+        segundos_vigencia_indice=config.segundos_vigencia_indice_nit,
+        consulta_por_nit=config.consulta_pedidos_por_nit,
+        max_conexiones=config.max_conexiones_rest_pedidos,
+        reintentos=config.reintentos_rest_pedidos,
+        tamano_fragmento=config.tamano_fragmento_pedidos,
+        validacion_pedidos=config.validacion_pedidos,
+    )
+
+    # config.backend_pedidos: "sdk" (default) or "rest"
+    repositorio_pedidos_origen = providers.Selector(
+        providers.Callable(lambda backend: backend or "sdk", config.backend_pedidos),
+        sdk=repositorio_pedidos_firebase,
+        rest=repositorio_pedidos_firebase_rest,
+    )
+
+    # Caché del DataFrame de cartera preparado (None si no hay directorio configurado)
+    cache_cartera = providers.Singleton(
+        crear_cache_cartera,
+        directorio=config.directorio_cache_cartera,
+    )
+
     # --- Repositorio Cartera (Decorator/Wrapper) ---
     # This repository uses the Firebase one AND the CSV path from config
     repositorio_cartera = providers.Factory(
         RepositorioCartera,
-        firebase_repo = repositorio_pedidos_firebase,  # Inject the Firebase repo
-        csv_path = config.ruta_archivo_cartera       # Inject the CSV path
+        firebase_repo = repositorio_pedidos_origen,  # Inject the Firebase repo
+        csv_path = config.ruta_archivo_cartera,      # Inject the CSV path
+        cache = cache_cartera,
+        encoding = config.encoding_cartera,
     )
     
     # --- Abstract Repository Provider ---
@@ -48,12 +103,51 @@ class Container(containers.DeclarativeContainer):
         # repositorio_pedidos_firebase # <-- Si se quiere volver a Firebase solamente, se cambia por este repositorio
     )
 
+    # Caché de extractos compartida (None si no hay directorio configurado)
+    cache_extractos = providers.Singleton(
+        crear_cache_extractos,
+        directorio=config.directorio_cache_extractos,
+        tamano_maximo_bytes=config.tamano_maximo_cache_extractos,
+    )
+
+    # Resolutor referencia bancaria -> NIT, cargado de forma perezosa desde el índice SQLite
+    # Las referencias con ceros a la izquierda se buscan entre los NIT de la cartera; la
+    # cartera sólo se carga si aparece una referencia así
+    resolutor_referencias = providers.Singleton(
+        ResolutorReferencias,
+        ruta_indice=config.ruta_indice_referencias,
+        nits_conocidos=providers.Callable(
+            lambda cartera: lambda: cartera().nits_conocidos(), repositorio_cartera.provider
+        ),
+    )
+
     procesador_pdf = providers.Factory(
         ExtractorDePagosPorNitBancolombia,
         directorio_bancolombia_data=config.directorio_pagos,
+        cache=cache_extractos,
+        resolutor=resolutor_referencias,
+        procesos_paginas=config.procesos_paginas_pdf,
+    )
+    extractor_pagos_pdf = providers.Factory(
+        ExtractorPagosPDF, procesador_pdf=procesador_pdf, streaming=True
+    )
+    # Exportaciones CSV/XLSX; los tipos de cuenta sin exportación en la fecha usan el PDF
+    extractor_pagos_tabular = providers.Factory(
+        ExtractorPagosTabular,
+        directorio_pagos=config.directorio_pagos,
+        resolutor=resolutor_referencias,
+        extractor_respaldo=extractor_pagos_pdf,
+        separador_decimal=config.separador_decimal_extracto,
     )
-    extractor_pagos = providers.Factory(
-        ExtractorPagosPDF, procesador_pdf=procesador_pdf
+    # Se escoge el extractor según el archivo que exista para config.fecha_pdf
+    extractor_pagos = providers.Selector(
+        providers.Callable(
+            formato_extracto,
+            directorio_pagos=config.directorio_pagos,
+            fecha=config.fecha_pdf,
+        ),
+        pdf=extractor_pagos_pdf,
+        tabular=extractor_pagos_tabular,
     )
 
     generador_reporte = providers.Factory(
@@ -71,4 +165,6 @@ class Container(containers.DeclarativeContainer):
         repositorio_pedidos=repositorio_pedidos,
         generador_reporte=generador_reporte,
         aplicador_pagos=aplicador_pagos,
+        materializacion_perezosa=config.materializacion_perezosa_pedidos,
+        solapar_descarga_pedidos=config.solapar_descarga_pedidos,
     )
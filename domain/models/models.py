@@ -10,8 +10,9 @@ import re
 from turtle import st
 from typing import Optional, List, Union
 import uuid
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, model_validator
 from enum import Enum
+from typing import Any, Dict, Sequence
 
 from config.app_config import config
 
@@ -300,6 +301,43 @@ class Pedido(BaseModel):
             except Exception:
                 pass  # Evita errores durante validación o creación temprana del modelo
 
+    @classmethod
+    def validar_lote(cls, registros: Sequence[Dict[str, Any]]) -> List["Pedido"]:
+        """
+        Valida y construye una lista de pedidos en una sola llamada a pydantic-core
+        (TypeAdapter(List[Pedido])), con las mismas reglas que Pedido(**campos). Si algún
+        registro es inválido lanza ValidationError con su posición en loc.
+        """
+        return _ADAPTADOR_LISTA_PEDIDOS.validate_python(registros)
+
+    @classmethod
+    def construir_confiable(cls, campos: Dict[str, Any]) -> "Pedido":
+        """
+        Construye el pedido sin validar, como model_construct pero sin su recorrido de alias.
+        Sólo para campos ya verificados y con los tipos exactos del modelo (p. ej. los del
+        mapeador de FirebaseRepositorioPedidos): un valor inválido no se detecta.
+        """
+        pedido = cls.__new__(cls)
+        # La plantilla tiene todos los campos en su orden, así que el orden es el de la validación
+        valores = {**_PLANTILLA_PEDIDO, **campos}
+        if "fechas_abono" not in campos:
+            valores["fechas_abono"] = []  # Lista propia por pedido
+        object.__setattr__(pedido, "__dict__", valores)
+        object.__setattr__(pedido, "__pydantic_fields_set__", set(campos))
+        object.__setattr__(pedido, "__pydantic_extra__", None)
+        object.__setattr__(pedido, "__pydantic_private__", None)
+        return pedido
+
+
+_ADAPTADOR_LISTA_PEDIDOS = TypeAdapter(List[Pedido])
+
+# Todos los campos de Pedido en orden, con su valor por defecto (None en los obligatorios),
+# para construir_confiable
+_PLANTILLA_PEDIDO = {
+    nombre: None if campo.is_required() else campo.get_default(call_default_factory=True)
+    for nombre, campo in Pedido.model_fields.items()
+}
+
 
 
 
@@ -0,0 +1,77 @@
+# domain/services/indice_nit.py
+
+from typing import Dict, Iterable, List, Optional
+
+# Pesos del algoritmo de dígito de verificación de la DIAN (módulo 11), desde el dígito menos significativo
+PESOS_DIGITO_VERIFICACION = (3, 7, 13, 17, 19, 23, 29, 37, 41, 43, 47, 53, 59, 67, 71)
+
+
+def normalizar_nit(nit: str) -> str:
+    """Quita espacios, puntos, guiones y ceros a la izquierda: ' 000830.500.960-2' -> '8305009602'."""
+    return nit.strip().replace(".", "").replace("-", "").replace(" ", "").lstrip("0")
+
+
+def calcular_digito_verificacion(nit: str) -> int:
+    """Calcula el dígito de verificación (DV) de un NIT colombiano."""
+    total = sum(
+        int(digito) * peso
+        for digito, peso in zip(reversed(nit), PESOS_DIGITO_VERIFICACION)
+    )
+    residuo = total % 11
+    return residuo if residuo in (0, 1) else 11 - residuo
+
+
+class IndiceNit:
+    """
+    Índice que resuelve las variantes con las que un NIT aparece en las referencias bancarias
+    al NIT canónico de los pedidos y la cartera.
+
+    Para cada NIT conocido se indexan:
+        - el NIT normalizado (sin ceros a la izquierda, por lo que cubre las variantes con ceros)
+        - el NIT seguido de su dígito de verificación (NIT+DV)
+
+    Una coincidencia exacta con un NIT conocido siempre tiene prioridad sobre una variante
+    NIT+DV. Las búsquedas son O(1).
+    """
+
+    def __init__(self, nits: Iterable[str]):
+        self._variantes: Dict[str, str] = {}
+        canonicos: List[str] = []
+        for nit in nits:
+            if not nit:
+                continue
+            normalizado = normalizar_nit(nit)
+            if normalizado and normalizado not in self._variantes:
+                self._variantes[normalizado] = nit
+                canonicos.append(normalizado)
+
+        for normalizado in canonicos:
+            if not normalizado.isdigit():
+                continue
+            con_dv = f"{normalizado}{calcular_digito_verificacion(normalizado)}"
+            # setdefault: un NIT canónico nunca es desplazado por la variante NIT+DV de otro
+            self._variantes.setdefault(con_dv, self._variantes[normalizado])
+
+    def resolver(self, nit_o_referencia: str) -> Optional[str]:
+        """Devuelve el NIT canónico para la referencia, o None si no corresponde a ningún NIT conocido."""
+        return self._variantes.get(normalizar_nit(nit_o_referencia))
+
+    @staticmethod
+    def candidatos(nit_o_referencia: str) -> List[str]:
+        """
+        NIT canónicos posibles para una referencia, sin necesidad de conocer los NIT de antemano:
+        la referencia normalizada y, si su último dígito es un DV válido, la referencia sin él.
+        """
+        normalizado = normalizar_nit(nit_o_referencia)
+        candidatos = [normalizado] if normalizado else []
+        if len(normalizado) > 1 and normalizado.isdigit():
+            base, digito = normalizado[:-1], int(normalizado[-1])
+            if calcular_digito_verificacion(base) == digito:
+                candidatos.append(base)
+        return candidatos
+
+    def __len__(self) -> int:
+        return len(self._variantes)
+
+    def __contains__(self, nit_o_referencia: str) -> bool:
+        return self.resolver(nit_o_referencia) is not None
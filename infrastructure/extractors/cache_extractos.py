@@ -0,0 +1,151 @@
+# infrastructure/extractors/cache_extractos.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+FilaCruda = Tuple[str, str, str]  # (fecha, referencia, valor) tal como aparecen en el extracto
+
+TAMANO_MAXIMO_PREDETERMINADO = 256 * 1024 * 1024  # 256 MB
+
+
+class EstadisticasCache(BaseModel):
+    """
+    Attr:
+        - aciertos: int = Consultas resueltas desde la caché
+        - fallos: int = Consultas que requirieron procesar el PDF
+        - bytes_ahorrados: int = Bytes de PDF que no fue necesario procesar gracias a la caché
+        - entradas: int = Número de extractos almacenados en disco
+        - bytes_en_disco: int = Tamaño total ocupado por la caché
+    """
+
+    aciertos: int = Field(0, description="Consultas resueltas desde la caché")
+    fallos: int = Field(0, description="Consultas que requirieron procesar el PDF")
+    bytes_ahorrados: int = Field(0, description="Bytes de PDF que no fue necesario procesar")
+    entradas: int = Field(0, description="Número de extractos almacenados en disco")
+    bytes_en_disco: int = Field(0, description="Tamaño total ocupado por la caché")
+
+
+class CacheExtractos:
+    """
+    Caché en disco de las filas extraídas de los extractos bancarios, direccionada por
+    contenido: la clave es el hash SHA-256 del PDF más la versión del parser, de modo que un
+    PDF reemplazado o un cambio en el parser nunca reutilizan filas obsoletas.
+
+    Cada entrada es un archivo JSON. El tamaño total se limita a tamano_maximo_bytes
+    desalojando primero las entradas usadas hace más tiempo (LRU según mtime, que se
+    actualiza en cada acierto).
+
+    Atributos:
+        - directorio: Carpeta donde se guardan las entradas.
+        - tamano_maximo_bytes: Tamaño máximo total de la caché en disco.
+    """
+
+    def __init__(self, directorio: str, tamano_maximo_bytes: int = TAMANO_MAXIMO_PREDETERMINADO):
+        self.directorio = directorio
+        self.tamano_maximo_bytes = tamano_maximo_bytes
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._bytes_ahorrados = 0
+
+    @staticmethod
+    def clave(contenido_pdf: bytes, version_parser: str) -> str:
+        """Clave direccionada por contenido para un PDF y una versión del parser."""
+        return f"{hashlib.sha256(contenido_pdf).hexdigest()}-v{version_parser}"
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.json")
+
+    def obtener(self, clave: str, tamano_pdf: int = 0) -> Optional[List[FilaCruda]]:
+        """
+        Devuelve las filas almacenadas para la clave, o None si no están en caché.
+
+        Args:
+            clave: Clave generada con CacheExtractos.clave.
+            tamano_pdf: Tamaño del PDF, contabilizado como bytes ahorrados en un acierto.
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                filas = [tuple(fila) for fila in json.load(f)]
+            os.utime(ruta)  # Marca la entrada como usada recientemente
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            with self._lock:
+                self._fallos += 1
+            return None
+
+        with self._lock:
+            self._aciertos += 1
+            self._bytes_ahorrados += tamano_pdf
+        return filas
+
+    def guardar(self, clave: str, filas: List[FilaCruda]) -> None:
+        """Guarda las filas de un extracto y aplica el límite de tamaño."""
+        os.makedirs(self.directorio, exist_ok=True)
+        # Escritura atómica: varios procesos pueden compartir la misma caché
+        descriptor, ruta_temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                json.dump([list(fila) for fila in filas], f, separators=(",", ":"))
+            os.replace(ruta_temporal, self._ruta(clave))
+        except Exception:
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+            raise
+        self._desalojar()
+
+    def _entradas(self) -> List[Tuple[float, int, str]]:
+        entradas = []
+        if not os.path.isdir(self.directorio):
+            return entradas
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(".json"):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                stat = os.stat(ruta)
+            except FileNotFoundError:
+                continue  # Desalojada por otro proceso
+            entradas.append((stat.st_mtime, stat.st_size, ruta))
+        return entradas
+
+    def _desalojar(self) -> None:
+        entradas = self._entradas()
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.tamano_maximo_bytes:
+                break
+            try:
+                os.remove(ruta)
+                logging.info(f"Caché de extractos: desalojada {os.path.basename(ruta)}")
+            except FileNotFoundError:
+                pass
+            total -= tamano
+
+    def estadisticas(self) -> EstadisticasCache:
+        """Resumen de aciertos, fallos, bytes ahorrados y ocupación en disco."""
+        entradas = self._entradas()
+        with self._lock:
+            return EstadisticasCache(
+                aciertos=self._aciertos,
+                fallos=self._fallos,
+                bytes_ahorrados=self._bytes_ahorrados,
+                entradas=len(entradas),
+                bytes_en_disco=sum(tamano for _, tamano, _ in entradas),
+            )
+
+
+def crear_cache_extractos(
+    directorio: Optional[str], tamano_maximo_bytes: Optional[int] = None
+) -> Optional[CacheExtractos]:
+    """Crea la caché si hay un directorio configurado; sin directorio la caché queda desactivada."""
+    if not directorio:
+        return None
+    return CacheExtractos(directorio, tamano_maximo_bytes or TAMANO_MAXIMO_PREDETERMINADO)
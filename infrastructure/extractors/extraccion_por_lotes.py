@@ -0,0 +1,147 @@
+# infrastructure/extractors/extraccion_por_lotes.py
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from domain.models.models import TipoCuentaBancaria
+from infrastructure.extractors.cache_extractos import crear_cache_extractos
+from infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia import (
+    ExtractorDePagosPorNitBancolombia,
+)
+
+ClaveLote = Tuple[str, str]  # (fecha YYYYMMDD, tipo_cuenta)
+
+
+def fechas_en_rango(fecha_inicio: str, fecha_fin: str) -> List[str]:
+    """Devuelve las fechas YYYYMMDD entre fecha_inicio y fecha_fin (ambas incluidas)."""
+    inicio: date = datetime.strptime(fecha_inicio, "%Y%m%d").date()
+    fin: date = datetime.strptime(fecha_fin, "%Y%m%d").date()
+    if fin < inicio:
+        raise ValueError("La fecha final no puede ser anterior a la fecha inicial.")
+    return [
+        (inicio + timedelta(days=dias)).strftime("%Y%m%d")
+        for dias in range((fin - inicio).days + 1)
+    ]
+
+
+def _extraer_un_pdf(
+    directorio_bancolombia_data: str, fecha_pdf: str, tipo_cuenta: str, directorio_cache: Optional[str] = None
+) -> Dict[str, float]:
+    # Función de módulo para que pueda serializarse hacia los procesos del pool
+    extractor = ExtractorDePagosPorNitBancolombia(
+        directorio_bancolombia_data=directorio_bancolombia_data,
+        cache=crear_cache_extractos(directorio_cache),
+    )
+    return extractor.extract_data(fecha_pdf=fecha_pdf, tipo_cuenta=tipo_cuenta)
+
+
+def extraer_pagos_por_lote(
+    directorio_bancolombia_data: str,
+    fecha_inicio: str,
+    fecha_fin: str,
+    tipos_cuenta: Sequence[str] = tuple(t.value for t in TipoCuentaBancaria),
+    max_procesos: Optional[int] = None,
+    directorio_cache: Optional[str] = None,
+) -> Dict[ClaveLote, Dict[str, float]]:
+    """
+    Extrae los pagos de todos los PDF existentes en el rango de fechas, repartiendo
+    cada archivo {directorio}/{tipo_cuenta}/{YYYYMMDD}.pdf en un pool de procesos.
+
+    Args:
+        directorio_bancolombia_data: Directorio con las carpetas ahorros/corriente.
+        fecha_inicio, fecha_fin: Rango de fechas YYYYMMDD (incluidas).
+        tipos_cuenta: Tipos de cuenta a procesar.
+        max_procesos: Número de procesos del pool. None usa todos los núcleos;
+            1 procesa en el proceso actual sin crear el pool.
+        directorio_cache: Directorio de CacheExtractos compartido por los procesos (opcional).
+
+    Returns:
+        dict: {(fecha, tipo_cuenta): {nit: valor_total}} sólo para los PDF encontrados y
+        extraídos sin error. Un PDF que falla se registra en el log y se omite, sin detener
+        el resto del lote (igual con y sin pool).
+    """
+    trabajos: List[ClaveLote] = [
+        (fecha, tipo_cuenta)
+        for fecha in fechas_en_rango(fecha_inicio, fecha_fin)
+        for tipo_cuenta in tipos_cuenta
+        if os.path.exists(os.path.join(directorio_bancolombia_data, tipo_cuenta, f"{fecha}.pdf"))
+    ]
+    logging.info(f"Extracción por lote: {len(trabajos)} archivos PDF entre {fecha_inicio} y {fecha_fin}")
+
+    resultados: Dict[ClaveLote, Dict[str, float]] = {}
+    if max_procesos == 1 or len(trabajos) <= 1:
+        for fecha, tipo_cuenta in trabajos:
+            try:
+                resultados[(fecha, tipo_cuenta)] = _extraer_un_pdf(
+                    directorio_bancolombia_data, fecha, tipo_cuenta, directorio_cache
+                )
+            except Exception as e:
+                logging.error(f"Error extrayendo {tipo_cuenta}/{fecha}.pdf >>> {e}", exc_info=True)
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=max_procesos) as pool:
+        futuros = {
+            pool.submit(
+                _extraer_un_pdf, directorio_bancolombia_data, fecha, tipo_cuenta, directorio_cache
+            ): (fecha, tipo_cuenta)
+            for fecha, tipo_cuenta in trabajos
+        }
+        for futuro in as_completed(futuros):
+            clave = futuros[futuro]
+            try:
+                resultados[clave] = futuro.result()
+            except Exception as e:
+                logging.error(f"Error extrayendo {clave[1]}/{clave[0]}.pdf >>> {e}", exc_info=True)
+
+    # Orden estable por fecha y tipo de cuenta, independiente del orden de finalización
+    return {clave: resultados[clave] for clave in trabajos if clave in resultados}
+
+
+def _parsear_argumentos(argumentos: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extrae en paralelo los pagos de los extractos Bancolombia de un rango de fechas."
+    )
+    parser.add_argument("fecha_inicio", help="Fecha inicial YYYYMMDD")
+    parser.add_argument("fecha_fin", help="Fecha final YYYYMMDD (incluida)")
+    parser.add_argument("--directorio", default=None, help="Directorio bancolombia_data (por defecto el de config)")
+    parser.add_argument(
+        "--tipo-cuenta", action="append", choices=[t.value for t in TipoCuentaBancaria],
+        help="Tipo de cuenta a procesar; se puede repetir (por defecto ambos)",
+    )
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos (por defecto config o núcleos disponibles)")
+    parser.add_argument("--sin-cache", action="store_true", help="No usar la caché de extractos")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de salida (por defecto stdout)")
+    return parser.parse_args(argumentos)
+
+
+def main(argumentos: Optional[Iterable[str]] = None) -> None:
+    from config.app_config import config
+
+    args = _parsear_argumentos(argumentos)
+    resultados = extraer_pagos_por_lote(
+        directorio_bancolombia_data=args.directorio or config.directorio_pagos,
+        fecha_inicio=args.fecha_inicio,
+        fecha_fin=args.fecha_fin,
+        tipos_cuenta=args.tipo_cuenta or [t.value for t in TipoCuentaBancaria],
+        max_procesos=args.procesos or config.procesos_extraccion,
+        directorio_cache=None if args.sin_cache else config.directorio_cache_extractos,
+    )
+    salida = json.dumps(
+        {f"{fecha}/{tipo_cuenta}": pagos for (fecha, tipo_cuenta), pagos in resultados.items()},
+        indent=4,
+    )
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(salida)
+    else:
+        print(salida)
+
+
+if __name__ == "__main__":
+    # python -m infrastructure.extractors.extraccion_por_lotes 20250401 20250430 --procesos 8
+    main()
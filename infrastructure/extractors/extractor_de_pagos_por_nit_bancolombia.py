@@ -1,76 +1,199 @@
 # infrastructure/extractors/extractor_de_pagos_por_nit_bancolombia.py
 
+import io
 import os
 import re
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pypdf import PdfReader
-from typing import Dict
-from pydantic import BaseModel, Field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
+
+from .cache_extractos import CacheExtractos, FilaCruda
+from .resolutor_referencias import ResolutorReferencias, obtener_resolutor_predeterminado
+from .tabla_transacciones import TablaTransacciones, TransaccionBancaria, valor_a_centavos
+
+# Versión del parser de filas. Incrementarla invalida las entradas de CacheExtractos
+VERSION_PARSER = "1"
+
+# Pattern to extract rows with the format (date, referencia 1, and valor)
+PATRON_TRANSACCION = re.compile(r"(\d{4}/\d{2}/\d{2})\s+.*?\s+(\d+)\s+\d+\s+([-\d.,]+)")
+_PATRON_FECHA = re.compile(r"\d{4}/\d{2}/\d{2}")
+
+# Por debajo de este número de páginas por proceso no compensa arrancar el pool
+MINIMO_PAGINAS_POR_PROCESO = 8
+# Tramos por proceso: tramos más pequeños reparten mejor páginas de coste desigual
+_TRAMOS_POR_PROCESO = 4
+
+
+def iterar_filas_por_pagina(textos_paginas: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """
+    Recorre el texto de las páginas una a una y genera las filas (fecha, referencia, valor)
+    encontradas con PATRON_TRANSACCION.
+
+    La última coincidencia de cada página se re-evalúa junto con la página siguiente, de modo
+    que las filas que cruzan el límite entre páginas se obtienen igual que sobre el texto
+    concatenado, pero en memoria sólo se retiene una página (más ese remanente).
+    """
+    remanente = ""
+    for texto_pagina in textos_paginas:
+        texto = remanente + (texto_pagina or "")
+        pendiente = None
+        for match in PATRON_TRANSACCION.finditer(texto):
+            if pendiente is not None:
+                yield pendiente.groups()
+            pendiente = match
+        if pendiente is not None:
+            inicio_remanente = pendiente.start()
+        else:
+            # Sin coincidencias: una fila sólo puede empezar en una fecha, así que basta
+            # conservar desde la última fecha (o los últimos caracteres por si quedó cortada)
+            fechas = list(_PATRON_FECHA.finditer(texto))
+            inicio_remanente = fechas[-1].start() if fechas else max(len(texto) - 10, 0)
+        remanente = texto[inicio_remanente:]
+
+    for match in PATRON_TRANSACCION.finditer(remanente):
+        yield match.groups()
+
+
+def rangos_de_paginas(total_paginas: int, numero_tramos: int) -> List[Tuple[int, int]]:
+    """Divide [0, total_paginas) en numero_tramos rangos contiguos [inicio, fin) de tamaño similar."""
+    numero_tramos = max(1, min(numero_tramos, total_paginas))
+    base, resto = divmod(total_paginas, numero_tramos)
+    rangos, inicio = [], 0
+    for tramo in range(numero_tramos):
+        fin = inicio + base + (1 if tramo < resto else 0)
+        rangos.append((inicio, fin))
+        inicio = fin
+    return rangos
+
+
+# Lector del PDF en cada proceso del pool; se abre una vez por proceso en el inicializador
+_lector_trabajador: Optional[PdfReader] = None
+
+
+def _inicializar_trabajador_paginas(contenido: bytes) -> None:
+    global _lector_trabajador
+    _lector_trabajador = PdfReader(io.BytesIO(contenido))
+
+
+def _extraer_textos_paginas(rango: Tuple[int, int]) -> List[str]:
+    inicio, fin = rango
+    return [_lector_trabajador.pages[i].extract_text() for i in range(inicio, fin)]
+
+
+def iterar_textos_paginas_en_paralelo(contenido: bytes, total_paginas: int, procesos: int) -> Iterator[str]:
+    """
+    Extrae el texto de las páginas del PDF repartiendo tramos contiguos de páginas entre
+    varios procesos. Los tramos se devuelven en orden, de modo que el texto llega en el mismo
+    orden de páginas que con el recorrido secuencial y puede consumirse mientras los
+    siguientes tramos se siguen extrayendo.
+    """
+    rangos = rangos_de_paginas(total_paginas, procesos * _TRAMOS_POR_PROCESO)
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        initializer=_inicializar_trabajador_paginas,
+        initargs=(contenido,),
+    ) as pool:
+        for textos in pool.map(_extraer_textos_paginas, rangos):
+            yield from textos
 
-from .EXTRA_REF import EXTRA_REF
 
 class ExtractorDePagosPorNitBancolombia(BaseModel):
     """
     Extractor for Bancolombia PDF files.
     This class extracts NIT and associated values from the PDF file.
     """
-        
+
     directorio_bancolombia_data: str = Field(..., description="Directorio donde se encuentran las carpetas de Ahorro y Corriente de Bancolombia")
+    cache: Optional[CacheExtractos] = Field(None, description="Caché de filas extraídas; si es None siempre se procesa el PDF")
+    resolutor: Optional[ResolutorReferencias] = Field(None, description="Resolutor referencia -> NIT; si es None se usa el predeterminado de config")
+    procesos_paginas: Optional[int] = Field(None, description="Procesos para extraer en paralelo las páginas de un PDF grande; None o 1 es secuencial")
 
-    def extract_data(self, fecha_pdf: str, tipo_cuenta: str) -> Dict[str, float]:
-        """
-        Extracts NIT and associated values from the PDF file.
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
-        Returns:
-            dict: A dictionary where the key is the NIT (str) and the value is a list of transaction amounts (float).
+    def _ruta_pdf(self, fecha_pdf: str, tipo_cuenta: str) -> str:
+        return os.path.join(self.directorio_bancolombia_data, tipo_cuenta, f"{fecha_pdf}.pdf")
+
+    def _textos_paginas(self, contenido: bytes) -> Iterator[str]:
         """
-        try:
-            directorio_pdf = os.path.join(self.directorio_bancolombia_data, tipo_cuenta, f"{fecha_pdf}.pdf")
+        Texto de cada página en orden. Con procesos_paginas > 1 y suficientes páginas, la
+        extracción (la parte costosa de pypdf) se reparte por tramos entre varios procesos.
+        """
+        reader = PdfReader(io.BytesIO(contenido))
+        total_paginas = len(reader.pages)
+        procesos = min(self.procesos_paginas or 1, total_paginas // MINIMO_PAGINAS_POR_PROCESO)
+        if procesos > 1:
+            del reader
+            logging.info(f"Extrayendo {total_paginas} páginas con {procesos} procesos")
+            yield from iterar_textos_paginas_en_paralelo(contenido, total_paginas, procesos)
+            return
+        for page in reader.pages:
+            yield page.extract_text()
+
+    def _iter_filas(self, directorio_pdf: str) -> Iterator[FilaCruda]:
+        """
+        Genera las filas crudas del PDF. Con caché, un acierto evita pypdf por completo; en un
+        fallo las filas se guardan en la caché una vez se ha recorrido todo el documento.
+        """
+        if self.cache is None and (self.procesos_paginas or 1) <= 1:
             reader = PdfReader(directorio_pdf)
-            text = ""
-
-            # Extract text from all pages in the PDF
-            for page in reader.pages:
-                text += page.extract_text()
-
-            # Pattern to extract rows with the format (date, referencia 1, and valor)
-            pattern = r"(\d{4}/\d{2}/\d{2})\s+.*?\s+(\d+)\s+\d+\s+([-\d.,]+)"
-
-            data_dict = {}
+            yield from iterar_filas_por_pagina(page.extract_text() for page in reader.pages)
+            return
+
+        with open(directorio_pdf, "rb") as f:
+            contenido = f.read()
+        if self.cache is None:
+            yield from iterar_filas_por_pagina(self._textos_paginas(contenido))
+            return
+
+        clave = self.cache.clave(contenido, VERSION_PARSER)
+        filas = self.cache.obtener(clave, tamano_pdf=len(contenido))
+        if filas is not None:
+            yield from filas
+            return
+
+        filas = []
+        for fila in iterar_filas_por_pagina(self._textos_paginas(contenido)):
+            filas.append(fila)
+            yield fila
+        self.cache.guardar(clave, filas)
+
+    def iter_transacciones(self, fecha_pdf: str, tipo_cuenta: str) -> Iterator[TransaccionBancaria]:
+        """
+        Genera las transacciones del PDF página por página.
 
-            # Iterate over each match found using the pattern
-            for match in re.finditer(pattern, text):
-                nit_orig = match.group(2)
+        El texto de cada página se procesa y se descarta antes de leer la siguiente, por lo que
+        la memoria usada queda acotada por el tamaño de una página y las primeras transacciones
+        están disponibles antes de terminar de leer el documento.
 
-                if nit_orig.startswith("0"):
-                    nit_cleaned = nit_orig.lstrip('0')
-                    nit = EXTRA_REF.get(nit_cleaned, "")
-                else:
-                    nit = nit_orig
+        Yields:
+            TransaccionBancaria: Transacciones con valor positivo y NIT resuelto.
+        """
+        directorio_pdf = self._ruta_pdf(fecha_pdf, tipo_cuenta)
+        resolutor = self.resolutor if self.resolutor is not None else obtener_resolutor_predeterminado()
+        try:
+            for fecha, nit_orig, valor_str in self._iter_filas(directorio_pdf):
+                nit = resolutor.resolver(nit_orig)
 
                 if not nit:
                     continue
 
-                description = match.group(1)
-                valor_str = match.group(3)
-
-                # Convert VALOR to float by removing commas
-                valor = float(valor_str.replace(",", ""))
+                # Convert VALOR to integer cents (exact, no float round-trip); a malformed
+                # VALOR skips only its row
+                try:
+                    monto_centavos = valor_a_centavos(valor_str)
+                except ValueError as e:
+                    logging.warning(f"Fila omitida en {directorio_pdf} (referencia {nit_orig}): {e}")
+                    continue
 
                 # Filter positive values and skip rows with "ABONO INTERESES AHORROS"
-                if valor > 0 and \
-                        "ABONO INTERESES AHORROS" not in description:
-                    # Add to the dictionary; append to the list if the key exists
-                    if nit in data_dict:
-                        data_dict[nit].append(valor)
-                    else:
-                        # Create a new list with the first value
-                        data_dict[nit] = [valor]
-
-            nit_pagos_total: Dict[str, float] = {k: sum(v) for k, v in data_dict.items()}
-
-            return nit_pagos_total
+                if monto_centavos > 0 and \
+                        "ABONO INTERESES AHORROS" not in fecha:
+                    yield TransaccionBancaria(
+                        fecha=fecha, referencia=nit_orig, nit=nit, monto_centavos=monto_centavos
+                    )
 
         except FileNotFoundError as e:
             logging.error(
@@ -78,7 +201,7 @@ class ExtractorDePagosPorNitBancolombia(BaseModel):
                 exc_info=True
             )
             raise e
-        
+
         except Exception as e:
             logging.error(
                 f"Error al obtener los datos del archivo .pdf >>> {e}",
@@ -86,8 +209,36 @@ class ExtractorDePagosPorNitBancolombia(BaseModel):
             )
             raise e  # Re-raise the exception after logging
 
+    def extract_transacciones(self, fecha_pdf: str, tipo_cuenta: str) -> TablaTransacciones:
+        """
+        Extrae el detalle de transacciones (fecha, referencia, NIT y monto en centavos) como
+        una tabla columnar, para los llamadores que necesitan algo más que el total por NIT.
+        """
+        return TablaTransacciones.desde_transacciones(
+            self.iter_transacciones(fecha_pdf, tipo_cuenta)
+        )
+
+    def extract_data(self, fecha_pdf: str, tipo_cuenta: str) -> Dict[str, float]:
+        """
+        Extracts NIT and associated values from the PDF file.
+
+        Returns:
+            dict: A dictionary where the key is the NIT (str) and the value is the sum of its transaction amounts (float).
+        """
+        totales_centavos: Dict[str, int] = {}
+
+        for transaccion in self.iter_transacciones(fecha_pdf, tipo_cuenta):
+            totales_centavos[transaccion.nit] = (
+                totales_centavos.get(transaccion.nit, 0) + transaccion.monto_centavos
+            )
+
+        # The sum is exact in cents; only the final total is converted to float
+        nit_pagos_total: Dict[str, float] = {k: v / 100 for k, v in totales_centavos.items()}
+
+        return nit_pagos_total
+
 if __name__ == "__main__":
-    
+
     logging.basicConfig(
         filename="logs/resultado_extractor_de_pagos_por_nit_bancolombia.log",  # Log file name
         format="\n%(asctime)s - %(levelname)s - %(message)s",
@@ -100,4 +251,3 @@ if __name__ == "__main__":
     extractor = ExtractorDePagosPorNitBancolombia(directorio_bancolombia_data=pdf_path)
     nit_pagos_totales: Dict = extractor.extract_data()
     logging.info(json.dumps(nit_pagos_totales, indent=4))
-
@@ -11,22 +11,39 @@ class ExtractorPagosPDF(AbstractExtractorPagos):
     """
     Clase que implementa la interfaz AbstractExtractorPagos para extraer datos de pagos desde un PDF.
     Utiliza la clase ExtractorDePagosPorNitBancolombia para realizar la extracción de datos.
-    
+
     Atributos:
     - procesador: Instancia de ExtractorDePagosPorNitBancolombia para procesar el PDF.
+    - streaming: Si es True, consume las transacciones de forma perezosa (página por página)
+      en lugar de esperar el diccionario completo de extract_data. Los montos se suman en
+      centavos enteros y se convierten a Decimal sin pasar por float.
     """
 
-    def __init__(self, procesador_pdf: ExtractorDePagosPorNitBancolombia):
+    def __init__(self, procesador_pdf: ExtractorDePagosPorNitBancolombia, streaming: bool = False):
         self._procesador_pdf = procesador_pdf
+        self._streaming = streaming
+
+    def _totales_por_nit(self, fecha_pdf: str, tipo_cuenta: str) -> Dict[str, Decimal]:
+        if not self._streaming:
+            pagos_dict: Dict[str, float] = self._procesador_pdf.extract_data(
+                fecha_pdf=fecha_pdf, tipo_cuenta=tipo_cuenta
+            )
+            return {nit: Decimal(str(monto)) for nit, monto in pagos_dict.items()}
+
+        # Se acumula a medida que llegan las transacciones; el texto del PDF nunca se retiene completo
+        totales_centavos: Dict[str, int] = {}
+        for transaccion in self._procesador_pdf.iter_transacciones(fecha_pdf, tipo_cuenta):
+            totales_centavos[transaccion.nit] = (
+                totales_centavos.get(transaccion.nit, 0) + transaccion.monto_centavos
+            )
+        return {nit: Decimal(centavos).scaleb(-2) for nit, centavos in totales_centavos.items()}
 
     def obtener_pagos(self, fecha_pdf: str, tipo_cuenta: str) -> List[Pago]:
         # Asumiendo que procesador_pdf toma la fecha en formato YYYYMMDD
-        pagos_dict: Dict[str, float] = self._procesador_pdf.extract_data(
-            fecha_pdf=fecha_pdf, tipo_cuenta=tipo_cuenta
-        )
+        pagos_dict: Dict[str, Decimal] = self._totales_por_nit(fecha_pdf, tipo_cuenta)
 
         fecha_date: date = datetime.strptime(fecha_pdf, "%Y%m%d").date() # YYYMMDD
         return [
-            Pago(nit_cliente=nit, monto=Decimal(str(monto)), fecha_pago=fecha_date, cuenta_ingreso_banco="", cuenta_egreso_banco="")
+            Pago(nit_cliente=nit, monto=monto, fecha_pago=fecha_date, cuenta_ingreso_banco="", cuenta_egreso_banco="")
             for nit, monto in pagos_dict.items()
         ]
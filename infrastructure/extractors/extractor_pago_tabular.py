@@ -0,0 +1,286 @@
+# infrastructure/extractors/extractor_pago_tabular.py
+
+import csv
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from application.ports.interfaces import AbstractExtractorPagos
+from domain.models import Pago
+from domain.models.models import TipoCuentaBancaria
+from .cache_extractos import FilaCruda
+from .resolutor_referencias import ResolutorReferencias, obtener_resolutor_predeterminado
+from .tabla_transacciones import TransaccionBancaria, separador_decimal_de_valor, valor_a_centavos
+
+# Extensiones de las exportaciones tabulares de Bancolombia, en orden de preferencia
+EXTENSIONES_TABULARES = (".csv", ".xlsx")
+
+# Nombres aceptados para cada columna que se proyecta (el resto de columnas no se lee)
+COLUMNAS_EXTRACTO: Dict[str, Tuple[str, ...]] = {
+    "fecha": ("FECHA",),
+    "referencia": ("REFERENCIA 1", "REFERENCIA1", "REFERENCIA", "DCTO.", "DOCUMENTO"),
+    "valor": ("VALOR",),
+}
+
+# Filas a revisar buscando el encabezado (las exportaciones pueden traer un preámbulo)
+_MAXIMO_FILAS_PREAMBULO = 30
+
+_SEPARADORES_CSV = (";", ",", "\t", "|")
+
+
+def ruta_extracto_tabular(directorio_pagos: str, fecha: str, tipo_cuenta: str) -> Optional[str]:
+    """Ruta del extracto CSV/XLSX de la fecha y tipo de cuenta, o None si no existe."""
+    for extension in EXTENSIONES_TABULARES:
+        ruta = os.path.join(directorio_pagos, tipo_cuenta, f"{fecha}{extension}")
+        if os.path.isfile(ruta):
+            return ruta
+    return None
+
+
+def formato_extracto(
+    directorio_pagos: Optional[str],
+    fecha: Optional[str],
+    tipos_cuenta: Sequence[str] = tuple(t.value for t in TipoCuentaBancaria),
+) -> str:
+    """
+    Devuelve "tabular" si existe una exportación CSV/XLSX de la fecha para algún tipo de
+    cuenta, o "pdf" en caso contrario. Lo usa el Container para escoger el extractor.
+    """
+    if not directorio_pagos or not fecha:
+        return "pdf"
+    if any(ruta_extracto_tabular(directorio_pagos, fecha, tipo) for tipo in tipos_cuenta):
+        return "tabular"
+    return "pdf"
+
+
+def _normalizar_encabezado(valor) -> str:
+    return " ".join(str(valor or "").strip().upper().split())
+
+
+def _indices_columnas(encabezado: Sequence) -> Optional[Dict[str, int]]:
+    """Posición de cada columna de COLUMNAS_EXTRACTO en el encabezado, o None si falta alguna."""
+    normalizado = [_normalizar_encabezado(celda) for celda in encabezado]
+    indices = {}
+    for columna, alias in COLUMNAS_EXTRACTO.items():
+        posicion = next((normalizado.index(a) for a in alias if a in normalizado), None)
+        if posicion is None:
+            return None
+        indices[columna] = posicion
+    return indices
+
+
+def _celda_a_texto(valor) -> str:
+    """Convierte una celda tipada (fecha, número o texto) al texto equivalente del extracto PDF."""
+    if valor is None:
+        return ""
+    if isinstance(valor, (datetime, date)):
+        return valor.strftime("%Y/%m/%d")
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor).strip()
+
+
+def iterar_filas_csv(ruta: str) -> Iterator[FilaCruda]:
+    """
+    Genera las filas (fecha, referencia, valor) de una exportación CSV leyéndola en streaming
+    como texto. El separador se deduce de la línea de encabezado (los valores con separador
+    de miles confunden a csv.Sniffer) y sólo se conservan las columnas proyectadas de cada fila.
+
+    Se lee como UTF-8 (con o sin BOM); si aparece un byte inválido a mitad del archivo se
+    relee como latin-1 saltando las filas ya generadas (las líneas y separadores son ASCII en
+    ambos encodings, así que las filas coinciden).
+    """
+    generadas = 0
+    try:
+        for fila in _iterar_filas_csv(ruta, "utf-8-sig"):
+            yield fila
+            generadas += 1
+    except UnicodeDecodeError:
+        for numero, fila in enumerate(_iterar_filas_csv(ruta, "latin-1")):
+            if numero >= generadas:
+                yield fila
+
+
+def _iterar_filas_csv(ruta: str, encoding: str) -> Iterator[FilaCruda]:
+    with open(ruta, "r", encoding=encoding, newline="") as f:
+        separador, indices = None, None
+        for _ in range(_MAXIMO_FILAS_PREAMBULO):
+            linea = f.readline()
+            if not linea:
+                break
+            for candidato in _SEPARADORES_CSV:
+                indices = _indices_columnas(next(csv.reader([linea], delimiter=candidato), []))
+                if indices is not None:
+                    separador = candidato
+                    break
+            if separador is not None:
+                break
+        if separador is None:
+            raise ValueError(f"No se encontró el encabezado {list(COLUMNAS_EXTRACTO)} en {ruta}")
+
+        i_fecha, i_referencia, i_valor = indices["fecha"], indices["referencia"], indices["valor"]
+        ultimo = max(i_fecha, i_referencia, i_valor)
+        for fila in csv.reader(f, delimiter=separador):
+            if len(fila) <= ultimo:
+                continue
+            yield fila[i_fecha].strip(), fila[i_referencia].strip(), fila[i_valor].strip()
+
+
+def iterar_filas_xlsx(ruta: str) -> Iterator[FilaCruda]:
+    """
+    Genera las filas (fecha, referencia, valor) de una exportación XLSX usando openpyxl en
+    modo read_only: la hoja se recorre en streaming y sólo se leen las columnas necesarias.
+    """
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja = libro.active
+        fila_encabezado, indices = None, None
+        for numero_fila, fila in enumerate(
+            hoja.iter_rows(max_row=_MAXIMO_FILAS_PREAMBULO, values_only=True), start=1
+        ):
+            indices = _indices_columnas(fila)
+            if indices is not None:
+                fila_encabezado = numero_fila
+                break
+        if indices is None:
+            raise ValueError(f"No se encontró el encabezado {list(COLUMNAS_EXTRACTO)} en {ruta}")
+
+        # Proyección: sólo el rango de columnas entre la primera y la última necesaria
+        primera = min(indices.values())
+        ultima = max(indices.values())
+        i_fecha, i_referencia, i_valor = (
+            indices["fecha"] - primera, indices["referencia"] - primera, indices["valor"] - primera
+        )
+        for fila in hoja.iter_rows(
+            min_row=fila_encabezado + 1, min_col=primera + 1, max_col=ultima + 1, values_only=True
+        ):
+            if fila[i_valor] is None:
+                continue
+            yield _celda_a_texto(fila[i_fecha]), _celda_a_texto(fila[i_referencia]), _celda_a_texto(fila[i_valor])
+    finally:
+        libro.close()
+
+
+def _con_separador_decimal(
+    filas: Iterable[FilaCruda], separador_decimal: Optional[str]
+) -> Iterator[Tuple[FilaCruda, Optional[str]]]:
+    """
+    Acompaña cada fila con el separador decimal del extracto. Si no viene configurado se
+    deduce del primer valor que lo determina (ver separador_decimal_de_valor); las filas
+    anteriores, con valores sin separador o ambiguos, se retienen hasta entonces. Si ningún
+    valor lo determina esas filas salen con None.
+    """
+    if separador_decimal is not None:
+        for fila in filas:
+            yield fila, separador_decimal
+        return
+    retenidas: List[FilaCruda] = []
+    for fila in filas:
+        if separador_decimal is None:
+            separador_decimal = separador_decimal_de_valor(fila[2])
+            if separador_decimal is None:
+                retenidas.append(fila)
+                continue
+            for retenida in retenidas:
+                yield retenida, separador_decimal
+            retenidas = []
+        yield fila, separador_decimal
+    for retenida in retenidas:
+        yield retenida, None
+
+
+class ExtractorPagosTabular(AbstractExtractorPagos):
+    """
+    Implementación de AbstractExtractorPagos que lee las exportaciones CSV/XLSX del extracto
+    de Bancolombia en lugar del PDF. Aplica las mismas reglas que el extractor de PDF
+    (resolución de la referencia al NIT, sólo valores positivos, montos en centavos) y
+    produce la misma lista de Pago.
+
+    Atributos:
+    - directorio_pagos: Directorio con las carpetas ahorros/corriente.
+    - resolutor: Resolutor referencia -> NIT; si es None se usa el predeterminado de config.
+    - extractor_respaldo: Extractor a usar para los tipos de cuenta sin exportación tabular
+      en la fecha (normalmente ExtractorPagosPDF).
+    - separador_decimal: "." o "," en los valores del CSV; None lo deduce del archivo. En
+      XLSX las celdas numéricas usan siempre "." (salvo que se configure otro).
+
+    Una fila con un VALOR no numérico, ambiguo o con otro separador decimal se omite con
+    una advertencia en el log, igual que en el extractor de PDF, en lugar de abortar el extracto.
+    """
+
+    def __init__(
+        self,
+        directorio_pagos: str,
+        resolutor: Optional[ResolutorReferencias] = None,
+        extractor_respaldo: Optional[AbstractExtractorPagos] = None,
+        separador_decimal: Optional[str] = None,
+    ):
+        if separador_decimal not in (None, ".", ","):
+            raise ValueError(f"Separador decimal no soportado: {separador_decimal!r}")
+        self._directorio_pagos = directorio_pagos
+        self._resolutor = resolutor
+        self._extractor_respaldo = extractor_respaldo
+        self._separador_decimal = separador_decimal
+
+    def iter_transacciones(self, fecha: str, tipo_cuenta: str) -> Iterator[TransaccionBancaria]:
+        ruta = ruta_extracto_tabular(self._directorio_pagos, fecha, tipo_cuenta)
+        if ruta is None:
+            raise FileNotFoundError(
+                f"No hay extracto CSV/XLSX para {tipo_cuenta}/{fecha} en {self._directorio_pagos}"
+            )
+        if ruta.lower().endswith(".xlsx"):
+            filas = iterar_filas_xlsx(ruta)
+            separador_decimal = self._separador_decimal or "."
+        else:
+            filas = iterar_filas_csv(ruta)
+            separador_decimal = self._separador_decimal
+        resolutor = self._resolutor if self._resolutor is not None else obtener_resolutor_predeterminado()
+
+        for (fecha_fila, referencia, valor_str), separador in _con_separador_decimal(filas, separador_decimal):
+            if not referencia or not valor_str:
+                continue
+            nit = resolutor.resolver(referencia)
+            if not nit:
+                continue
+            try:
+                if separador is None and ("." in valor_str or "," in valor_str):
+                    raise ValueError(f"Valor ambiguo en el extracto (separador decimal desconocido): {valor_str!r}")
+                monto_centavos = valor_a_centavos(valor_str, separador or ".")
+            except ValueError as e:
+                logging.warning(f"Fila omitida en {ruta} (referencia {referencia}): {e}")
+                continue
+            if monto_centavos > 0:
+                yield TransaccionBancaria(
+                    fecha=fecha_fila, referencia=referencia, nit=nit, monto_centavos=monto_centavos
+                )
+
+    def obtener_pagos(self, fecha_pdf: str, tipo_cuenta: str) -> List[Pago]:
+        if ruta_extracto_tabular(self._directorio_pagos, fecha_pdf, tipo_cuenta) is None:
+            if self._extractor_respaldo is None:
+                raise FileNotFoundError(
+                    f"No hay extracto CSV/XLSX para {tipo_cuenta}/{fecha_pdf} en {self._directorio_pagos}"
+                )
+            logging.info(f"Sin exportación tabular para {tipo_cuenta}/{fecha_pdf}; se usa el extractor de respaldo.")
+            return self._extractor_respaldo.obtener_pagos(fecha_pdf, tipo_cuenta)
+
+        totales_centavos: Dict[str, int] = {}
+        for transaccion in self.iter_transacciones(fecha_pdf, tipo_cuenta):
+            totales_centavos[transaccion.nit] = (
+                totales_centavos.get(transaccion.nit, 0) + transaccion.monto_centavos
+            )
+
+        fecha_date: date = datetime.strptime(fecha_pdf, "%Y%m%d").date()
+        return [
+            Pago(
+                nit_cliente=nit,
+                monto=Decimal(centavos).scaleb(-2),
+                fecha_pago=fecha_date,
+                cuenta_ingreso_banco="",
+                cuenta_egreso_banco="",
+            )
+            for nit, centavos in totales_centavos.items()
+        ]
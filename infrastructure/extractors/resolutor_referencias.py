@@ -0,0 +1,199 @@
+# infrastructure/extractors/resolutor_referencias.py
+
+import argparse
+import csv
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from domain.services.indice_nit import IndiceNit
+
+
+def normalizar_referencia(referencia: str) -> str:
+    """Las referencias se indexan sin ceros a la izquierda: '0084146038' y '84146038' son la misma."""
+    return referencia.strip().lstrip("0")
+
+
+class ResolutorReferencias:
+    """
+    Resuelve la referencia bancaria de un pago al NIT del cliente.
+
+    El mapeo referencia -> NIT vive en un índice SQLite en disco (tabla `referencias` con la
+    referencia normalizada como clave primaria). El índice se carga de forma perezosa en un
+    diccionario en la primera consulta, por lo que cada búsqueda es O(1), y se recarga
+    automáticamente cuando cambia el archivo (se revisa como máximo cada intervalo_revision_s).
+
+    Si el índice aún no existe se usa como semilla el diccionario EXTRA_REF, importado sólo
+    en ese caso.
+
+    Una referencia sin mapeo que empieza por "0" suele ser un número de cuenta, pero también
+    puede ser un NIT (o NIT+DV) con ceros a la izquierda. Si se indica nits_conocidos, esas
+    referencias se buscan con IndiceNit entre los NIT conocidos (los de la cartera) y sólo se
+    descartan si no corresponden a ninguno.
+
+    Atributos:
+        - ruta_indice: Ruta del archivo SQLite (None usa únicamente la semilla).
+        - intervalo_revision_s: Segundos mínimos entre revisiones de cambios del archivo.
+        - nits_conocidos: Callable que devuelve los NIT conocidos (opcional, se llama de
+          forma perezosa la primera vez que hace falta).
+        - segundos_vigencia_nits: Cada cuánto se vuelve a pedir nits_conocidos.
+    """
+
+    def __init__(
+        self,
+        ruta_indice: Optional[str],
+        intervalo_revision_s: float = 2.0,
+        nits_conocidos: Optional[Callable[[], Iterable[str]]] = None,
+        segundos_vigencia_nits: float = 300.0,
+    ):
+        self.ruta_indice = ruta_indice
+        self.intervalo_revision_s = intervalo_revision_s
+        self.nits_conocidos = nits_conocidos
+        self.segundos_vigencia_nits = segundos_vigencia_nits
+        self._mapeo: Optional[Dict[str, str]] = None
+        self._firma: Optional[Tuple[int, int]] = None
+        self._proxima_revision = 0.0
+        self._indice_nits: Optional[IndiceNit] = None
+        self._vencimiento_indice_nits = 0.0
+        self._lock = threading.Lock()
+
+    def _firma_archivo(self) -> Optional[Tuple[int, int]]:
+        if not self.ruta_indice:
+            return None
+        try:
+            stat = os.stat(self.ruta_indice)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _cargar(self, firma: Optional[Tuple[int, int]]) -> Dict[str, str]:
+        if firma is None:
+            from .EXTRA_REF import EXTRA_REF
+            logging.warning(
+                f"Índice de referencias no encontrado en {self.ruta_indice}; usando EXTRA_REF como semilla."
+            )
+            return {normalizar_referencia(ref): nit for ref, nit in EXTRA_REF.items()}
+
+        conexion = sqlite3.connect(self.ruta_indice)
+        try:
+            mapeo = dict(conexion.execute("SELECT referencia, nit FROM referencias"))
+        finally:
+            conexion.close()
+        logging.info(f"Índice de referencias cargado: {len(mapeo)} referencias desde {self.ruta_indice}")
+        return mapeo
+
+    def _mapeo_vigente(self) -> Dict[str, str]:
+        ahora = time.monotonic()
+        if self._mapeo is not None and ahora < self._proxima_revision:
+            return self._mapeo
+
+        with self._lock:
+            if self._mapeo is None or ahora >= self._proxima_revision:
+                firma = self._firma_archivo()
+                if self._mapeo is None or firma != self._firma:
+                    self._mapeo = self._cargar(firma)
+                    self._firma = firma
+                self._proxima_revision = ahora + self.intervalo_revision_s
+        return self._mapeo
+
+    def resolver(self, referencia: str) -> str:
+        """
+        Devuelve el NIT asociado a la referencia, consultando el índice con y sin ceros a la
+        izquierda. Una referencia sin mapeo que no empieza por "0" es el propio NIT (el caso
+        de uso la empareja además como NIT+DV, ver IndiceNit). Una que empieza por "0" se
+        devuelve como el NIT conocido al que corresponde sin los ceros (o sin los ceros y el
+        DV), o "" si no corresponde a ninguno.
+        """
+        nit = self._mapeo_vigente().get(normalizar_referencia(referencia))
+        if nit:
+            return nit
+        if not referencia.startswith("0"):
+            return referencia
+        indice_nits = self._indice_nits_vigente()
+        return (indice_nits.resolver(referencia) if indice_nits is not None else None) or ""
+
+    def _indice_nits_vigente(self) -> Optional[IndiceNit]:
+        if self.nits_conocidos is None:
+            return None
+        ahora = time.monotonic()
+        with self._lock:
+            if self._indice_nits is None or ahora >= self._vencimiento_indice_nits:
+                try:
+                    self._indice_nits = IndiceNit(self.nits_conocidos())
+                except Exception as e:
+                    # Sin NIT conocidos las referencias con ceros se descartan, como sin índice
+                    logging.warning(f"No se pudieron obtener los NIT conocidos: {e}")
+                    self._indice_nits = IndiceNit(())
+                self._vencimiento_indice_nits = ahora + self.segundos_vigencia_nits
+            return self._indice_nits
+
+    def __len__(self) -> int:
+        return len(self._mapeo_vigente())
+
+
+def construir_indice(ruta_indice: str, mapeo: Iterable[Tuple[str, str]]) -> int:
+    """
+    Crea o reemplaza el índice SQLite con los pares (referencia, nit). El archivo se escribe
+    aparte y se reemplaza de forma atómica para que los lectores nunca vean un índice a medias.
+
+    Returns:
+        int: Número de referencias escritas.
+    """
+    ruta_temporal = f"{ruta_indice}.tmp"
+    if os.path.exists(ruta_temporal):
+        os.remove(ruta_temporal)
+    conexion = sqlite3.connect(ruta_temporal)
+    try:
+        conexion.execute(
+            "CREATE TABLE referencias (referencia TEXT PRIMARY KEY, nit TEXT NOT NULL) WITHOUT ROWID"
+        )
+        conexion.executemany(
+            "INSERT OR REPLACE INTO referencias (referencia, nit) VALUES (?, ?)",
+            ((normalizar_referencia(ref), nit.strip()) for ref, nit in mapeo),
+        )
+        conexion.commit()
+        total = conexion.execute("SELECT COUNT(*) FROM referencias").fetchone()[0]
+    finally:
+        conexion.close()
+    os.replace(ruta_temporal, ruta_indice)
+    return total
+
+
+_resolutor_predeterminado: Optional[ResolutorReferencias] = None
+
+
+def obtener_resolutor_predeterminado() -> ResolutorReferencias:
+    """Resolutor compartido del proceso, con la ruta de config.ruta_indice_referencias."""
+    global _resolutor_predeterminado
+    if _resolutor_predeterminado is None:
+        from config.app_config import config
+        _resolutor_predeterminado = ResolutorReferencias(config.ruta_indice_referencias)
+    return _resolutor_predeterminado
+
+
+def main(argumentos: Optional[Iterable[str]] = None) -> None:
+    from config.app_config import config
+
+    parser = argparse.ArgumentParser(description="Construye el índice referencia bancaria -> NIT.")
+    parser.add_argument("--csv", default=None, help="CSV con columnas referencia,nit (por defecto se importa EXTRA_REF)")
+    parser.add_argument("--indice", default=None, help="Ruta del índice SQLite (por defecto la de config)")
+    args = parser.parse_args(argumentos)
+
+    if args.csv:
+        with open(args.csv, newline="", encoding="utf-8") as f:
+            pares = [(fila["referencia"], fila["nit"]) for fila in csv.DictReader(f)]
+    else:
+        from .EXTRA_REF import EXTRA_REF
+        pares = list(EXTRA_REF.items())
+
+    ruta_indice = args.indice or config.ruta_indice_referencias
+    total = construir_indice(ruta_indice, pares)
+    print(f"Índice {ruta_indice} construido con {total} referencias.")
+
+
+if __name__ == "__main__":
+    # python -m infrastructure.extractors.resolutor_referencias --csv referencias.csv
+    main()
@@ -0,0 +1,134 @@
+# infrastructure/extractors/tabla_transacciones.py
+
+import re
+from array import array
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+_CENTAVO = Decimal("0.01")
+
+# Formato aceptado por separador decimal: miles en grupos de tres (o sin separador de miles)
+_PATRONES_VALOR = {
+    ".": re.compile(r"[+-]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?"),
+    ",": re.compile(r"[+-]?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?"),
+}
+
+
+def valor_a_centavos(valor_str: str, separador_decimal: str = ".") -> int:
+    """
+    Convierte un valor del extracto ("1,234,567.89", "-20.00", o "1.234.567,89" con
+    separador_decimal=",") a centavos enteros sin pasar por float. Las fracciones de centavo
+    se redondean hacia el valor más cercano (mitad hacia arriba). Un valor que no cumple el
+    formato del separador indicado (p. ej. "1.234,56" con ".") es un ValueError.
+    """
+    texto = valor_str.strip()
+    if not _PATRONES_VALOR[separador_decimal].fullmatch(texto):
+        raise ValueError(f"Valor no numérico en el extracto: {valor_str!r}")
+    separador_miles = "," if separador_decimal == "." else "."
+    try:
+        valor = Decimal(texto.replace(separador_miles, "").replace(separador_decimal, "."))
+    except InvalidOperation:
+        raise ValueError(f"Valor no numérico en el extracto: {valor_str!r}")
+    return int(valor.quantize(_CENTAVO, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def separador_decimal_de_valor(valor_str: str) -> Optional[str]:
+    """
+    Separador decimal ("." o ",") que implica un valor del extracto, o None si el valor no
+    lo determina: sin separadores ("1500") o con uno solo seguido de tres dígitos ("1.234"
+    puede ser 1234 o 1,234).
+    """
+    texto = valor_str.strip()
+    punto, coma = texto.rfind("."), texto.rfind(",")
+    if punto >= 0 and coma >= 0:
+        return "." if punto > coma else ","
+    posicion = max(punto, coma)
+    if posicion < 0:
+        return None
+    separador = texto[posicion]
+    if texto.count(separador) > 1:
+        # Repetido sólo puede ser el separador de miles
+        return "," if separador == "." else "."
+    if len(texto) - posicion - 1 == 3:
+        return None
+    return separador
+
+
+class TransaccionBancaria(NamedTuple):
+    """
+    Fila de transacción extraída del extracto bancario.
+
+    Attr:
+        - fecha: str = Fecha de la transacción tal como aparece en el extracto (YYYY/MM/DD)
+        - referencia: str = Referencia 1 original del extracto
+        - nit: str = NIT resuelto a partir de la referencia
+        - monto_centavos: int = Valor de la transacción en centavos
+    """
+
+    fecha: str
+    referencia: str
+    nit: str
+    monto_centavos: int
+
+
+class TablaTransacciones:
+    """
+    Conjunto de transacciones en formato columnar: cada campo es un arreglo de NumPy, de modo
+    que las agregaciones por NIT se hacen con operaciones vectorizadas en lugar de bucles.
+
+    Columnas:
+        - fechas: datetime64[D]
+        - referencias: str
+        - nits: str
+        - montos_centavos: int64 (valores exactos, sin redondeo de punto flotante)
+    """
+
+    __slots__ = ("fechas", "referencias", "nits", "montos_centavos")
+
+    def __init__(self, fechas: np.ndarray, referencias: np.ndarray, nits: np.ndarray, montos_centavos: np.ndarray):
+        if not len(fechas) == len(referencias) == len(nits) == len(montos_centavos):
+            raise ValueError("Todas las columnas deben tener la misma longitud.")
+        self.fechas = fechas
+        self.referencias = referencias
+        self.nits = nits
+        self.montos_centavos = montos_centavos
+
+    @classmethod
+    def desde_transacciones(cls, transacciones: Iterable[TransaccionBancaria]) -> "TablaTransacciones":
+        fechas, referencias, nits = [], [], []
+        montos = array("q")
+        for transaccion in transacciones:
+            fechas.append(transaccion.fecha.replace("/", "-"))
+            referencias.append(transaccion.referencia)
+            nits.append(transaccion.nit)
+            montos.append(transaccion.monto_centavos)
+        return cls(
+            fechas=np.array(fechas, dtype="datetime64[D]"),
+            referencias=np.array(referencias, dtype=str),
+            nits=np.array(nits, dtype=str),
+            montos_centavos=np.frombuffer(montos, dtype=np.int64) if montos else np.zeros(0, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.montos_centavos)
+
+    def __iter__(self) -> Iterator[TransaccionBancaria]:
+        for fecha, referencia, nit, monto in zip(self.fechas, self.referencias, self.nits, self.montos_centavos):
+            yield TransaccionBancaria(
+                fecha=str(fecha).replace("-", "/"), referencia=str(referencia), nit=str(nit), monto_centavos=int(monto)
+            )
+
+    def totales_por_nit(self) -> Dict[str, int]:
+        """
+        Suma los montos por NIT en centavos. Los NIT se devuelven en el orden de su primera
+        aparición en el extracto.
+        """
+        if len(self) == 0:
+            return {}
+        nits_unicos, primer_indice, inverso = np.unique(self.nits, return_index=True, return_inverse=True)
+        totales = np.zeros(len(nits_unicos), dtype=np.int64)
+        np.add.at(totales, inverso, self.montos_centavos)
+        orden = np.argsort(primer_indice, kind="stable")
+        return {str(nits_unicos[i]): int(totales[i]) for i in orden}
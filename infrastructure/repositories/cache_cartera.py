@@ -0,0 +1,149 @@
+# infrastructure/repositories/cache_cartera.py
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import zipfile
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Cambiar cuando cambie la preparación de RepositorioCartera._cargar_y_preparar_csv: las
+# entradas de otra versión no se reutilizan
+VERSION_PREPARACION = "2"
+
+
+class CacheCartera:
+    """
+    Caché en disco del DataFrame de cartera ya preparado (renombrado, fechas, valores en
+    centavos, NIT limpio), para no repetir la detección de encoding, read_csv y las
+    conversiones en cada carga.
+
+    La clave es la ruta absoluta del CSV, su tamaño, su mtime, el encoding con el que se lee
+    y VERSION_PREPARACION, así que un CSV modificado, un encoding configurado distinto (o un
+    cambio en la preparación) nunca reutiliza una entrada vieja. Con encoding None (detección
+    automática) la clave usa "auto": la detección depende sólo del contenido del CSV.
+
+    Cada entrada es un .npz de NumPy con un arreglo por columna (texto, enteros, flotantes,
+    fechas) y se lee con allow_pickle=False: una entrada manipulada puede dar datos erróneos
+    pero no ejecutar código. Un DataFrame con columnas de otros objetos no se guarda.
+
+    Atributos:
+        - directorio: Carpeta donde se guardan las entradas (una por CSV).
+    """
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+
+    @staticmethod
+    def _prefijo(ruta_csv: str) -> str:
+        return hashlib.sha256(os.path.abspath(ruta_csv).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def clave(cls, ruta_csv: str, encoding: Optional[str] = None) -> str:
+        """Clave de la versión actual del CSV: ruta, tamaño, mtime, encoding y versión de la preparación."""
+        stat = os.stat(ruta_csv)
+        # El encoding forma parte del nombre del archivo: sólo letras, dígitos y "_"
+        codificacion = re.sub(r"[^0-9a-z_]", "_", encoding.lower()) if encoding else "auto"
+        return (
+            f"{cls._prefijo(ruta_csv)}-{stat.st_size}-{stat.st_mtime_ns}-{codificacion}"
+            f"-v{VERSION_PREPARACION}"
+        )
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.npz")
+
+    def obtener(self, ruta_csv: str, encoding: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """DataFrame preparado para la versión actual del CSV y el encoding, o None si no está en caché."""
+        ruta = self._ruta(self.clave(ruta_csv, encoding))
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with np.load(ruta, allow_pickle=False) as arreglos:
+                return _dataframe_de_arreglos(arreglos)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            # Entrada corrupta o de otra versión: se reconstruye
+            logging.warning(f"Caché de cartera ilegible ({e}); se vuelve a preparar el CSV.")
+            return None
+
+    def guardar(self, ruta_csv: str, df: pd.DataFrame, encoding: Optional[str] = None) -> None:
+        """Guarda el DataFrame preparado y elimina las entradas anteriores del mismo CSV."""
+        arreglos = _arreglos_de_dataframe(df)
+        if arreglos is None:
+            logging.info("Cartera con columnas de objetos no representables en .npz; no se guarda en caché.")
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        clave = self.clave(ruta_csv, encoding)
+        descriptor, ruta_temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                np.savez(f, **arreglos)
+            # Escritura atómica: otro proceso puede estar leyendo la entrada
+            os.replace(ruta_temporal, self._ruta(clave))
+        except Exception:
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+            raise
+        self._eliminar_anteriores(clave)
+
+    def _eliminar_anteriores(self, clave: str) -> None:
+        prefijo = clave.split("-", 1)[0] + "-"
+        conservar = os.path.basename(self._ruta(clave))
+        for nombre in os.listdir(self.directorio):
+            if nombre.startswith(prefijo) and nombre != conservar and not nombre.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self.directorio, nombre))
+                except FileNotFoundError:
+                    pass  # Eliminada por otro proceso
+
+
+def _arreglos_de_dataframe(df: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Un arreglo por columna (c0, c1, ...) más los nombres, dtypes e índice. Las columnas de
+    texto se guardan como arreglos Unicode con una máscara de nulos (n0, n1, ...). None si
+    alguna columna tiene objetos que no son texto.
+    """
+    arreglos: Dict[str, np.ndarray] = {
+        "columnas": np.array([str(columna) for columna in df.columns], dtype=str),
+        "dtypes": np.array([str(dtype) for dtype in df.dtypes], dtype=str),
+        "indice": df.index.to_numpy(),
+    }
+    if arreglos["indice"].dtype == object:
+        return None
+    for numero, columna in enumerate(df.columns):
+        serie = df[columna]
+        if serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype):
+            if pd.api.types.infer_dtype(serie, skipna=True) not in ("string", "empty"):
+                return None
+            nulos = serie.isna().to_numpy()
+            arreglos[f"c{numero}"] = serie.where(~nulos, "").to_numpy(dtype=str)
+            arreglos[f"n{numero}"] = nulos
+        else:
+            valores = serie.to_numpy()
+            if valores.dtype == object:
+                return None
+            arreglos[f"c{numero}"] = valores
+    return arreglos
+
+
+def _dataframe_de_arreglos(arreglos) -> pd.DataFrame:
+    columnas = {}
+    for numero, (columna, dtype) in enumerate(zip(arreglos["columnas"].tolist(), arreglos["dtypes"].tolist())):
+        valores = arreglos[f"c{numero}"]
+        if f"n{numero}" in arreglos:
+            valores = valores.astype(object)
+            valores[arreglos[f"n{numero}"]] = np.nan
+            columnas[columna] = pd.Series(valores, dtype=dtype)
+        else:
+            columnas[columna] = pd.Series(valores)
+    return pd.DataFrame(columnas).set_axis(pd.Index(arreglos["indice"]), axis=0)
+
+
+def crear_cache_cartera(directorio: Optional[str]) -> Optional[CacheCartera]:
+    """Crea la caché si hay un directorio configurado; sin directorio la caché queda desactivada."""
+    if not directorio:
+        return None
+    return CacheCartera(directorio)
@@ -0,0 +1,249 @@
+# infrastructure/repositories/cliente_rtdb_rest.py
+
+import asyncio
+import json
+import logging
+import random
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+# Respuestas que se reintentan: límite de tasa y errores transitorios del servidor
+ESTADOS_REINTENTABLES = frozenset({429, 500, 502, 503, 504})
+
+_ESPACIOS = " \t\n\r"
+
+
+class DecodificadorHijosJSON:
+    """
+    Decodificador incremental de la respuesta de un nodo de Realtime Database: a medida que
+    llegan fragmentos de texto entrega los pares (clave, valor) del objeto JSON raíz, sin
+    esperar a tener la respuesta completa en memoria.
+
+    Cada valor se decodifica con json.JSONDecoder.raw_decode y sólo se entrega cuando ya se
+    vio el delimitador que lo cierra (',' o '}'), para no cortar un número entre fragmentos.
+    Si la raíz no es un objeto (null, un escalar o un arreglo) se acumula y se decodifica en
+    terminar().
+    """
+
+    def __init__(self):
+        self._decodificador = json.JSONDecoder()
+        self._buffer = ""
+        self._estado = "inicio"  # inicio, hijos, fin o raiz_no_objeto
+
+    def _saltar_espacios(self, posicion: int) -> int:
+        while posicion < len(self._buffer) and self._buffer[posicion] in _ESPACIOS:
+            posicion += 1
+        return posicion
+
+    def alimentar(self, texto: str) -> List[Tuple[str, Any]]:
+        """Agrega un fragmento de texto y devuelve los pares (clave, valor) ya completos."""
+        self._buffer += texto
+        if self._estado == "raiz_no_objeto":
+            return []
+
+        pares: List[Tuple[str, Any]] = []
+        posicion = 0
+        while True:
+            posicion = self._saltar_espacios(posicion)
+            if posicion >= len(self._buffer):
+                break
+
+            if self._estado == "inicio":
+                if self._buffer[posicion] != "{":
+                    self._estado = "raiz_no_objeto"
+                    break
+                self._estado = "hijos"
+                posicion += 1
+                continue
+
+            if self._estado == "fin":
+                raise ValueError(f"Datos después del cierre del objeto JSON: {self._buffer[posicion:][:40]!r}")
+
+            caracter = self._buffer[posicion]
+            if caracter == "}":
+                self._estado = "fin"
+                posicion += 1
+                continue
+            if caracter == ",":
+                posicion += 1
+                continue
+
+            try:
+                clave, fin_clave = self._decodificador.raw_decode(self._buffer, posicion)
+                inicio_valor = self._saltar_espacios(fin_clave)
+                if inicio_valor >= len(self._buffer):
+                    break
+                if self._buffer[inicio_valor] != ":":
+                    raise ValueError(f"Se esperaba ':' tras la clave {clave!r}")
+                inicio_valor = self._saltar_espacios(inicio_valor + 1)
+                valor, fin_valor = self._decodificador.raw_decode(self._buffer, inicio_valor)
+            except json.JSONDecodeError:
+                break  # Clave o valor incompletos: esperar más texto
+            if self._saltar_espacios(fin_valor) >= len(self._buffer):
+                break  # Aún no se ve el delimitador que cierra el valor
+
+            pares.append((clave, valor))
+            posicion = fin_valor
+
+        self._buffer = self._buffer[posicion:] if self._estado != "raiz_no_objeto" else self._buffer
+        return pares
+
+    def terminar(self) -> List[Tuple[str, Any]]:
+        """
+        Cierra la decodificación. Para raíces que no son objeto devuelve sus hijos (índices
+        de un arreglo); null no tiene hijos. Falla si el objeto quedó incompleto.
+        """
+        if self._estado == "raiz_no_objeto":
+            raiz = json.loads(self._buffer)
+            if isinstance(raiz, list):
+                return [(str(i), valor) for i, valor in enumerate(raiz) if valor is not None]
+            return []
+        if self._estado == "hijos" or self._buffer.strip():
+            raise ValueError("Respuesta JSON incompleta")
+        return []
+
+
+class ClienteRTDBRest:
+    """
+    Cliente asíncrono de la API REST de Realtime Database ({url_base}/{ruta}.json) sobre un
+    único httpx.AsyncClient con pool de conexiones persistentes.
+
+    Las peticiones que fallan por errores de transporte o por los estados de
+    ESTADOS_REINTENTABLES se reintentan con espera exponencial y jitter. El número de
+    peticiones simultáneas se limita a max_conexiones.
+
+    Se usa como contexto asíncrono: `async with ClienteRTDBRest(url) as cliente: ...`.
+
+    Atributos:
+        - url_base: URL de la base de datos (p. ej. https://<proyecto>.firebaseio.com).
+        - obtener_token: Callable que devuelve un access token OAuth2 (None = sin autenticación).
+        - max_conexiones: Conexiones del pool y peticiones simultáneas máximas.
+        - reintentos: Reintentos por petición antes de propagar el error.
+        - espera_inicial_s: Espera antes del primer reintento; se duplica en cada intento.
+        - timeout_s: Timeout de cada petición.
+        - transporte: httpx.AsyncBaseTransport alternativo (pruebas).
+    """
+
+    def __init__(
+        self,
+        url_base: str,
+        obtener_token: Optional[Callable[[], Optional[str]]] = None,
+        max_conexiones: int = 8,
+        reintentos: int = 3,
+        espera_inicial_s: float = 0.5,
+        timeout_s: float = 60.0,
+        transporte: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url_base = url_base.rstrip("/")
+        self.obtener_token = obtener_token
+        self.max_conexiones = max_conexiones
+        self.reintentos = reintentos
+        self.espera_inicial_s = espera_inicial_s
+        self.timeout_s = timeout_s
+        self.transporte = transporte
+        self._cliente: Optional[httpx.AsyncClient] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "ClienteRTDBRest":
+        self._cliente = httpx.AsyncClient(
+            base_url=self.url_base,
+            limits=httpx.Limits(max_connections=self.max_conexiones, max_keepalive_connections=self.max_conexiones),
+            timeout=self.timeout_s,
+            transport=self.transporte,
+        )
+        self._semaforo = asyncio.Semaphore(self.max_conexiones)
+        return self
+
+    async def __aexit__(self, *excepcion) -> None:
+        await self._cliente.aclose()
+        self._cliente = None
+
+    def _parametros(
+        self,
+        shallow: bool = False,
+        order_by: Optional[str] = None,
+        start_at: Any = None,
+        end_at: Any = None,
+        equal_to: Any = None,
+        limit_to_first: Optional[int] = None,
+        limit_to_last: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Parámetros de consulta de la API REST; los valores van codificados como JSON."""
+        parametros: Dict[str, str] = {}
+        if shallow:
+            parametros["shallow"] = "true"
+        if order_by is not None:
+            parametros["orderBy"] = json.dumps(order_by)
+        for nombre, valor in (("startAt", start_at), ("endAt", end_at), ("equalTo", equal_to)):
+            if valor is not None:
+                parametros[nombre] = json.dumps(valor)
+        if limit_to_first is not None:
+            parametros["limitToFirst"] = str(limit_to_first)
+        if limit_to_last is not None:
+            parametros["limitToLast"] = str(limit_to_last)
+        token = self.obtener_token() if self.obtener_token else None
+        if token:
+            parametros["access_token"] = token
+        return parametros
+
+    @staticmethod
+    def _url(ruta: str) -> str:
+        return f"/{ruta.strip('/')}.json"
+
+    async def _esperar_reintento(self, intento: int, motivo: str, ruta: str) -> None:
+        espera = self.espera_inicial_s * (2 ** intento) * random.uniform(0.5, 1.0)
+        logging.warning(f"RTDB {ruta}: {motivo}; reintento {intento + 1}/{self.reintentos} en {espera:.2f} s")
+        await asyncio.sleep(espera)
+
+    async def iter_hijos(self, ruta: str, **consulta) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Genera los pares (clave, valor) del nodo a medida que se reciben, decodificando la
+        respuesta en streaming. Acepta los mismos filtros que _parametros (order_by,
+        start_at, equal_to, ...).
+
+        Si la conexión falla a mitad de la respuesta se reintenta desde el inicio, así que
+        algunos hijos pueden entregarse dos veces; los consumidores los guardan por clave.
+        """
+        parametros = self._parametros(**consulta)
+        for intento in range(self.reintentos + 1):
+            try:
+                async with self._semaforo:
+                    async with self._cliente.stream("GET", self._url(ruta), params=parametros) as respuesta:
+                        if respuesta.status_code in ESTADOS_REINTENTABLES and intento < self.reintentos:
+                            motivo = f"HTTP {respuesta.status_code}"
+                        else:
+                            respuesta.raise_for_status()
+                            decodificador = DecodificadorHijosJSON()
+                            async for texto in respuesta.aiter_text():
+                                for par in decodificador.alimentar(texto):
+                                    yield par
+                            for par in decodificador.terminar():
+                                yield par
+                            return
+            except httpx.TransportError as e:
+                if intento >= self.reintentos:
+                    raise
+                motivo = f"{type(e).__name__}: {e}"
+            await self._esperar_reintento(intento, motivo, ruta)
+
+    async def obtener(self, ruta: str, **consulta) -> Dict[str, Any]:
+        """Descarga los hijos del nodo (o del resultado de la consulta) como diccionario."""
+        return {clave: valor async for clave, valor in self.iter_hijos(ruta, **consulta)}
+
+    async def obtener_claves(self, ruta: str) -> List[str]:
+        """Claves de los hijos del nodo con shallow=true (sin descargar su contenido)."""
+        return list(await self.obtener(ruta, shallow=True))
+
+    async def obtener_hijos(self, ruta: str, claves: Iterable[str]) -> Dict[str, Any]:
+        """Descarga concurrentemente {ruta}/{clave} para cada clave y omite las que no existen."""
+        claves = list(claves)
+
+        async def obtener_hijo(clave: str) -> Any:
+            valor = None
+            async for _, valor in self.iter_hijos(ruta, order_by="$key", equal_to=clave):
+                pass
+            return valor
+
+        valores = await asyncio.gather(*(obtener_hijo(clave) for clave in claves))
+        return {clave: valor for clave, valor in zip(claves, valores) if valor is not None}
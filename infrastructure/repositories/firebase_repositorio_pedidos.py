@@ -1,13 +1,199 @@
 # infrastructure/repositories/firebase_repositorio_pedido.py
 
+import logging
 import re
-from datetime import datetime
-from decimal import Decimal
-from typing import Any, List, Dict
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pydantic import ValidationError
 from application.ports.interfaces import AbstractRepositorioPedidos
 from firebase_admin.db import Reference 
+from config.app_config import config
 from domain.models.models import Pedido
 from domain.models.models import EstadoPedido
+from domain.services.indice_nit import calcular_digito_verificacion, normalizar_nit
+from infrastructure.repositories.snapshot_pedidos import SnapshotPedidos
+from infrastructure.repositories.tabla_pedidos import TablaPedidos
+
+# Modos de consulta de /pedidos:
+#   - completo: descarga todo el árbol y filtra en el cliente
+#   - estado: consultas order_by_child("estado").equal_to(...) por cada estado de crédito
+#   - fecha: consulta order_by_child(clave_fecha_ordenable).start_at(...) sobre la ventana dias_maximo_pedido
+#   - fragmentos: lista las claves con shallow=true y descarga rangos order_by_key().start_at().end_at()
+#     en paralelo, mapeando cada fragmento mientras se descargan los siguientes
+MODOS_CONSULTA = ("completo", "estado", "fecha", "fragmentos")
+
+# Estados que pueden ser pedidos a crédito: DESPACHADO y CREDITO_POBLACION
+ESTADOS_CREDITO = (EstadoPedido.DESPACHADO.value, EstadoPedido.CREDITO_POBLACION.value)
+
+
+# Forma de pago a crédito (contiene "días") y su plazo ("A 30 días")
+_PATRON_CREDITO = re.compile(r"\bd[ií]as\b", re.IGNORECASE)
+_PATRON_PLAZO = re.compile(r"A\s+(\d+)\s+d[ií]as", re.IGNORECASE)
+_PATRON_HORA = re.compile(r"([01]?\d|2[0-3]):([0-5]?\d)")
+
+# Hora de despacho completa como la lee fecha_despacho: el día hasta el primer espacio y una hora válida
+_PATRON_HORA_DESPACHO = re.compile(r"^\s*(\S+) \s*(?:" + _PATRON_HORA.pattern + r")\s*\Z")
+
+_ESTADOS_CREDITO = frozenset(ESTADOS_CREDITO)
+
+# Construcción de los Pedido mapeados:
+#   - individual: Pedido(**campos) por pedido
+#   - lote: Pedido.validar_lote por descarga o fragmento (mismas reglas, una llamada a pydantic-core)
+#   - confiable: Pedido.construir_confiable, sin revalidar lo que ya verificó el mapeador
+VALIDACIONES_PEDIDOS = ("individual", "lote", "confiable")
+
+# Motivos de descarte que no son de crédito y errores de conversión de los que sí lo son
+MOTIVOS_DESCARTE = (
+    "sin_datos", "forma_pago_no_credito", "sin_hora_despacho", "estado_no_credito", "sin_valor_neto",
+    "sin_nit", "error_conversion",
+)
+
+
+@lru_cache(maxsize=4096)
+def plazo_forma_pago(forma_pago: str) -> Optional[int]:
+    """
+    Plazo en días de una forma de pago a crédito (0 si no indica "A N días"), o None si no es
+    a crédito. Hay pocas formas de pago distintas, así que cada una se analiza una sola vez.
+    """
+    if not _PATRON_CREDITO.search(forma_pago):
+        return None
+    coincidencia = _PATRON_PLAZO.search(forma_pago)
+    return int(coincidencia.group(1)) if coincidencia else 0
+
+
+@lru_cache(maxsize=4096)
+def _fecha_de_dia(dia: str) -> date:
+    return datetime.strptime(dia, "%d/%m/%Y").date()
+
+
+def fecha_despacho(hora_despacho: str) -> date:
+    """Fecha de una hora de despacho "dd/mm/YYYY HH:MM"; cada día distinto se analiza una sola vez."""
+    dia, _, hora = hora_despacho.strip().partition(" ")
+    if not _PATRON_HORA.fullmatch(hora.strip()):
+        raise ValueError(f"Hora de despacho inválida: {hora_despacho!r}")
+    return _fecha_de_dia(dia)
+
+
+_CENTAVO = Decimal("0.01")
+_MAXIMO_VALOR_ENTERO = np.iinfo(np.int64).max // 100
+
+
+def _centavos_de_texto(texto: str) -> Optional[int]:
+    """Centavos de Decimal(texto) (mitad hacia arriba), o None si no es finito y no negativo o no cabe en int64."""
+    try:
+        valor = Decimal(texto)
+    except ArithmeticError:
+        return None
+    if not valor.is_finite() or valor < 0:
+        return None
+    centavos = int(valor.quantize(_CENTAVO, rounding=ROUND_HALF_UP).scaleb(2))
+    return centavos if centavos <= np.iinfo(np.int64).max else None
+
+
+def centavos_valores_netos(valores: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convierte valores netos a centavos int64 con la misma regla que el mapeador de pedidos
+    (Decimal(str(valor)), finito y no negativo). Devuelve (centavos, validos).
+
+    Si todos son enteros (el caso habitual en /pedidos) la conversión es aritmética de arreglos;
+    si no, cada texto distinto se convierte una sola vez con Decimal y se expande por índice.
+    """
+    try:
+        arreglo = np.array(valores) if valores else np.zeros(0, dtype=np.int64)
+    except (ValueError, TypeError):
+        arreglo = None  # Formas mezcladas (p. ej. una lista entre los valores): se usa el camino por texto
+    if arreglo is not None and arreglo.ndim == 1 and arreglo.dtype.kind in "iu":
+        validos = (arreglo >= 0) & (arreglo <= _MAXIMO_VALOR_ENTERO)
+        return np.where(validos, arreglo, 0).astype(np.int64) * 100, validos
+    codigos, textos = pd.factorize(pd.Series(valores, dtype=object).astype(str))
+    centavos_unicos = [_centavos_de_texto(texto) for texto in textos]
+    validos_unicos = np.array([c is not None for c in centavos_unicos], dtype=bool)
+    centavos = np.array([c or 0 for c in centavos_unicos], dtype=np.int64)[codigos]
+    return centavos, validos_unicos[codigos]
+
+
+def fechas_despacho(horas_despacho: List[Any]) -> np.ndarray:
+    """
+    Versión vectorizada de fecha_despacho sobre str(hora) de cada pedido: datetime64[D], con
+    NaT donde la hora o el día no son válidos. Una expresión regular valida cada hora y separa
+    el día, y pd.to_datetime analiza cada día distinto una sola vez.
+    """
+    if not horas_despacho:
+        return np.zeros(0, dtype="datetime64[D]")
+    dias = pd.Series(horas_despacho, dtype=object).astype(str).str.extract(_PATRON_HORA_DESPACHO.pattern)[0]
+    codigos, dias_unicos = pd.factorize(dias)
+    fechas_unicas = pd.to_datetime(pd.Series(dias_unicos, dtype=object), format="%d/%m/%Y", errors="coerce")
+    # El código -1 (hora inválida) toma el NaT agregado al final
+    return np.append(fechas_unicas.to_numpy().astype("datetime64[D]"), np.datetime64("NaT"))[codigos]
+
+
+def _falsos(valores: List[Any]) -> np.ndarray:
+    return np.fromiter((not valor for valor in valores), dtype=bool, count=len(valores))
+
+
+def orden_llave_rtdb(llave: str) -> Tuple:
+    """Orden de order_by_key: las llaves que son enteros de 32 bits van primero, en orden numérico."""
+    try:
+        numero = int(llave)
+        if -(2 ** 31) <= numero < 2 ** 31 and str(numero) == llave:
+            return (0, numero, "")
+    except ValueError:
+        pass
+    return (1, 0, llave)
+
+
+def rangos_de_claves(claves: Iterable[str], tamano_fragmento: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Divide las claves en rangos (inicio, fin) de tamano_fragmento claves en el orden de
+    order_by_key. El fin de cada rango es el inicio del siguiente, así que los rangos no dejan
+    huecos: una clave creada después del listado que cae entre dos claves listadas también se
+    descarga. El primer rango no tiene inicio y el último no tiene fin.
+
+    end_at es inclusivo, por lo que la clave fin también llega en el rango siguiente: quien
+    descarga un rango debe descartarla (ver descartar_fin_de_rango).
+    """
+    ordenadas = sorted(claves, key=orden_llave_rtdb)
+    inicios = [ordenadas[i] for i in range(0, len(ordenadas), max(1, tamano_fragmento))]
+    return [
+        (inicio if numero > 0 else None, inicios[numero + 1] if numero + 1 < len(inicios) else None)
+        for numero, inicio in enumerate(inicios)
+    ]
+
+
+def variantes_literales_nit(nit: str) -> List[str]:
+    """
+    Valores literales del hijo "nit" que normalizan al NIT indicado, para las consultas
+    equal_to (que comparan el texto exacto): el NIT normalizado, con puntos de miles y, si
+    termina en un DV válido, con el DV separado por guion ("900123456-7", "900.123.456-7").
+    Las variantes con ceros a la izquierda o espacios no se pueden enumerar.
+    """
+    normalizado = normalizar_nit(nit)
+    if not normalizado.isdigit():
+        return [normalizado] if normalizado else []
+
+    def con_puntos(digitos: str) -> str:
+        return f"{int(digitos):,}".replace(",", ".")
+
+    variantes = [normalizado, con_puntos(normalizado)]
+    base, digito = normalizado[:-1], normalizado[-1]
+    if base and calcular_digito_verificacion(base) == int(digito):
+        variantes += [f"{base}-{digito}", f"{con_puntos(base)}-{digito}"]
+    return list(dict.fromkeys(variantes))
+
+
+def descartar_fin_de_rango(pedidos_crudos: Dict[str, Any], fin: Optional[str]) -> Dict[str, Any]:
+    """Quita la clave fin de un rango de rangos_de_claves (pertenece al rango siguiente)."""
+    if fin is not None:
+        pedidos_crudos.pop(fin, None)
+    return pedidos_crudos
 
 
 class FirebaseRepositorioPedidos(AbstractRepositorioPedidos):
@@ -17,116 +203,488 @@ class FirebaseRepositorioPedidos(AbstractRepositorioPedidos):
     
     Atributos:
         - ref: Referencia a la base de datos de Firebase.
+        - modo_consulta: Uno de MODOS_CONSULTA (None equivale a "completo").
+        - clave_fecha_ordenable: Hijo de cada pedido con la fecha de despacho en un formato
+          que ordena lexicográficamente (p. ej. "2025-04-10 14:30"), usado en el modo "fecha".
+          Requiere ".indexOn" sobre esa clave en las reglas de la base de datos.
+        - formato_fecha_ordenable: Formato strftime de clave_fecha_ordenable.
+        - snapshot: Copia local sincronizada por deltas (opcional). Si se indica, las lecturas
+          se sirven del snapshot y sólo se descargan los pedidos modificados.
+        - segundos_vigencia_indice: Vigencia del índice NIT -> pedidos crudos que usan
+          obtener_pedidos_por_nit y obtener_pedidos_credito_para_nits. El índice se
+          reconstruye en cada descarga.
+        - consulta_por_nit: Si es True (y no hay snapshot), obtener_pedidos_credito_para_nits
+          descarga sólo los pedidos de esos NIT con consultas order_by_child("nit").equal_to(...)
+          concurrentes, una por cada variante de variantes_literales_nit, en lugar de todo
+          /pedidos. Requiere ".indexOn": "nit". Los NIT guardados con ceros a la izquierda o
+          espacios no se encuentran (se advierte al crear el repositorio).
+        - hilos_consulta: Máximo de consultas por NIT (o fragmentos) simultáneas.
+        - tamano_fragmento: Claves por fragmento en el modo "fragmentos".
+        - validacion_pedidos: Uno de VALIDACIONES_PEDIDOS (None equivale a "lote").
     """
 
-    def __init__(self, firebase_reference: Reference):
+    # La advertencia de consulta_por_nit se muestra una vez por proceso
+    _consulta_por_nit_advertida = False
+
+    def __init__(
+        self,
+        firebase_reference: Reference,
+        modo_consulta: Optional[str] = None,
+        clave_fecha_ordenable: Optional[str] = None,
+        formato_fecha_ordenable: str = "%Y-%m-%d",
+        snapshot: Optional[SnapshotPedidos] = None,
+        segundos_vigencia_indice: Optional[float] = None,
+        consulta_por_nit: bool = False,
+        hilos_consulta: Optional[int] = None,
+        tamano_fragmento: Optional[int] = None,
+        validacion_pedidos: Optional[str] = None,
+    ):
         self.ref = firebase_reference
+        self.modo_consulta = modo_consulta or "completo"
+        if self.modo_consulta not in MODOS_CONSULTA:
+            raise ValueError(f"Modo de consulta no soportado: {self.modo_consulta}. Opciones: {MODOS_CONSULTA}")
+        self.clave_fecha_ordenable = clave_fecha_ordenable or "fecha_despacho"
+        self.formato_fecha_ordenable = formato_fecha_ordenable
+        self.snapshot = snapshot
+        self.segundos_vigencia_indice = 300 if segundos_vigencia_indice is None else segundos_vigencia_indice
+        self._indice_por_nit: Optional[Dict[str, List[Tuple[str, Dict[str, Any]]]]] = None
+        self._indice_vence_en = 0.0
+        self._lock_indice = threading.Lock()
+        self.consulta_por_nit = bool(consulta_por_nit)
+        if self.consulta_por_nit and not FirebaseRepositorioPedidos._consulta_por_nit_advertida:
+            FirebaseRepositorioPedidos._consulta_por_nit_advertida = True
+            logging.warning(
+                "consulta_por_nit activa: los pedidos con el NIT guardado con ceros a la izquierda "
+                "o espacios no se encuentran; desactívela si la base tiene NIT en ese formato."
+            )
+        self.hilos_consulta = hilos_consulta or 8
+        self.tamano_fragmento = tamano_fragmento or 5000
+        self.ultimos_descartes: Counter = Counter()
+        self.validacion_pedidos = validacion_pedidos or "lote"
+        if self.validacion_pedidos not in VALIDACIONES_PEDIDOS:
+            raise ValueError(
+                f"Validación de pedidos no soportada: {self.validacion_pedidos}. Opciones: {VALIDACIONES_PEDIDOS}"
+            )
 
-    def _mapear_pedido(self, id_pedido: str, data: Dict) -> Pedido:
+    def _obtener_pedidos_crudos(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Pedidos crudos candidatos: desde el snapshot sincronizado si hay uno configurado, o
+        descargados de Firebase según modo_consulta.
+        """
+        if self.snapshot is not None:
+            pedidos_crudos = self.snapshot.sincronizar(
+                self.ref, self._descargar_pedidos_crudos, self._es_pedido_a_credito_valido
+            )
+            print(
+                f"Snapshot de pedidos: sincronización {self.snapshot.ultima_sincronizacion.get('modo')} "
+                f"({self.snapshot.ultima_sincronizacion.get('cambios')} pedidos descargados), "
+                f"{len(pedidos_crudos)} candidatos."
+            )
+            return pedidos_crudos
+        return self._descargar_pedidos_crudos()
 
-        try:
-            
-            # Manejar claves del diccionario
-            nit = data.get("nit")
-            estado_pedido = EstadoPedido(data.get("estado"))
-            valor_neto = data.get("valor", {}).get("neto")
-            hora_despacho_raw = data.get("hora_despacho")
-            forma_pago_raw = data.get("forma_pago") # Default to empty string
-
-            '''
-            Valores falsy:
-            - None
-            - False
-            - 0
-            - "" (cadena vacía)
-            - [], {}, set() (estructuras vacías)
-            '''
-            
-            if (
-                not nit or 
-                not estado_pedido or
-                not valor_neto or 
-                not hora_despacho_raw
-                ):
-                raise ValueError(f"Pedido {id_pedido} carece de datos críticos.")
+    def _descargar_pedidos_crudos(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Descarga los pedidos candidatos según modo_consulta. Los modos "estado" y "fecha"
+        filtran en el servidor; en todos los modos se sigue aplicando
+        _es_pedido_a_credito_valido en el cliente.
+        """
+        if self.modo_consulta == "estado":
+            pedidos_crudos: Dict[str, Dict[str, Any]] = {}
+            for estado in ESTADOS_CREDITO:
+                pedidos_crudos.update(self.ref.order_by_child("estado").equal_to(estado).get() or {})
+            return pedidos_crudos
+
+        if self.modo_consulta == "fecha":
+            # La misma ventana que aplica AplicadorDePagos: los pedidos más antiguos no se usan
+            fecha_limite = datetime.now().date() - timedelta(days=config.dias_maximo_pedido)
+            return self.ref.order_by_child(self.clave_fecha_ordenable).start_at(
+                fecha_limite.strftime(self.formato_fecha_ordenable)
+            ).get() or {}
+
+        if self.modo_consulta == "fragmentos":
+            pedidos_crudos = {}
+            for fragmento in self._iter_fragmentos_crudos():
+                pedidos_crudos.update(fragmento)
+            return pedidos_crudos
+
+        return self.ref.get() or {}  # Handle case where ref.get() returns None
+
+    def _iter_fragmentos_crudos(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """
+        Modo "fragmentos": lista las claves de /pedidos con shallow=true y descarga cada rango de
+        rangos_de_claves con order_by_key().start_at().end_at(). Hay como máximo hilos_consulta
+        fragmentos en vuelo y se entregan en orden, así que el consumidor procesa el fragmento N
+        mientras se descargan los siguientes y nunca se retiene el árbol completo sin filtrar.
+        """
+        rangos = rangos_de_claves(self.ref.get(shallow=True) or {}, self.tamano_fragmento)
+
+        def descargar(rango: Tuple[Optional[str], Optional[str]]) -> Dict[str, Dict[str, Any]]:
+            inicio, fin = rango
+            consulta = self.ref.order_by_key()
+            if inicio is not None:
+                consulta = consulta.start_at(inicio)
+            if fin is not None:
+                consulta = consulta.end_at(fin)
+            return descartar_fin_de_rango(consulta.get() or {}, fin)
+
+        with ThreadPoolExecutor(max_workers=self.hilos_consulta) as pool:
+            en_vuelo = deque()
+            for rango in rangos:
+                if len(en_vuelo) >= self.hilos_consulta:
+                    yield en_vuelo.popleft().result()
+                en_vuelo.append(pool.submit(descargar, rango))
+            while en_vuelo:
+                yield en_vuelo.popleft().result()
 
+    @staticmethod
+    def _campos_credito(data: Optional[Dict]) -> Tuple[Optional[str], Optional[Tuple[int, str, int, Any]]]:
+        """
+        Revisa en una sola lectura si el pedido es a crédito. Devuelve (motivo_descarte, None) o
+        (None, (plazo_dias, hora_despacho, estado, valor_neto)).
+        """
+        if not data:
+            return "sin_datos", None
+        forma_pago = data.get("forma_pago")
+        plazo = plazo_forma_pago(forma_pago) if isinstance(forma_pago, str) else None
+        if plazo is None:
+            return "forma_pago_no_credito", None
+        hora_despacho = data.get("hora_despacho")
+        if not hora_despacho:
+            return "sin_hora_despacho", None
+        estado = data.get("estado")
+        if estado not in _ESTADOS_CREDITO:
+            return "estado_no_credito", None
+        valor = data.get("valor")
+        valor_neto = valor.get("neto") if isinstance(valor, dict) else None
+        if not valor_neto:
+            return "sin_valor_neto", None
+        return None, (plazo, hora_despacho, estado, valor_neto)
+
+    def _campos_pedido(self, id_pedido: str, data: Optional[Dict]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Filtro y mapeo en una sola pasada: devuelve los campos de Pedido ya convertidos y
+        verificados (tipos exactos, valor neto finito y no negativo) o (None, motivo) con uno
+        de MOTIVOS_DESCARTE. Estas verificaciones son las que permiten la validación "confiable".
+        """
+        motivo, campos = self._campos_credito(data)
+        if motivo is not None:
+            return None, motivo
+        plazo, hora_despacho, estado, valor_neto = campos
+        nit = data.get("nit")
+        if not nit:
+            return None, "sin_nit"
+        razon_social = data.get("razon", "")
+        if not isinstance(id_pedido, str) or not id_pedido or not isinstance(nit, str) or not isinstance(razon_social, str):
+            return None, "error_conversion"
+        try:
             valor_neto = Decimal(str(valor_neto))
-            fecha_pedido = datetime.strptime(
-                hora_despacho_raw, "%d/%m/%Y %H:%M").date()
-            razon_social = data.get("razon", "")  # Default to empty string
-            # Obtener el plazo de días de crédito
-            if not forma_pago_raw:
-                plazo_dias_credito = 0
-            else:
-                dias_match = re.search(
-                    r"A\s+(\d+)\s+d[ií]as", forma_pago_raw, re.IGNORECASE
-                )            
-                plazo_dias_credito = int(dias_match.group(1)) if dias_match else 0
-
-            return Pedido(
-                    id_pedido=id_pedido,
-                    estado_pedido=estado_pedido,
-                    nit_cliente=nit,
-                    plazo_dias_credito=plazo_dias_credito,
-                    valor_neto=valor_neto,
-                    fecha_pedido=fecha_pedido,
-                    razon_social=razon_social,
-                )
-
-        except (ValueError, KeyError, TypeError) as e:
-            # Log the error with more context
-            print(f"Error mapeando pedido {id_pedido}")#: {e}. Data: {data}")
-            raise ValueError(f"Fallo al mapear pedido {id_pedido}") from e
+            if not valor_neto.is_finite() or valor_neto < 0:
+                return None, "error_conversion"
+            return {
+                "id_pedido": id_pedido,
+                "estado_pedido": EstadoPedido(estado),
+                "nit_cliente": nit,
+                "plazo_dias_credito": plazo,
+                "valor_neto": valor_neto,
+                "fecha_pedido": fecha_despacho(str(hora_despacho)),
+                "razon_social": razon_social,
+            }, None
+        except (ValueError, TypeError, ArithmeticError):
+            return None, "error_conversion"
 
-    def obtener_pedidos_por_nit(self, nit: str) -> List[Pedido]:
-        # Obtener todos los pedidos de Firebase
-        pedidos_crudos: Dict[str, Dict[str, Any]] = self.ref.get() or {}
-
-        pedidos_a_credito_crudos = dict(filter(
-            self._es_pedido_a_credito_valido,
-            pedidos_crudos.items()
-        ))
-        
-        pedidos_mapeados = []
+    def _construir_pedidos(self, lista_campos: List[Dict[str, Any]]) -> List[Optional[Pedido]]:
+        """Construye los Pedido según validacion_pedidos; None en los que no pasan la validación."""
+        if self.validacion_pedidos == "confiable":
+            return [Pedido.construir_confiable(campos) for campos in lista_campos]
+        if self.validacion_pedidos == "lote" and len(lista_campos) > 1:
+            try:
+                return Pedido.validar_lote(lista_campos)
+            except ValidationError:
+                pass  # Se validan uno a uno para descartar sólo los inválidos
+        pedidos: List[Optional[Pedido]] = []
+        for campos in lista_campos:
+            try:
+                pedidos.append(Pedido(**campos))
+            except ValidationError:
+                pedidos.append(None)
+        return pedidos
+
+    def _convertir_pedido(self, id_pedido: str, data: Optional[Dict]) -> Tuple[Optional[Pedido], Optional[str]]:
+        """(Pedido, None) si es un pedido a crédito válido, o (None, motivo)."""
+        campos, motivo = self._campos_pedido(id_pedido, data)
+        if campos is None:
+            return None, motivo
+        pedido = self._construir_pedidos([campos])[0]
+        return (pedido, None) if pedido is not None else (None, "error_conversion")
+
+    def _mapear_pedido(self, id_pedido: str, data: Dict) -> Pedido:
+        pedido, motivo = self._convertir_pedido(id_pedido, data)
+        if pedido is None:
+            raise ValueError(f"Fallo al mapear pedido {id_pedido}: {motivo}")
+        return pedido
+
+    @staticmethod
+    def _dias_en_forma_pago(forma_pago: str) -> bool:
+        """Indica si la forma de pago es a crédito (menciona "días")."""
+        return bool(forma_pago) and plazo_forma_pago(forma_pago) is not None
+
+    @staticmethod
+    def _agrupar_por_nit(
+        pedidos_a_credito_crudos: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+        indice: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
         for id_pedido, data in pedidos_a_credito_crudos.items():
             if id_pedido is None or not id_pedido.strip():
                 continue  # Skip empty or None IDs
-            if data and data.get("nit") == nit:  # Check if data is not None/empty
-                try:
-                    pedido = self._mapear_pedido(id_pedido, data)
-                    pedidos_mapeados.append(pedido)
-                except ValueError as e:
-                    continue
-                    # Log or handle the mapping error for this specific pedido
-                    # print(f"Skipping pedido {id_pedido} for NIT {nit} due to mapping error: {e}"                    )
-        return pedidos_mapeados
+            indice.setdefault(normalizar_nit(str(data.get("nit") or "")), []).append((id_pedido, data))
+        return indice
 
-    def obtener_pedidos_credito(self) -> List[Pedido]:
-        pedidos_crudos: Dict[str, Dict[str, Any]] = (
-            self.ref.get() or {}
-        )  # Handle case where ref.get() returns None
-        
-        pedidos_a_credito_crudos = dict(filter(
-            self._es_pedido_a_credito_valido,
-            pedidos_crudos.items()
-        ))
+    def _actualizar_indice_por_nit(
+        self, pedidos_a_credito_crudos: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Reconstruye el índice NIT normalizado -> pedidos crudos a partir de una descarga ya
+        filtrada. Sólo agrupa: ningún pedido se mapea a Pedido aquí.
+        """
+        indice = self._agrupar_por_nit(pedidos_a_credito_crudos)
+        with self._lock_indice:
+            self._indice_por_nit = indice
+            self._indice_vence_en = time.monotonic() + self.segundos_vigencia_indice
+        return indice
 
+    def _indice_vigente(self) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+        with self._lock_indice:
+            indice = self._indice_por_nit if time.monotonic() < self._indice_vence_en else None
+        if indice is None:
+            indice = self._actualizar_indice_por_nit(dict(filter(
+                self._es_pedido_a_credito_valido,
+                self._obtener_pedidos_crudos().items()
+            )))
+        return indice
+
+    def _descargar_pedidos_de_nits(self, nits: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Descarga los pedidos de cada NIT con una consulta order_by_child("nit").equal_to(...)
+        por cada variante literal del NIT (ver variantes_literales_nit), ejecutando hasta
+        hilos_consulta consultas a la vez, y une los resultados.
+        """
+        valores = sorted({variante for nit in nits for variante in variantes_literales_nit(nit)})
+        if not valores:
+            return {}
+
+        def consultar(valor: str) -> Dict[str, Dict[str, Any]]:
+            return self.ref.order_by_child("nit").equal_to(valor).get() or {}
+
+        pedidos_crudos: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=min(self.hilos_consulta, len(valores))) as pool:
+            for resultado in pool.map(consultar, valores):
+                pedidos_crudos.update(resultado)
+        return pedidos_crudos
+
+    def invalidar_indice(self) -> None:
+        """Descarta el índice NIT -> pedidos; la próxima consulta por NIT vuelve a descargar."""
+        with self._lock_indice:
+            self._indice_por_nit = None
+
+    def obtener_pedidos_por_nit(self, nit: str) -> List[Pedido]:
+        """
+        Pedidos a crédito del NIT. Los datos crudos salen del índice en memoria mientras esté
+        vigente y sólo se mapean los pedidos del NIT, así que cada consulta toma microsegundos
+        y devuelve objetos nuevos.
+        """
         pedidos_mapeados = []
-        pedidos_ignorados = 0
-        for id_pedido, data in pedidos_a_credito_crudos.items():
+        for id_pedido, data in self._indice_vigente().get(normalizar_nit(nit), []):
+            if data.get("nit") != nit:
+                continue  # Misma forma normalizada pero otro NIT literal
             try:
-                pedido = self._mapear_pedido(id_pedido, data)
-                pedidos_mapeados.append(pedido)
-            except ValueError as e:
-                print(
-                    f"Saltando {id_pedido} debido a error de conversión en {self.obtener_pedidos_credito.__qualname__}: {e}"
-                )
-                pedidos_ignorados += 1
+                pedidos_mapeados.append(self._mapear_pedido(id_pedido, data))
+            except ValueError:
+                continue
+        return pedidos_mapeados
+
+    def obtener_pedidos_credito_para_nits(self, nits: Iterable[str]) -> List[Pedido]:
+        """
+        Materialización perezosa: de los pedidos candidatos descargados sólo se mapean y
+        validan como Pedido los de los NIT indicados, de modo que el costo crece con el número
+        de clientes que pagaron y no con el tamaño de toda la cartera.
+        """
+        nits_normalizados = {normalizar_nit(nit) for nit in nits}
+        if self.consulta_por_nit and self.snapshot is None:
+            # Sólo se descargan los pedidos de estos NIT; el índice completo no se toca
+            indice = self._agrupar_por_nit(dict(filter(
+                self._es_pedido_a_credito_valido,
+                self._descargar_pedidos_de_nits(nits_normalizados).items()
+            )))
+        else:
+            indice = self._indice_vigente()
 
-        print(f"Se ignoraron {pedidos_ignorados} pedidos por error de conversión.")
+        pedidos_mapeados = []
+        pedidos_ignorados = 0
+        for nit in nits_normalizados:
+            for id_pedido, data in indice.get(nit, []):
+                try:
+                    pedidos_mapeados.append(self._mapear_pedido(id_pedido, data))
+                except ValueError:
+                    pedidos_ignorados += 1
 
+        print(
+            f"Materializados {len(pedidos_mapeados)} pedidos de {len(indice)} NIT candidatos; "
+            f"se ignoraron {pedidos_ignorados} por error de conversión."
+        )
         return pedidos_mapeados
 
+    def obtener_pedidos_credito(self) -> List[Pedido]:
+        return list(self.iter_pedidos_credito())
+
+    def iter_pedidos_credito(self) -> Iterator[Pedido]:
+        """
+        Genera los pedidos a crédito a medida que se mapean. En el modo "fragmentos" (sin
+        snapshot) los primeros pedidos están disponibles en cuanto llega el primer fragmento;
+        en los demás modos, tras la descarga completa. Al terminar se renueva el índice por NIT.
+        """
+        if self.modo_consulta == "fragmentos" and self.snapshot is None:
+            return self._pedidos_credito_desde_fragmentos(self._iter_fragmentos_crudos())
+        return self._pedidos_credito_desde_fragmentos([self._obtener_pedidos_crudos()])
+
+    def _pedidos_credito_desde_crudos(self, pedidos_crudos: Dict[str, Dict[str, Any]]) -> List[Pedido]:
+        """Filtra los pedidos a crédito de una descarga, renueva el índice por NIT y los mapea."""
+        return list(self._pedidos_credito_desde_fragmentos([pedidos_crudos]))
+
+    def _pedidos_credito_desde_fragmentos(
+        self, fragmentos: Iterable[Dict[str, Dict[str, Any]]]
+    ) -> Iterator[Pedido]:
+        pedidos_a_credito_crudos: Dict[str, Dict[str, Any]] = {}
+        descartes: Counter = Counter()
+        for fragmento in fragmentos:
+            aceptados: List[Tuple[str, Dict[str, Any]]] = []
+            lista_campos: List[Dict[str, Any]] = []
+            for id_pedido, data in fragmento.items():
+                campos, motivo = self._campos_pedido(id_pedido, data)
+                if campos is None:
+                    descartes[motivo] += 1
+                    continue
+                aceptados.append((id_pedido, data))
+                lista_campos.append(campos)
+
+            for (id_pedido, data), pedido in zip(aceptados, self._construir_pedidos(lista_campos)):
+                if pedido is None:
+                    descartes["error_conversion"] += 1
+                    continue
+                pedidos_a_credito_crudos[id_pedido] = data
+                yield pedido
+
+        # Cada descarga renueva el índice de obtener_pedidos_por_nit
+        self._actualizar_indice_por_nit(pedidos_a_credito_crudos)
+        self._registrar_descartes(descartes, len(pedidos_a_credito_crudos))
+
+    def _registrar_descartes(self, descartes: Counter, pedidos_credito: int) -> None:
+        self.ultimos_descartes = descartes
+        print(
+            f"Se ignoraron {descartes['sin_nit'] + descartes['error_conversion']} pedidos por error de conversión. "
+            f"Pedidos a crédito: {pedidos_credito}; descartados por motivo: "
+            f"{dict(sorted(descartes.items())) or '-'}"
+        )
+
+    def obtener_tabla_pedidos_credito(self) -> TablaPedidos:
+        """
+        Pedidos a crédito en formato columnar (TablaPedidos) para el trabajo sobre toda la
+        cartera: mismos pedidos y motivos de descarte que obtener_pedidos_credito, pero sin
+        construir ningún Pedido. En el modo "fragmentos" (sin snapshot) cada fragmento se
+        convierte mientras se descargan los siguientes. No renueva el índice por NIT.
+        """
+        if self.modo_consulta == "fragmentos" and self.snapshot is None:
+            fragmentos = self._iter_fragmentos_crudos()
+        else:
+            fragmentos = [self._obtener_pedidos_crudos()]
+        descartes: Counter = Counter()
+        tabla = TablaPedidos.concatenar(
+            [self._tabla_credito_desde_crudos(fragmento, descartes) for fragmento in fragmentos]
+        )
+        self._registrar_descartes(descartes, len(tabla))
+        return tabla
+
+    @staticmethod
+    def _tabla_credito_desde_crudos(pedidos_crudos: Dict[str, Dict[str, Any]], descartes: Counter) -> TablaPedidos:
+        """
+        Equivalente vectorizado de _campos_pedido sobre una descarga: mismos filtros, en el
+        mismo orden de motivos, y mismas conversiones. Sólo la lectura de los campos de cada
+        diccionario recorre los pedidos; forma_pago se analiza una vez por valor distinto, las
+        fechas con fechas_despacho y los valores con centavos_valores_netos. Los descartes se
+        suman a descartes.
+        """
+        ids = list(pedidos_crudos)
+        registros = list(pedidos_crudos.values())
+        vacios = _falsos(registros)
+        if vacios.any():
+            descartes["sin_datos"] += int(vacios.sum())
+            ids = [id_pedido for id_pedido, vacio in zip(ids, vacios) if not vacio]
+            registros = [data for data, vacio in zip(registros, vacios) if not vacio]
+        if not registros:
+            return TablaPedidos.vacia()
+
+        formas = [d.get("forma_pago") for d in registros]
+        codigos, formas_unicas = pd.factorize(
+            pd.Series([forma if isinstance(forma, str) else None for forma in formas], dtype=object)
+        )
+        # -1 = no es a crédito; el código -1 de factorize (sin forma de pago) toma el último
+        plazos_unicos = [plazo_forma_pago(forma) for forma in formas_unicas] + [None]
+        plazos = np.array([-1 if plazo is None else plazo for plazo in plazos_unicos], dtype=np.int64)[codigos]
+        a_credito = plazos >= 0
+        if not a_credito.all():
+            descartes["forma_pago_no_credito"] += int((~a_credito).sum())
+        # Los demás campos sólo se leen de los pedidos a crédito
+        seleccion = np.flatnonzero(a_credito).tolist()
+        ids = [ids[i] for i in seleccion]
+        registros = [registros[i] for i in seleccion]
+        plazos = plazos[a_credito]
+
+        horas = [d.get("hora_despacho") for d in registros]
+        estados = [d.get("estado") for d in registros]
+        valores = [v.get("neto") if isinstance(v, dict) else None for v in (d.get("valor") for d in registros)]
+        nits = [d.get("nit") for d in registros]
+
+        # Primer motivo que aplica, en el orden de _campos_credito y _campos_pedido (0 = candidato)
+        motivos = np.select(
+            [
+                _falsos(horas),
+                ~pd.Series(estados, dtype=object).isin(ESTADOS_CREDITO).to_numpy(),
+                _falsos(valores),
+                _falsos(nits),
+            ],
+            [2, 3, 4, 5],
+            default=0,
+        )
+        for motivo, cantidad in zip(MOTIVOS_DESCARTE[2:6], np.bincount(motivos, minlength=6)[2:]):
+            if cantidad:
+                descartes[motivo] += int(cantidad)
+
+        candidatos = np.flatnonzero(motivos == 0).tolist()
+        centavos, valores_validos = centavos_valores_netos([valores[i] for i in candidatos])
+        fechas = fechas_despacho([horas[i] for i in candidatos])
+        validos = np.fromiter(
+            (
+                isinstance(ids[i], str) and ids[i] != "" and isinstance(nits[i], str)
+                and isinstance(registros[i].get("razon", ""), str)
+                for i in candidatos
+            ),
+            dtype=bool,
+            count=len(candidatos),
+        ) & valores_validos & ~np.isnat(fechas)
+        errores = len(candidatos) - int(validos.sum())
+        if errores:
+            descartes["error_conversion"] += errores
+
+        finales = np.array(candidatos, dtype=np.intp)[validos].tolist()
+        return TablaPedidos(
+            ids=np.array([ids[i] for i in finales], dtype=str),
+            nits=np.array([nits[i] for i in finales], dtype=str),
+            estados=np.array([estados[i] for i in finales], dtype=np.int8),
+            valores_centavos=centavos[validos],
+            fechas=fechas[validos],
+            plazos=plazos[finales].astype(np.int32),
+        )
+
     def _es_pedido_a_credito_valido(self, item: tuple[str, dict]) -> bool:
         """
         Verifica si un pedido es válido para ser considerado a crédito.
@@ -134,26 +692,6 @@ class FirebaseRepositorioPedidos(AbstractRepositorioPedidos):
         - La forma de pago contiene la palabra "días" (sin importar mayúsculas o minúsculas).
         - La hora de despacho no es None ni vacío.
         - El estado es 2 (DESPACHADO) o 5 (CREDITO_POBLACION).
+        - El valor neto no es None ni vacío.
         """
-        # Desempaquetar el elemento
-        _, data = item
-
-        # Verificar las condiciones
-        # Data no es None ni vacío
-        if not data:
-            return False
-        # Forma de pago contiene "días"
-        forma_pago = data.get("forma_pago", "")
-        # Hora de despacho no es None ni vacío
-        hora_despacho = data.get("hora_despacho")
-        # Estado es 2 (DESPACHADO) o 5 (CREDITO_POBLACION)
-        estado = data.get("estado")
-        # Valor neto no es None ni vacío
-        valor_neto = data.get("valor", {}).get("neto")        
-
-        return (
-            re.search(r"\bd[ií]as\b", forma_pago, re.IGNORECASE)
-            and hora_despacho  # No vacío ni None
-            and estado in {2, 5}  # DESPACHADO o CREDITO_POBLACION
-            and valor_neto  # No vacío ni None
-        )
+        return self._campos_credito(item[1])[0] is None
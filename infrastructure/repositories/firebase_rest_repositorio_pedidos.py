@@ -0,0 +1,175 @@
+# infrastructure/repositories/firebase_rest_repositorio_pedidos.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Coroutine, Dict, Iterable, Iterator, List, Optional
+
+from config.app_config import config
+from domain.models.models import Pedido
+from infrastructure.repositories.cliente_rtdb_rest import ClienteRTDBRest
+from infrastructure.repositories.firebase_repositorio_pedidos import (
+    ESTADOS_CREDITO,
+    FirebaseRepositorioPedidos,
+    descartar_fin_de_rango,
+    rangos_de_claves,
+    variantes_literales_nit,
+)
+
+
+def obtener_token_firebase_admin() -> str:
+    """Access token OAuth2 de las credenciales con que se inicializó firebase_admin."""
+    import firebase_admin
+
+    return firebase_admin.get_app().credential.get_access_token().access_token
+
+
+def _ejecutar(corutina: Coroutine) -> Any:
+    """
+    Ejecuta la corutina hasta terminar desde código síncrono. Si el hilo ya tiene un event
+    loop corriendo, la ejecuta en un hilo aparte con su propio loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(corutina)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, corutina).result()
+
+
+class FirebaseRestRepositorioPedidos(FirebaseRepositorioPedidos):
+    """
+    Variante de FirebaseRepositorioPedidos que lee /pedidos a través de la API REST de
+    Realtime Database con ClienteRTDBRest (asyncio + httpx) en lugar de
+    firebase_admin.db.Reference.get().
+
+    Las consultas de cada modo (los dos estados del modo "estado", las consultas por NIT de
+    consulta_por_nit) se lanzan concurrentemente sobre un pool de conexiones persistentes, y
+    las respuestas se decodifican en streaming descartando los pedidos que no son a crédito
+    a medida que llegan. El filtrado, el índice por NIT y el mapeo son los de la clase base.
+
+    Los métodos *_async sirven a quien ya tiene un event loop; los síncronos de
+    AbstractRepositorioPedidos abren un cliente por llamada.
+
+    Atributos (además de los de FirebaseRepositorioPedidos, salvo snapshot):
+        - url_base: URL de la base de datos.
+        - ruta: Nodo de los pedidos.
+        - obtener_token: Callable que devuelve el access token (None = sin autenticación).
+        - max_conexiones: Conexiones del pool y consultas simultáneas máximas.
+        - reintentos / espera_inicial_s: Política de reintentos de ClienteRTDBRest.
+        - transporte: httpx.AsyncBaseTransport alternativo (pruebas).
+    """
+
+    def __init__(
+        self,
+        url_base: str,
+        ruta: str = "/pedidos",
+        obtener_token: Optional[Callable[[], Optional[str]]] = None,
+        modo_consulta: Optional[str] = None,
+        clave_fecha_ordenable: Optional[str] = None,
+        formato_fecha_ordenable: str = "%Y-%m-%d",
+        segundos_vigencia_indice: Optional[float] = None,
+        consulta_por_nit: bool = False,
+        max_conexiones: Optional[int] = None,
+        reintentos: Optional[int] = None,
+        espera_inicial_s: float = 0.5,
+        transporte=None,
+        tamano_fragmento: Optional[int] = None,
+        validacion_pedidos: Optional[str] = None,
+    ):
+        super().__init__(
+            firebase_reference=None,
+            modo_consulta=modo_consulta,
+            clave_fecha_ordenable=clave_fecha_ordenable,
+            formato_fecha_ordenable=formato_fecha_ordenable,
+            segundos_vigencia_indice=segundos_vigencia_indice,
+            consulta_por_nit=consulta_por_nit,
+            hilos_consulta=max_conexiones,
+            tamano_fragmento=tamano_fragmento,
+            validacion_pedidos=validacion_pedidos,
+        )
+        self.url_base = url_base
+        self.ruta = ruta
+        self.obtener_token = obtener_token
+        self.reintentos = 3 if reintentos is None else reintentos
+        self.espera_inicial_s = espera_inicial_s
+        self.transporte = transporte
+
+    def _crear_cliente(self) -> ClienteRTDBRest:
+        return ClienteRTDBRest(
+            self.url_base,
+            obtener_token=self.obtener_token,
+            max_conexiones=self.hilos_consulta,
+            reintentos=self.reintentos,
+            espera_inicial_s=self.espera_inicial_s,
+            transporte=self.transporte,
+        )
+
+    async def _descargar_credito(self, cliente: ClienteRTDBRest, **consulta) -> Dict[str, Dict[str, Any]]:
+        """Descarga en streaming conservando sólo los pedidos a crédito válidos."""
+        pedidos_crudos: Dict[str, Dict[str, Any]] = {}
+        async for item in cliente.iter_hijos(self.ruta, **consulta):
+            if self._es_pedido_a_credito_valido(item):
+                pedidos_crudos[item[0]] = item[1]
+        return pedidos_crudos
+
+    async def _descargar_rango(
+        self, cliente: ClienteRTDBRest, inicio: Optional[str], fin: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        pedidos_crudos = await self._descargar_credito(cliente, order_by="$key", start_at=inicio, end_at=fin)
+        return descartar_fin_de_rango(pedidos_crudos, fin)
+
+    async def _unir_consultas(self, cliente: ClienteRTDBRest, consultas: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        pedidos_crudos: Dict[str, Dict[str, Any]] = {}
+        for resultado in await asyncio.gather(*(self._descargar_credito(cliente, **c) for c in consultas)):
+            pedidos_crudos.update(resultado)
+        return pedidos_crudos
+
+    async def descargar_pedidos_crudos_async(self) -> Dict[str, Dict[str, Any]]:
+        """Equivalente asíncrono de _descargar_pedidos_crudos para el modo_consulta configurado."""
+        async with self._crear_cliente() as cliente:
+            if self.modo_consulta == "estado":
+                return await self._unir_consultas(
+                    cliente, [{"order_by": "estado", "equal_to": estado} for estado in ESTADOS_CREDITO]
+                )
+            if self.modo_consulta == "fecha":
+                fecha_limite = datetime.now().date() - timedelta(days=config.dias_maximo_pedido)
+                return await self._descargar_credito(
+                    cliente,
+                    order_by=self.clave_fecha_ordenable,
+                    start_at=fecha_limite.strftime(self.formato_fecha_ordenable),
+                )
+            if self.modo_consulta == "fragmentos":
+                claves = await cliente.obtener_claves(self.ruta)
+                pedidos_crudos: Dict[str, Dict[str, Any]] = {}
+                for resultado in await asyncio.gather(*(
+                    self._descargar_rango(cliente, inicio, fin)
+                    for inicio, fin in rangos_de_claves(claves, self.tamano_fragmento)
+                )):
+                    pedidos_crudos.update(resultado)
+                return pedidos_crudos
+            return await self._descargar_credito(cliente)
+
+    async def descargar_pedidos_de_nits_async(self, nits: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Equivalente asíncrono de _descargar_pedidos_de_nits: una consulta equalTo por variante del NIT."""
+        valores = sorted({variante for nit in nits for variante in variantes_literales_nit(nit)})
+        if not valores:
+            return {}
+        async with self._crear_cliente() as cliente:
+            return await self._unir_consultas(
+                cliente, [{"order_by": "nit", "equal_to": valor} for valor in valores]
+            )
+
+    async def obtener_pedidos_credito_async(self) -> List[Pedido]:
+        return self._pedidos_credito_desde_crudos(await self.descargar_pedidos_crudos_async())
+
+    def _descargar_pedidos_crudos(self) -> Dict[str, Dict[str, Any]]:
+        return _ejecutar(self.descargar_pedidos_crudos_async())
+
+    def _iter_fragmentos_crudos(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        # Los fragmentos ya se descargan concurrentemente y filtrados en streaming
+        yield self._descargar_pedidos_crudos()
+
+    def _descargar_pedidos_de_nits(self, nits: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return _ejecutar(self.descargar_pedidos_de_nits_async(nits))
+
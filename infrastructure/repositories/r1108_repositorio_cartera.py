@@ -1,29 +1,165 @@
 # infrastructure/repositories/r1108_repositorio_cartera.py
 
 import chardet
+import numpy as np
 import pandas as pd
 from decimal import Decimal
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 import os  # Import os for file existence check
 from application.ports.interfaces import AbstractRepositorioPedidos
 from domain.models.models import Pedido, EstadoPago
+from infrastructure.repositories.cache_cartera import CacheCartera
 from infrastructure.repositories.firebase_repositorio_pedidos import FirebaseRepositorioPedidos
 
+# Columnas de dinero del CSV y la columna en centavos (int64) que las reemplaza
+COLUMNAS_CENTAVOS = {'valor': 'valor_centavos', 'aplicado': 'aplicado_centavos', 'saldo': 'saldo_centavos'}
+_MAXIMO_DIGITOS_ENTEROS = 16  # 10**16 pesos en centavos sigue cabiendo en int64
+_ESPACIO, _SIGNO_MAS, _COMA, _SIGNO_MENOS, _PUNTO, _CERO, _NUEVE = (ord(c) for c in " +,-.09")
+
+# Bytes del inicio del CSV que se pasan a chardet (el detector suele decidir antes)
+BYTES_MUESTRA_ENCODING = 64 * 1024
+_TAMANO_BLOQUE_DETECCION = 4 * 1024
+
+
+def detectar_encoding(ruta: str, bytes_muestra: int = BYTES_MUESTRA_ENCODING) -> str:
+    """
+    Detecta el encoding de un archivo leyendo a lo sumo bytes_muestra bytes del inicio, por
+    bloques, y deteniéndose en cuanto chardet está seguro. Una muestra sólo ASCII se toma
+    como UTF-8, que la contiene y además acepta acentos que aparezcan más adelante.
+    """
+    detector = chardet.UniversalDetector()
+    with open(ruta, 'rb') as f:
+        leidos = 0
+        while leidos < bytes_muestra and not detector.done:
+            bloque = f.read(min(_TAMANO_BLOQUE_DETECCION, bytes_muestra - leidos))
+            if not bloque:
+                break
+            detector.feed(bloque)
+            leidos += len(bloque)
+    detector.close()
+    encoding = detector.result['encoding']
+    if encoding is None or encoding.lower() == 'ascii':
+        return 'utf-8'
+    return encoding
+
+
+def centavos_de_columna(valores: pd.Series, nombre: str = "valor") -> np.ndarray:
+    """
+    Convierte una columna de valores de la cartera ("1,234.56", "-10", vacío) a centavos int64
+    con redondeo mitad hacia arriba (como Decimal.quantize con ROUND_HALF_UP). Vacíos y NaN
+    valen 0; las comas (separador de miles) se ignoran.
+
+    Cada texto distinto se convierte una sola vez: los textos únicos se ven como una matriz
+    de códigos de carácter (una fila por texto) que se recorre por columnas con operaciones
+    de NumPy, sin crear un objeto por celda.
+
+    Raises:
+        ValueError: Si algún valor no es un número decimal o no cabe en int64.
+    """
+    codigos, unicos = pd.factorize(valores.fillna(""))
+    return _centavos_de_textos(np.asarray(unicos, dtype=str), nombre)[codigos]
+
+
+def _centavos_de_textos(textos: np.ndarray, nombre: str) -> np.ndarray:
+    n = len(textos)
+    if n == 0 or textos.itemsize == 0:
+        return np.zeros(n, dtype=np.int64)
+    caracteres = textos.view(np.uint32).reshape(n, -1)
+
+    pesos = np.zeros(n, dtype=np.int64)
+    centavos = np.zeros(n, dtype=np.int64)
+    redondeo = np.zeros(n, dtype=bool)
+    digitos_enteros = np.zeros(n, dtype=np.int64)
+    decimales = np.zeros(n, dtype=np.int64)  # Dígitos vistos tras el punto
+    hay_digito = np.zeros(n, dtype=bool)
+    en_decimales = np.zeros(n, dtype=bool)
+    en_numero = np.zeros(n, dtype=bool)  # Ya apareció un signo, dígito o punto
+    terminado = np.zeros(n, dtype=bool)  # Espacio final: sólo pueden seguir espacios
+    negativos = np.zeros(n, dtype=bool)
+    invalidos = np.zeros(n, dtype=bool)
+    for columna in caracteres.T:
+        es_relleno = columna == 0
+        es_espacio = columna == _ESPACIO
+        es_digito = (columna >= _CERO) & (columna <= _NUEVE)
+        es_punto = columna == _PUNTO
+        es_coma = columna == _COMA
+        es_signo = (columna == _SIGNO_MENOS) | (columna == _SIGNO_MAS)
+        invalidos |= ~(es_relleno | es_espacio | es_digito | es_punto | es_coma | es_signo)
+        invalidos |= terminado & ~(es_relleno | es_espacio)
+        invalidos |= es_signo & en_numero
+        invalidos |= es_punto & en_decimales
+        invalidos |= es_coma & (en_decimales | ~en_numero)
+        terminado |= es_espacio & en_numero
+
+        digito = columna.astype(np.int64) - _CERO
+        entero = es_digito & ~en_decimales
+        pesos = np.where(entero, pesos * 10 + digito, pesos)
+        digitos_enteros += entero
+        decimal = es_digito & en_decimales
+        decimales += decimal
+        centavos += np.where(decimal & (decimales == 1), digito * 10, 0)
+        centavos += np.where(decimal & (decimales == 2), digito, 0)
+        redondeo |= decimal & (decimales == 3) & (digito >= 5)
+
+        negativos |= columna == _SIGNO_MENOS
+        hay_digito |= es_digito
+        en_decimales |= es_punto
+        en_numero |= es_digito | es_punto | es_signo
+    # Un texto no vacío necesita al menos un dígito ("-" o "." solos no son números)
+    invalidos |= en_numero & ~hay_digito
+    invalidos |= digitos_enteros > _MAXIMO_DIGITOS_ENTEROS
+    if invalidos.any():
+        ejemplos = textos[invalidos][:3].tolist()
+        raise ValueError(f"Valores no numéricos en la columna '{nombre}': {ejemplos}")
+    centavos += pesos * 100 + redondeo
+    return np.where(negativos, -centavos, centavos)
+
+
+def _decimal_de_centavos(centavos) -> Optional[Decimal]:
+    """Decimal con dos decimales de un valor en centavos de la cartera (None si falta)."""
+    if centavos is None or pd.isna(centavos):
+        return None
+    return Decimal(int(centavos)).scaleb(-2)
+
 
 class RepositorioCartera(AbstractRepositorioPedidos):
     """
     Repositorio que enriquece los datos de pedidos de Firebase con información
     de cartera proveniente de un archivo CSV.
     Implementa la interfaz AbstractRepositorioPedidos.
+
+    Si se indica cache, el DataFrame preparado se guarda en disco y las cargas siguientes del
+    mismo CSV (misma ruta, tamaño y mtime) lo leen de ahí sin volver a prepararlo.
+
+    Si se indica encoding, el CSV se lee con él sin detección. Si no, se detecta sobre una
+    muestra del inicio del archivo y se recuerda por huella (ruta, tamaño, mtime) para las
+    instancias siguientes; si la muestra engaña y la lectura falla, se detecta sobre el
+    archivo completo.
+
+    Los pedidos se cruzan con la cartera por (nit, numero) con un diccionario que se construye
+    una sola vez por DataFrame (se reconstruye si se reemplaza df). Si la cartera repite una
+    clave, gana la primera fila en el orden del DataFrame preparado (numero, fecha, nit).
     """
 
-    def __init__(self, firebase_repo: FirebaseRepositorioPedidos, csv_path: str):
+    # Encoding detectado por huella del CSV, compartido entre instancias (una por ejecución)
+    _encodings_por_huella: Dict[Tuple[str, int, int], str] = {}
+
+    def __init__(
+        self,
+        firebase_repo: FirebaseRepositorioPedidos,
+        csv_path: str,
+        cache: Optional[CacheCartera] = None,
+        encoding: Optional[str] = None,
+    ):
         self.firebase_repo = firebase_repo  # The wrapped Firebase repository
         self.csv_path = csv_path
+        self.cache = cache
+        self.encoding = encoding
+        self._lookup_cartera: Optional[Dict[Tuple[str, str], Tuple[Optional[int], int]]] = None
         self._configurar_logger()
         try:
-            self.df: pd.DataFrame = self._cargar_y_preparar_csv()
+            self.df = self._cargar_cartera()
             self.logger.info(
                 f"Archivo CSV de cartera cargado y preparado exitosamente desde: {csv_path}")
         except FileNotFoundError:
@@ -36,6 +172,15 @@ class RepositorioCartera(AbstractRepositorioPedidos):
                 f"Error Crítico al cargar o preparar el CSV de cartera desde {csv_path}: {e}", exc_info=True)
             raise  # Or handle
 
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        self._df = df
+        self._lookup_cartera = None  # Se reconstruye con el nuevo DataFrame
+
     def _configurar_logger(self):
         """Configura el logger para registrar información y errores."""
         # Configure root logger is okay, but consider named logger for better isolation
@@ -51,6 +196,36 @@ class RepositorioCartera(AbstractRepositorioPedidos):
         self.logger = logging.getLogger(__name__)
         self.logger.info("Logger para RepositorioCartera configurado.")
 
+    def _cargar_cartera(self) -> pd.DataFrame:
+        """DataFrame preparado desde la caché si el CSV no cambió; si no, lo prepara y lo guarda."""
+        if self.cache is None or not os.path.exists(self.csv_path):
+            return self._cargar_y_preparar_csv()
+        df = self.cache.obtener(self.csv_path, self.encoding)
+        if df is not None:
+            self.logger.info(f"Cartera cargada desde la caché ({len(df)} filas).")
+            return df
+        df = self._cargar_y_preparar_csv()
+        try:
+            self.cache.guardar(self.csv_path, df, self.encoding)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar la caché de cartera: {e}")
+        return df
+
+    def _huella_csv(self) -> Tuple[str, int, int]:
+        stat = os.stat(self.csv_path)
+        return os.path.abspath(self.csv_path), stat.st_size, stat.st_mtime_ns
+
+    def _leer_csv(self, encoding: str) -> pd.DataFrame:
+        return pd.read_csv(
+            self.csv_path,
+            encoding=encoding,
+            # Define dtypes for potentially problematic columns during read
+            # Read NIT, Numero, Valor, Aplicado, and Saldo as strings initially
+            dtype={'nit': str, 'Número': str, 'Valor': str, 'Aplicado': str, 'Saldo': str},
+            # Specify decimal separator if it's not '.'
+            # decimal=','
+        )
+
     def _cargar_y_preparar_csv(self) -> pd.DataFrame:
         """Carga y prepara el archivo CSV para su uso."""
         self.logger.info(f"Intentando cargar CSV desde: {self.csv_path}")
@@ -64,24 +239,25 @@ class RepositorioCartera(AbstractRepositorioPedidos):
                 f"El archivo CSV está vacío: {self.csv_path}")
         
         try:
-            # Detect encoding
-            with open(self.csv_path, 'rb') as f:
-                result = chardet.detect(f.read())
-                detected_encoding = result['encoding']
-                self.logger.info(f"Encoding detectado: {detected_encoding}")
-            
-            # Read the CSV with the detected encoding
-            df = pd.read_csv(
-                self.csv_path,
-                # Consider adding encoding='utf-8' or 'latin1' if needed
-                encoding=detected_encoding,  # Common encoding for CSVs from Windows systems
-                # Define dtypes for potentially problematic columns during read
-                # Read NIT, Numero, Valor, Aplicado, and Saldo as strings initially
-                dtype={'nit': str, 'Número': str, 'Valor': str, 'Aplicado': str, 'Saldo': str},
-                # Specify decimal separator if it's not '.'
-                # decimal=','
-            )
-            
+            if self.encoding:
+                df = self._leer_csv(self.encoding)
+            else:
+                huella = self._huella_csv()
+                encoding = self._encodings_por_huella.get(huella)
+                if encoding is None:
+                    encoding = detectar_encoding(self.csv_path)
+                    self.logger.info(f"Encoding detectado: {encoding}")
+                try:
+                    df = self._leer_csv(encoding)
+                except UnicodeDecodeError as e:
+                    # The sample did not represent the whole file: fall back to a full detection
+                    with open(self.csv_path, 'rb') as f:
+                        encoding = chardet.detect(f.read())['encoding'] or 'latin-1'
+                    self.logger.warning(
+                        f"El CSV no se pudo leer con el encoding de la muestra ({e}); se usa {encoding}.")
+                    df = self._leer_csv(encoding)
+                self._encodings_por_huella[huella] = encoding
+
             self.logger.info(
                 f"CSV cargado. Columnas iniciales: {df.columns.tolist()}")
 
@@ -113,24 +289,12 @@ class RepositorioCartera(AbstractRepositorioPedidos):
                         df[col] = pd.to_datetime(
                             df[col], errors='coerce')  # Fallback attempt
 
-            # 3. Handle Numeric Columns (Valor, Aplicado, Saldo)
-            numeric_cols = ['valor', 'aplicado', 'saldo']
-            for col in numeric_cols:
+            # 3. Money columns (Valor, Aplicado, Saldo) as exact int64 cents; Decimal is only
+            # built when a Pedido is updated
+            for col, col_centavos in COLUMNAS_CENTAVOS.items():
                 if col in df.columns:
-                    # Convert to string first to handle commas reliably
-                    df[col] = (
-                        df[col].astype(str)
-                        .str.replace(',', '', regex=False)
-                        # Replace empty strings with "0.0"
-                        .replace(['', 'NaN', 'nan'], '0.0')
-                        .fillna('0.0')       # Replace NaN with "0.0"
-                        .apply(lambda x: Decimal(str(x)))
-                    )
-                    # Convert valid numbers to Decimal
-                    # Use .loc to avoid SettingWithCopyWarning if df is a slice
-                    valid_indices = df[col].notna()
-                    df.loc[valid_indices, col] = df.loc[valid_indices,
-                                                        col].apply(lambda x: Decimal(str(x)))
+                    df[col_centavos] = centavos_de_columna(df[col], col)
+                    df.drop(columns=col, inplace=True)
 
             # 4. Clean NIT (ensure it's string, remove delimiters)
             if 'nit' in df.columns:
@@ -157,7 +321,7 @@ class RepositorioCartera(AbstractRepositorioPedidos):
 
             # 6. Drop rows with critical NaNs AFTER conversion attempts
             # Add 'numero' if essential for matching
-            critical_cols = ['nit', 'valor', 'aplicado', 'numero']
+            critical_cols = ['nit', 'valor_centavos', 'aplicado_centavos', 'numero']
             df.dropna(subset=critical_cols, inplace=True)
 
             # 7. Sort (Optional, but can be helpful)
@@ -178,6 +342,12 @@ class RepositorioCartera(AbstractRepositorioPedidos):
                 f"Error inesperado durante la preparación del CSV: {e}", exc_info=True)
             raise
 
+    def nits_conocidos(self) -> List[str]:
+        """NIT distintos de la cartera, ya limpios (los pedidos sin fila en la cartera no se devuelven)."""
+        if self.df is None or 'nit' not in self.df.columns:
+            return []
+        return self.df['nit'].dropna().unique().tolist()
+
     def obtener_pedidos_credito(self) -> List[Pedido]:
         """
         Obtiene los pedidos de crédito de Firebase y los actualiza con los
@@ -185,7 +355,6 @@ class RepositorioCartera(AbstractRepositorioPedidos):
         """
         self.logger.info(
             "Iniciando obtención y actualización de pedidos de crédito.")
-        pedidos_actualizados = []
         
         # 1. Get all relevant orders from Firebase first
         # Assuming obtener_pedidos_credito() gets orders needing payment check
@@ -193,80 +362,69 @@ class RepositorioCartera(AbstractRepositorioPedidos):
         self.logger.info(
             f"Obtenidos {len(pedidos_firebase)} pedidos de crédito desde Firebase."
         )
+        return self._actualizar_con_cartera(pedidos_firebase)
+
+    def obtener_pedidos_credito_para_nits(self, nits: Iterable[str]) -> List[Pedido]:
+        """
+        Como obtener_pedidos_credito, pero sólo construye y actualiza los pedidos de los NIT
+        indicados (ver FirebaseRepositorioPedidos.obtener_pedidos_credito_para_nits).
+        """
+        pedidos_firebase = self.firebase_repo.obtener_pedidos_credito_para_nits(nits)
+        self.logger.info(
+            f"Obtenidos {len(pedidos_firebase)} pedidos de crédito desde Firebase para los NIT con pagos."
+        )
+        return self._actualizar_con_cartera(pedidos_firebase)
+
+    def _actualizar_con_cartera(self, pedidos_firebase: List[Pedido]) -> List[Pedido]:
+        """Actualiza valor_cobrado y estado_pago de los pedidos con el 'Aplicado' del CSV."""
+        pedidos_actualizados = []
 
         if self.df is None or self.df.empty:
             self.logger.warning(
                 "DataFrame de cartera está vacío o no se cargó. Devolviendo pedidos de Firebase sin actualizar.")
             return pedidos_firebase  # Return original orders if CSV failed
 
-        # 2. Create a lookup from the CSV for efficient access
-        # Match by NIT and Invoice Number ('numero' in CSV -> 'id_pedido' in Firebase)
-        try:
-            # Make sure 'numero' exists before setting index
-            if 'numero' not in self.df.columns:
-                self.logger.error(
-                    "No se puede crear lookup CSV: falta la columna 'numero'.")
-                return pedidos_firebase  # Cannot update
-
-            # Drop duplicates based on the key you'll use for lookup to avoid issues
-            # Keep the one with the latest date or highest 'aplicado' if duplicates exist
-            # df_unique = self.df.sort_values('fecha', ascending=False).drop_duplicates(subset=['nit', 'numero'], keep='first')
-            # Or handle duplicates based on business logic
-
-            csv_lookup = self.df.set_index(['nit', 'numero'])
-        except KeyError:
-            self.logger.error(
-                "Error al crear el índice para lookup CSV (faltan 'nit' o 'numero'). Devolviendo pedidos de Firebase sin actualizar.")
-            return pedidos_firebase
+        # 2. Lookup (nit, numero) -> (valor, aplicado) in cents, built once per DataFrame
+        csv_lookup = self._obtener_lookup_cartera()
+        if csv_lookup is None:
+            return pedidos_firebase  # Cannot update
 
         # 3. Iterate through Firebase orders and update
         for pedido in pedidos_firebase:
+            fila_csv = csv_lookup.get((pedido.nit_cliente, pedido.id_pedido))
+            if fila_csv is None:
+                # Pedido from Firebase not found in CSV lookup
+                continue
             try:
-                # Find corresponding row in CSV using the lookup.
-                if (pedido.nit_cliente, pedido.id_pedido) not in csv_lookup.index:
-                    # Pedido from Firebase not found in CSV lookup
-                    pass
-                else:
-                    fila_csv = csv_lookup.loc[(
-                        pedido.nit_cliente, pedido.id_pedido)]
-
-                    # Handle potential multiple matches if index wasn't unique
-                    if isinstance(fila_csv, pd.DataFrame):
-                        # If multiple rows match, decide which one to use (e.g., the first, the latest)
-                        self.logger.warning(
-                            f"Múltiples entradas en CSV para NIT {pedido.nit_cliente}, Pedido {pedido.id_pedido}. Usando la primera.")
-                        fila_csv = fila_csv.iloc[0]
+                csv_valor = _decimal_de_centavos(fila_csv[0])
+                csv_valor_aplicado = _decimal_de_centavos(fila_csv[1])
 
-                    csv_valor = fila_csv.get('valor')
-                    # Default to 0 if missing
-                    csv_valor_aplicado = fila_csv.get('aplicado', Decimal("0.0"))
+                # Compare valor_neto (optional logging)
+                if csv_valor is not None and pedido.valor_neto != csv_valor:
+                    self.logger.warning(
+                        f"Diferencia valor_neto Pedido {pedido.id_pedido} (NIT {pedido.nit_cliente}): "
+                        f"Firebase={pedido.valor_neto}, CSV={csv_valor}"
+                    )
+                    # Decide if you want to *override* valor_neto based on CSV
+                    # pedido.valor_neto = csv_valor # Uncomment if CSV is the source of truth
 
-                    # Compare valor_neto (optional logging)
-                    if csv_valor is not None and pedido.valor_neto != csv_valor:
-                        self.logger.warning(
-                            f"Diferencia valor_neto Pedido {pedido.id_pedido} (NIT {pedido.nit_cliente}): "
-                            f"Firebase={pedido.valor_neto}, CSV={csv_valor}"
-                        )
-                        # Decide if you want to *override* valor_neto based on CSV
-                        # pedido.valor_neto = csv_valor # Uncomment if CSV is the source of truth
-
-                    # Update valor_cobrado and estado_pago based on 'Aplicado'
-                    if csv_valor_aplicado is not None and csv_valor_aplicado > 0:
-                        # Check if CSV value is different from existing valor_cobrado
-                        if pedido.valor_cobrado != csv_valor_aplicado:
-                            self.logger.info(f"Actualizando Pedido {pedido.id_pedido} (NIT {pedido.nit_cliente}): "
-                                             f"valor_cobrado anterior={pedido.valor_cobrado}, "
-                                             f"CSV aplicado={csv_valor_aplicado}")
-                            pedido.valor_cobrado = csv_valor_aplicado
-                            # Update state based on the new valor_cobrado
-                            if pedido.valor_cobrado >= pedido.valor_neto:
-                                 pedido.estado_pago = EstadoPago.PAGADO
-                                 self.logger.warning(f"CSV aplicado {csv_valor_aplicado} > Valor factura {pedido.valor_neto}): ")
-                            else:
-                                 pedido.estado_pago = EstadoPago.PARCIAL
-
-                    # Always add the pedido (even if not updated) to the result list
-                    pedidos_actualizados.append(pedido)
+                # Update valor_cobrado and estado_pago based on 'Aplicado'
+                if csv_valor_aplicado is not None and csv_valor_aplicado > 0:
+                    # Check if CSV value is different from existing valor_cobrado
+                    if pedido.valor_cobrado != csv_valor_aplicado:
+                        self.logger.info(f"Actualizando Pedido {pedido.id_pedido} (NIT {pedido.nit_cliente}): "
+                                         f"valor_cobrado anterior={pedido.valor_cobrado}, "
+                                         f"CSV aplicado={csv_valor_aplicado}")
+                        pedido.valor_cobrado = csv_valor_aplicado
+                        # Update state based on the new valor_cobrado
+                        if pedido.valor_cobrado >= pedido.valor_neto:
+                            pedido.estado_pago = EstadoPago.PAGADO
+                            self.logger.warning(f"CSV aplicado {csv_valor_aplicado} > Valor factura {pedido.valor_neto}): ")
+                        else:
+                            pedido.estado_pago = EstadoPago.PARCIAL
+
+                # Always add the pedido (even if not updated) to the result list
+                pedidos_actualizados.append(pedido)
 
             except Exception as e:
                 self.logger.error(
@@ -278,3 +436,28 @@ class RepositorioCartera(AbstractRepositorioPedidos):
             f"Proceso de actualización completado. Total pedidos devueltos: {len(pedidos_actualizados)}")
         return pedidos_actualizados
 
+    def _obtener_lookup_cartera(self) -> Optional[Dict[Tuple[str, str], Tuple[Optional[int], int]]]:
+        """
+        Diccionario (nit, numero) -> (valor_centavos, aplicado_centavos) del DataFrame actual,
+        o None si faltan las columnas clave. Con claves repetidas se conserva la primera fila.
+        """
+        if self._lookup_cartera is not None:
+            return self._lookup_cartera
+        if 'nit' not in self.df.columns or 'numero' not in self.df.columns:
+            self.logger.error(
+                "No se puede crear lookup CSV: faltan las columnas 'nit' o 'numero'. Devolviendo pedidos de Firebase sin actualizar.")
+            return None
+
+        duplicadas = self.df.duplicated(subset=['nit', 'numero'], keep='first').to_numpy()
+        unicas = self.df[~duplicadas]
+        if duplicadas.any():
+            self.logger.warning(
+                f"{int(duplicadas.sum())} filas del CSV repiten (nit, numero); se usa la primera de cada una.")
+        n = len(unicas)
+        valores = unicas['valor_centavos'].tolist() if 'valor_centavos' in unicas.columns else [None] * n
+        aplicados = unicas['aplicado_centavos'].tolist() if 'aplicado_centavos' in unicas.columns else [0] * n
+        self._lookup_cartera = dict(zip(
+            zip(unicas['nit'].tolist(), unicas['numero'].tolist()),
+            zip(valores, aplicados),
+        ))
+        return self._lookup_cartera
@@ -0,0 +1,64 @@
+# infrastructure/repositories/repositorio_pedidos_en_cache.py
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from application.ports.interfaces import AbstractRepositorioPedidos
+from domain.models.models import Pedido
+from domain.services.indice_nit import normalizar_nit
+
+
+class RepositorioPedidosEnCache(AbstractRepositorioPedidos):
+    """
+    Repositorio que mantiene en memoria los pedidos de crédito de otro repositorio durante
+    segundos_vigencia, para procesos de larga duración (p. ej. el modo vigilancia) que
+    ejecutan el caso de uso muchas veces.
+
+    Cada consulta devuelve copias profundas: el AplicadorDePagos modifica los pedidos en sitio
+    y una ejecución no debe ver los abonos aplicados en memoria por otra.
+
+    Atributos:
+        - fabrica_repositorio: Crea el repositorio real; se invoca en cada recarga para que
+          también se refresquen los datos que ese repositorio carga al construirse (p. ej. el CSV de cartera).
+        - segundos_vigencia: Tiempo tras el cual los pedidos se vuelven a cargar.
+    """
+
+    def __init__(
+        self,
+        fabrica_repositorio: Callable[[], AbstractRepositorioPedidos],
+        segundos_vigencia: float = 900,
+    ):
+        self._fabrica_repositorio = fabrica_repositorio
+        self._segundos_vigencia = segundos_vigencia
+        self._pedidos: Optional[List[Pedido]] = None
+        self._expira_en = 0.0
+        self._lock = threading.Lock()
+
+    def invalidar(self) -> None:
+        """Fuerza la recarga en la próxima consulta."""
+        with self._lock:
+            self._pedidos = None
+
+    def _pedidos_vigentes(self) -> List[Pedido]:
+        with self._lock:
+            if self._pedidos is None or time.monotonic() >= self._expira_en:
+                inicio = time.perf_counter()
+                self._pedidos = self._fabrica_repositorio().obtener_pedidos_credito()
+                self._expira_en = time.monotonic() + self._segundos_vigencia
+                logging.info(
+                    f"Pedidos de crédito recargados: {len(self._pedidos)} en {time.perf_counter() - inicio:.2f} s"
+                )
+            return self._pedidos
+
+    def obtener_pedidos_credito(self) -> List[Pedido]:
+        return [pedido.model_copy(deep=True) for pedido in self._pedidos_vigentes()]
+
+    def obtener_pedidos_credito_para_nits(self, nits: Iterable[str]) -> List[Pedido]:
+        # Sólo se copian los pedidos de los NIT pedidos
+        nits_normalizados = {normalizar_nit(nit) for nit in nits}
+        return [
+            pedido.model_copy(deep=True) for pedido in self._pedidos_vigentes()
+            if normalizar_nit(pedido.nit_cliente) in nits_normalizados
+        ]
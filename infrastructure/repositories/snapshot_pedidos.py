@@ -0,0 +1,172 @@
+# infrastructure/repositories/snapshot_pedidos.py
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Versión del formato del archivo. Incrementarla obliga a una descarga completa
+VERSION_SNAPSHOT = 1
+
+# Campos de cada pedido que se conservan (los que usa FirebaseRepositorioPedidos)
+CAMPOS_SNAPSHOT = ("nit", "estado", "hora_despacho", "forma_pago", "razon")
+
+PedidosCrudos = Dict[str, Dict[str, Any]]
+
+
+def proyectar_pedido(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Conserva sólo los campos que se usan para mapear el pedido, con valor.neto anidado."""
+    proyectado = {campo: data[campo] for campo in CAMPOS_SNAPSHOT if campo in data}
+    neto = (data.get("valor") or {}).get("neto")
+    if neto is not None:
+        proyectado["valor"] = {"neto": neto}
+    return proyectado
+
+
+class SnapshotPedidos:
+    """
+    Copia local y persistente de los pedidos candidatos a crédito de /pedidos, sincronizada
+    por deltas.
+
+    La primera sincronización (o una sin marca de agua) descarga los pedidos completos. Las
+    siguientes consultan sólo los pedidos con clave_actualizacion >= la marca de agua de la
+    última sincronización (order_by_child(...).start_at(...)), los incorporan o retiran del
+    snapshot según sigan siendo válidos, y avanzan la marca de agua. El archivo es JSON
+    comprimido con gzip y sólo guarda los campos de CAMPOS_SNAPSHOT.
+
+    Los pedidos borrados en Firebase no aparecen en un delta; por eso, si el snapshot es más
+    antiguo que max_edad_s, se vuelve a hacer una descarga completa.
+
+    Atributos:
+        - ruta: Archivo del snapshot (.json.gz).
+        - clave_actualizacion: Hijo de cada pedido con la marca de última modificación
+          (epoch en ms o texto ordenable). Requiere ".indexOn" sobre esa clave.
+        - max_edad_s: Segundos tras los cuales se fuerza una descarga completa (None = nunca).
+    """
+
+    def __init__(self, ruta: str, clave_actualizacion: str = "actualizado_en", max_edad_s: Optional[float] = None):
+        self.ruta = ruta
+        self.clave_actualizacion = clave_actualizacion
+        self.max_edad_s = max_edad_s
+        self._pedidos: Optional[PedidosCrudos] = None
+        self._marca_agua: Any = None
+        self._completo_en: float = 0.0
+        self._lock = threading.Lock()
+        self.ultima_sincronizacion: Dict[str, Any] = {}
+
+    def _cargar(self) -> None:
+        if not os.path.exists(self.ruta):
+            return
+        try:
+            with gzip.open(self.ruta, "rt", encoding="utf-8") as f:
+                contenido = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Snapshot de pedidos ilegible en {self.ruta}, se descargará completo: {e}")
+            return
+        if contenido.get("version") != VERSION_SNAPSHOT or contenido.get("clave_actualizacion") != self.clave_actualizacion:
+            return
+        self._pedidos = contenido["pedidos"]
+        self._marca_agua = contenido.get("marca_agua")
+        self._completo_en = contenido.get("completo_en", 0.0)
+
+    def _guardar(self) -> None:
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        ruta_temporal = f"{self.ruta}.tmp"
+        with gzip.open(ruta_temporal, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(
+                {
+                    "version": VERSION_SNAPSHOT,
+                    "clave_actualizacion": self.clave_actualizacion,
+                    "marca_agua": self._marca_agua,
+                    "completo_en": self._completo_en,
+                    "pedidos": self._pedidos,
+                },
+                f,
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+        os.replace(ruta_temporal, self.ruta)
+
+    def _avanzar_marca_agua(self, pedidos: PedidosCrudos) -> None:
+        for data in pedidos.values():
+            marca = (data or {}).get(self.clave_actualizacion)
+            if marca is not None and (self._marca_agua is None or marca > self._marca_agua):
+                self._marca_agua = marca
+
+    def _requiere_descarga_completa(self) -> bool:
+        if self._pedidos is None or self._marca_agua is None:
+            return True
+        return self.max_edad_s is not None and time.time() - self._completo_en > self.max_edad_s
+
+    def sincronizar(
+        self,
+        referencia,
+        descargar_completo: Callable[[], PedidosCrudos],
+        es_valido: Callable[[tuple], bool],
+    ) -> PedidosCrudos:
+        """
+        Sincroniza el snapshot con Firebase y devuelve los pedidos candidatos (id -> datos).
+
+        Args:
+            referencia: Referencia de /pedidos (firebase_admin.db.Reference o equivalente).
+            descargar_completo: Descarga completa usada en frío.
+            es_valido: Criterio (id, datos) -> bool para conservar un pedido en el snapshot.
+        """
+        with self._lock:
+            if self._pedidos is None:
+                self._cargar()
+
+            if self._requiere_descarga_completa():
+                pedidos_crudos = descargar_completo()
+                self._pedidos = {
+                    id_pedido: proyectar_pedido(data)
+                    for id_pedido, data in pedidos_crudos.items()
+                    if es_valido((id_pedido, data))
+                }
+                self._marca_agua = None
+                self._avanzar_marca_agua(pedidos_crudos)
+                self._completo_en = time.time()
+                if self._marca_agua is None:
+                    logging.warning(
+                        f"Ningún pedido tiene '{self.clave_actualizacion}'; el snapshot no puede sincronizarse por deltas."
+                    )
+                self.ultima_sincronizacion = {"modo": "completo", "cambios": len(pedidos_crudos)}
+                self._guardar()
+                return self._pedidos
+
+            cambios: PedidosCrudos = referencia.order_by_child(self.clave_actualizacion).start_at(
+                self._marca_agua
+            ).get() or {}
+            for id_pedido, data in cambios.items():
+                if es_valido((id_pedido, data)):
+                    self._pedidos[id_pedido] = proyectar_pedido(data)
+                else:
+                    # Dejó de ser candidato (p. ej. anulado o cambiado a contado)
+                    self._pedidos.pop(id_pedido, None)
+            self._avanzar_marca_agua(cambios)
+            self.ultima_sincronizacion = {"modo": "delta", "cambios": len(cambios)}
+            if cambios:
+                self._guardar()
+            return self._pedidos
+
+    def invalidar(self) -> None:
+        """Descarta el snapshot; la próxima sincronización será una descarga completa."""
+        with self._lock:
+            self._pedidos = None
+            self._marca_agua = None
+            if os.path.exists(self.ruta):
+                os.remove(self.ruta)
+
+
+def crear_snapshot_pedidos(
+    ruta: Optional[str], clave_actualizacion: Optional[str] = None, max_edad_s: Optional[float] = None
+) -> Optional[SnapshotPedidos]:
+    """Crea el snapshot si hay una ruta configurada; sin ruta los pedidos se descargan completos en cada ejecución."""
+    if not ruta:
+        return None
+    return SnapshotPedidos(ruta, clave_actualizacion or "actualizado_en", max_edad_s)
@@ -0,0 +1,105 @@
+# infrastructure/repositories/tabla_pedidos.py
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.app_config import config
+
+
+class TablaPedidos:
+    """
+    Pedidos a crédito en formato columnar: cada campo es un arreglo de NumPy, de modo que las
+    agregaciones, filtros y cruces sobre toda la cartera se hacen con operaciones vectorizadas
+    en lugar de bucles sobre objetos Pedido.
+
+    Columnas (una fila por pedido, en el orden de la descarga):
+        - ids: str = id_pedido
+        - nits: str = NIT tal como está guardado en el pedido
+        - estados: int8 = EstadoPedido
+        - valores_centavos: int64 = Valor neto en centavos (exacto, mitad hacia arriba)
+        - fechas: datetime64[D] = Fecha de despacho (fecha_pedido)
+        - plazos: int32 = Días de plazo de la forma de pago
+    """
+
+    __slots__ = ("ids", "nits", "estados", "valores_centavos", "fechas", "plazos")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        nits: np.ndarray,
+        estados: np.ndarray,
+        valores_centavos: np.ndarray,
+        fechas: np.ndarray,
+        plazos: np.ndarray,
+    ):
+        if not len(ids) == len(nits) == len(estados) == len(valores_centavos) == len(fechas) == len(plazos):
+            raise ValueError("Todas las columnas deben tener la misma longitud.")
+        self.ids = ids
+        self.nits = nits
+        self.estados = estados
+        self.valores_centavos = valores_centavos
+        self.fechas = fechas
+        self.plazos = plazos
+
+    @classmethod
+    def vacia(cls) -> "TablaPedidos":
+        return cls(
+            ids=np.zeros(0, dtype=str),
+            nits=np.zeros(0, dtype=str),
+            estados=np.zeros(0, dtype=np.int8),
+            valores_centavos=np.zeros(0, dtype=np.int64),
+            fechas=np.zeros(0, dtype="datetime64[D]"),
+            plazos=np.zeros(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def concatenar(cls, tablas: Iterable["TablaPedidos"]) -> "TablaPedidos":
+        """Une tablas (p. ej. una por fragmento descargado) conservando el orden."""
+        tablas = [tabla for tabla in tablas if len(tabla)]
+        if not tablas:
+            return cls.vacia()
+        if len(tablas) == 1:
+            return tablas[0]
+        return cls(*(np.concatenate([getattr(tabla, columna) for tabla in tablas]) for columna in cls.__slots__))
+
+    def __len__(self) -> int:
+        return len(self.valores_centavos)
+
+    def filtrar(self, mascara: np.ndarray) -> "TablaPedidos":
+        """Filas donde la máscara booleana (o los índices) seleccionan."""
+        return TablaPedidos(*(getattr(self, columna)[mascara] for columna in self.__slots__))
+
+    def de_nits(self, nits: Iterable[str]) -> "TablaPedidos":
+        """Pedidos de los NIT indicados (comparación literal, como están guardados)."""
+        return self.filtrar(np.isin(self.nits, np.array(list(nits), dtype=str)))
+
+    def fechas_vencimiento(self, dias_gracia: Optional[int] = None) -> np.ndarray:
+        """Equivalente vectorizado de Pedido.fecha_vencimiento (fecha + plazo + días de gracia)."""
+        dias_gracia = config.dias_gracia_vencimiento if dias_gracia is None else dias_gracia
+        return self.fechas + (self.plazos.astype(np.int64) + dias_gracia).astype("timedelta64[D]")
+
+    def totales_por_nit(self) -> Dict[str, int]:
+        """
+        Suma los valores netos por NIT en centavos. Los NIT se devuelven en el orden de su
+        primera aparición.
+        """
+        if len(self) == 0:
+            return {}
+        nits_unicos, primer_indice, inverso = np.unique(self.nits, return_index=True, return_inverse=True)
+        totales = np.zeros(len(nits_unicos), dtype=np.int64)
+        np.add.at(totales, inverso, self.valores_centavos)
+        orden = np.argsort(primer_indice, kind="stable")
+        return {str(nits_unicos[i]): int(totales[i]) for i in orden}
+
+    def a_dataframe(self) -> pd.DataFrame:
+        """DataFrame con una columna por campo, para cruces con pandas (p. ej. la cartera)."""
+        return pd.DataFrame({
+            "nit": self.nits,
+            "id_pedido": self.ids,
+            "estado": self.estados,
+            "valor_neto_centavos": self.valores_centavos,
+            "fecha_pedido": self.fechas,
+            "plazo_dias": self.plazos,
+        })
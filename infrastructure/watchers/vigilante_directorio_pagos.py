@@ -0,0 +1,200 @@
+# infrastructure/watchers/vigilante_directorio_pagos.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from domain.models.models import TipoCuentaBancaria
+
+# Extractos en PDF o exportaciones tabulares (ver ExtractorPagosTabular)
+_PATRON_EXTRACTO = re.compile(r"^(\d{8})\.(?:pdf|csv|xlsx)$", re.IGNORECASE)
+
+ClaveExtracto = Tuple[str, str]  # (fecha YYYYMMDD, tipo_cuenta)
+
+
+def _hash_archivo(ruta: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(bloque)
+    return sha256.hexdigest()
+
+
+class VigilanteDirectorioPagos:
+    """
+    Detecta extractos nuevos o modificados en {directorio_pagos}/{tipo_cuenta}/{YYYYMMDD}.pdf
+    (o .csv/.xlsx).
+
+    Un archivo se considera cambiado cuando su mtime o tamaño difieren de lo registrado y,
+    además, su hash de contenido es distinto (una copia idéntica que sólo cambia el mtime no
+    se vuelve a procesar). Para no leer archivos que todavía se están copiando, un cambio sólo
+    se reporta cuando el archivo se ve igual en dos revisiones consecutivas.
+
+    Los fallos se registran por archivo y contenido (fecha, tipo_cuenta, hash): un extracto
+    que falla se reintenta con espera exponencial (espera_reintento_s, 2x, 4x, ...) y tras
+    max_intentos fallos no se vuelve a reportar hasta que su contenido cambie.
+
+    El estado de los archivos procesados y de los fallos se guarda en ruta_estado (JSON) para
+    sobrevivir a reinicios.
+
+    Atributos:
+        - directorio_pagos: Directorio con las carpetas ahorros/corriente.
+        - ruta_estado: Archivo JSON con el estado de los extractos procesados (opcional).
+        - tipos_cuenta: Subcarpetas a vigilar.
+        - max_intentos: Fallos tras los que un extracto deja de reintentarse.
+        - espera_reintento_s: Espera antes del primer reintento; se duplica en cada fallo.
+    """
+
+    def __init__(
+        self,
+        directorio_pagos: str,
+        ruta_estado: Optional[str] = None,
+        tipos_cuenta: Sequence[str] = tuple(t.value for t in TipoCuentaBancaria),
+        max_intentos: int = 5,
+        espera_reintento_s: float = 60.0,
+    ):
+        self.directorio_pagos = directorio_pagos
+        self.ruta_estado = ruta_estado
+        self.tipos_cuenta = tuple(tipos_cuenta)
+        self.max_intentos = max_intentos
+        self.espera_reintento_s = espera_reintento_s
+        self._procesados: Dict[str, Dict] = {}
+        self._fallos: Dict[str, Dict] = {}
+        self._cargar_estado()
+        self._observados: Dict[str, Tuple[int, int]] = {}
+
+    def _cargar_estado(self) -> None:
+        if not self.ruta_estado or not os.path.exists(self.ruta_estado):
+            return
+        try:
+            with open(self.ruta_estado, "r", encoding="utf-8") as f:
+                estado = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"No se pudo leer el estado del vigilante {self.ruta_estado}: {e}")
+            return
+        if isinstance(estado.get("procesados"), dict):
+            self._procesados = estado["procesados"]
+            self._fallos = estado.get("fallos") or {}
+        else:
+            # Formato anterior: sólo ruta -> registro procesado
+            self._procesados = estado
+
+    def _guardar_estado(self) -> None:
+        if not self.ruta_estado:
+            return
+        directorio = os.path.dirname(self.ruta_estado)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        ruta_temporal = f"{self.ruta_estado}.tmp"
+        with open(ruta_temporal, "w", encoding="utf-8") as f:
+            json.dump({"procesados": self._procesados, "fallos": self._fallos}, f, indent=2)
+        os.replace(ruta_temporal, self.ruta_estado)
+
+    def _extractos_actuales(self) -> Dict[str, Tuple[ClaveExtracto, int, int]]:
+        extractos = {}
+        for tipo_cuenta in self.tipos_cuenta:
+            carpeta = os.path.join(self.directorio_pagos, tipo_cuenta)
+            if not os.path.isdir(carpeta):
+                continue
+            for entrada in os.scandir(carpeta):
+                match = _PATRON_EXTRACTO.match(entrada.name)
+                if not match or not entrada.is_file():
+                    continue
+                stat = entrada.stat()
+                extractos[entrada.path] = ((match.group(1), tipo_cuenta), stat.st_mtime_ns, stat.st_size)
+        return extractos
+
+    def escanear(self) -> List[ClaveExtracto]:
+        """
+        Devuelve los (fecha, tipo_cuenta) con extractos nuevos o modificados y estables desde
+        la última revisión, ordenados por fecha. No los marca como procesados.
+        """
+        cambios: Set[ClaveExtracto] = set()
+        extractos = self._extractos_actuales()
+        ahora = time.time()
+        for ruta, (clave, mtime, tamano) in extractos.items():
+            registro = self._procesados.get(ruta)
+            if registro and (registro["mtime"], registro["tamano"]) == (mtime, tamano):
+                continue
+
+            # Esperar a que el archivo deje de cambiar antes de leerlo
+            if self._observados.get(ruta) != (mtime, tamano):
+                self._observados[ruta] = (mtime, tamano)
+                continue
+
+            fallo = self._fallos.get(ruta)
+            if fallo and (fallo["mtime"], fallo["tamano"]) == (mtime, tamano):
+                hash_actual = fallo["hash"]  # Sin cambios desde el fallo: no se vuelve a leer
+            else:
+                hash_actual = _hash_archivo(ruta)
+            if registro and registro["hash"] == hash_actual:
+                # Mismo contenido con otro mtime: sólo se actualiza el registro
+                registro.update(mtime=mtime, tamano=tamano)
+                self._fallos.pop(ruta, None)
+                self._guardar_estado()
+                continue
+            if fallo and fallo["hash"] == hash_actual:
+                if fallo["intentos"] >= self.max_intentos or ahora < fallo["reintentar_en"]:
+                    continue
+            elif fallo:
+                # Contenido nuevo: los fallos del anterior no cuentan
+                del self._fallos[ruta]
+                self._guardar_estado()
+            cambios.add(clave)
+
+        self._observados = {ruta: obs for ruta, obs in self._observados.items() if ruta in extractos}
+        return sorted(cambios)
+
+    def marcar_procesado(self, fecha: str, tipo_cuenta: str) -> None:
+        """Registra el estado actual de los archivos del extracto (fecha, tipo_cuenta) como procesados."""
+        for ruta, (clave, mtime, tamano) in self._extractos_actuales().items():
+            if clave != (fecha, tipo_cuenta):
+                continue
+            self._procesados[ruta] = {
+                "mtime": mtime,
+                "tamano": tamano,
+                "hash": _hash_archivo(ruta),
+            }
+            self._fallos.pop(ruta, None)
+            self._observados.pop(ruta, None)
+        self._guardar_estado()
+
+    def registrar_fallo(self, fecha: str, tipo_cuenta: str) -> bool:
+        """
+        Registra un fallo al procesar el extracto (fecha, tipo_cuenta) con su contenido actual.
+        Devuelve True si se volverá a intentar (tras la espera) o False si se agotaron los
+        intentos y el extracto queda en espera de un contenido nuevo.
+        """
+        se_reintentara = False
+        for ruta, (clave, mtime, tamano) in self._extractos_actuales().items():
+            if clave != (fecha, tipo_cuenta):
+                continue
+            hash_actual = _hash_archivo(ruta)
+            fallo = self._fallos.get(ruta)
+            intentos = fallo["intentos"] + 1 if fallo and fallo["hash"] == hash_actual else 1
+            self._fallos[ruta] = {
+                "mtime": mtime,
+                "tamano": tamano,
+                "hash": hash_actual,
+                "intentos": intentos,
+                "reintentar_en": time.time() + self.espera_reintento_s * 2 ** (intentos - 1),
+            }
+            se_reintentara = se_reintentara or intentos < self.max_intentos
+        self._guardar_estado()
+        return se_reintentara
+
+    @property
+    def tiene_estado_previo(self) -> bool:
+        """Indica si ya hay extractos registrados (de esta sesión o de una anterior)."""
+        return bool(self._procesados)
+
+    def establecer_linea_base(self) -> None:
+        """Marca todos los extractos existentes como procesados, sin procesarlos."""
+        for ruta, (_, mtime, tamano) in self._extractos_actuales().items():
+            if ruta not in self._procesados:
+                self._procesados[ruta] = {"mtime": mtime, "tamano": tamano, "hash": _hash_archivo(ruta)}
+        self._guardar_estado()
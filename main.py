@@ -1,13 +1,74 @@
 # main.py
 
+import argparse
+import time
+import traceback
 from annotated_types import T
+from dependency_injector import providers
 from config.app_config import config as app_config
 from di.container import Container
 from domain.models.models import TipoCuentaBancaria
+from infrastructure.repositories.repositorio_pedidos_en_cache import RepositorioPedidosEnCache
+from infrastructure.watchers.vigilante_directorio_pagos import VigilanteDirectorioPagos
 from print_logger import setup_logger, PrintLogger
 import sys
 
 
+def _configurar_contenedor(container: Container) -> None:
+    # Configure the container with values from app_config
+    container.config.ruta_archivo_cartera.from_value(
+        app_config.ruta_archivo_cartera)
+    container.config.directorio_pagos.from_value(app_config.directorio_pagos)
+    container.config.modo_consulta_pedidos.from_value(
+        app_config.modo_consulta_pedidos)
+    container.config.tamano_fragmento_pedidos.from_value(
+        app_config.tamano_fragmento_pedidos)
+    container.config.validacion_pedidos.from_value(
+        app_config.validacion_pedidos)
+    container.config.clave_fecha_ordenable_pedidos.from_value(
+        app_config.clave_fecha_ordenable_pedidos)
+    container.config.ruta_snapshot_pedidos.from_value(
+        app_config.ruta_snapshot_pedidos)
+    container.config.clave_actualizacion_pedidos.from_value(
+        app_config.clave_actualizacion_pedidos)
+    container.config.max_edad_snapshot_pedidos.from_value(
+        app_config.max_edad_snapshot_pedidos)
+    container.config.segundos_vigencia_indice_nit.from_value(
+        app_config.segundos_vigencia_indice_nit)
+    container.config.materializacion_perezosa_pedidos.from_value(
+        app_config.materializacion_perezosa_pedidos)
+    container.config.consulta_pedidos_por_nit.from_value(
+        app_config.consulta_pedidos_por_nit)
+    container.config.hilos_consulta_pedidos.from_value(
+        app_config.hilos_consulta_pedidos)
+    container.config.firebase_database_url.from_value(
+        app_config.firebase_database_url)
+    container.config.backend_pedidos.from_value(app_config.backend_pedidos)
+    container.config.max_conexiones_rest_pedidos.from_value(
+        app_config.max_conexiones_rest_pedidos)
+    container.config.reintentos_rest_pedidos.from_value(
+        app_config.reintentos_rest_pedidos)
+    container.config.solapar_descarga_pedidos.from_value(
+        app_config.solapar_descarga_pedidos)
+    container.config.directorio_cache_extractos.from_value(
+        app_config.directorio_cache_extractos)
+    container.config.tamano_maximo_cache_extractos.from_value(
+        app_config.tamano_maximo_cache_extractos)
+    container.config.directorio_cache_cartera.from_value(
+        app_config.directorio_cache_cartera)
+    container.config.encoding_cartera.from_value(
+        app_config.encoding_cartera)
+    container.config.separador_decimal_extracto.from_value(
+        app_config.separador_decimal_extracto)
+    container.config.ruta_indice_referencias.from_value(
+        app_config.ruta_indice_referencias)
+    container.config.procesos_paginas_pdf.from_value(
+        app_config.procesos_paginas_pdf)
+    container.config.directorio_reportes.from_value(
+        app_config.directorio_reportes
+    )
+
+
 def main(fecha: str):
 
     # Set up the logger
@@ -22,13 +83,7 @@ def main(fecha: str):
     app_config.initialize_firebase()
 
     container = Container()
-    # Configure the container with values from app_config
-    container.config.ruta_archivo_cartera.from_value(
-        app_config.ruta_archivo_cartera)
-    container.config.directorio_pagos.from_value(app_config.directorio_pagos)
-    container.config.directorio_reportes.from_value(
-        app_config.directorio_reportes
-    )
+    _configurar_contenedor(container)
 
     container.config.fecha_pdf.from_value(fecha)
 
@@ -38,16 +93,16 @@ def main(fecha: str):
     caso_uso = container.emparejador_pagos()
     # Execute the use case
     try:
-        print(f"\n\nEjecutando para Ahorros - Fecha: {fecha}")
-        caso_uso.ejecutar(fecha, tipo_cuenta=TipoCuentaBancaria.AHORROS.value)
-        print(f"\n\nEjecutando para Corriente - Fecha: {fecha}")
-        caso_uso.ejecutar(
-            fecha, tipo_cuenta=TipoCuentaBancaria.CORRIENTE.value)
+        # Una sola descarga de pedidos y una sola lectura de la cartera para ambas cuentas
+        print(f"\n\nEjecutando para Ahorros y Corriente - Fecha: {fecha}")
+        caso_uso.ejecutar_todas(
+            fecha,
+            tipos_cuenta=[TipoCuentaBancaria.AHORROS.value, TipoCuentaBancaria.CORRIENTE.value],
+        )
         print("Ejecución completada.")
     except Exception as e:
         print(f"Error durante la ejecución del caso de uso: {e}")
         # Add more specific error handling or logging if needed
-        import traceback
         traceback.print_exc()
         raise
 
@@ -55,5 +110,79 @@ def main(fecha: str):
     container.unwire()
 
 
+def vigilar(procesar_existentes: bool = False, max_iteraciones: int = None):
+    """
+    Modo vigilancia: revisa periódicamente el directorio de pagos y ejecuta el caso de uso
+    sólo para los (fecha, tipo_cuenta) con extractos nuevos o modificados.
+
+    Los pedidos y la cartera se mantienen cargados en memoria entre eventos
+    (config.segundos_vigencia_pedidos), así que cada extracto nuevo se procesa sin volver
+    a descargar Firebase ni leer el CSV de cartera.
+
+    Args:
+        procesar_existentes: Si es False y no hay estado previo, los extractos ya presentes
+            al iniciar se toman como línea base y no se procesan.
+        max_iteraciones: Número de revisiones antes de terminar (None = indefinidamente).
+    """
+    logger = setup_logger()
+    sys.stdout = PrintLogger(logger)
+    app_config.initialize_firebase()
+
+    container = Container()
+    _configurar_contenedor(container)
+
+    # Un único repositorio en caché para todos los eventos
+    repositorio_en_cache = RepositorioPedidosEnCache(
+        container.repositorio_pedidos,
+        segundos_vigencia=app_config.segundos_vigencia_pedidos,
+    )
+    container.emparejador_pagos.add_kwargs(repositorio_pedidos=providers.Object(repositorio_en_cache))
+
+    vigilante = VigilanteDirectorioPagos(
+        app_config.directorio_pagos,
+        ruta_estado=app_config.ruta_estado_vigilante,
+        max_intentos=app_config.max_intentos_extracto,
+        espera_reintento_s=app_config.segundos_espera_reintento_extracto,
+    )
+    if not procesar_existentes and not vigilante.tiene_estado_previo:
+        vigilante.establecer_linea_base()
+
+    print(f"Vigilando {app_config.directorio_pagos} cada {app_config.intervalo_vigilancia_segundos} s")
+    iteracion = 0
+    try:
+        while max_iteraciones is None or iteracion < max_iteraciones:
+            iteracion += 1
+            for fecha, tipo_cuenta in vigilante.escanear():
+                print(f"\n\nExtracto nuevo: {tipo_cuenta} - Fecha: {fecha}")
+                container.config.fecha_pdf.from_value(fecha)
+                try:
+                    container.emparejador_pagos().ejecutar(fecha, tipo_cuenta=tipo_cuenta)
+                except Exception as e:
+                    # Queda pendiente: se reintenta con espera creciente hasta max_intentos
+                    if vigilante.registrar_fallo(fecha, tipo_cuenta):
+                        print(f"Error procesando {tipo_cuenta}/{fecha}: {e}. Se reintentará.")
+                    else:
+                        print(
+                            f"Error procesando {tipo_cuenta}/{fecha}: {e}. Se agotaron los intentos; "
+                            "no se reintentará hasta que el extracto cambie."
+                        )
+                    traceback.print_exc()
+                else:
+                    vigilante.marcar_procesado(fecha, tipo_cuenta)
+                    print(f"Extracto {tipo_cuenta}/{fecha} procesado.")
+            time.sleep(app_config.intervalo_vigilancia_segundos)
+    except KeyboardInterrupt:
+        print("Vigilancia detenida.")
+
+
 if __name__ == "__main__":
-    main("20250410")
+    parser = argparse.ArgumentParser(description="Empareja los pagos de los extractos con los pedidos a crédito.")
+    parser.add_argument("fecha", nargs="?", default="20250410", help="Fecha del extracto YYYYMMDD")
+    parser.add_argument("--vigilar", action="store_true", help="Procesar automáticamente los extractos nuevos")
+    parser.add_argument("--procesar-existentes", action="store_true", help="Con --vigilar, procesar también los extractos ya presentes")
+    args = parser.parse_args()
+
+    if args.vigilar:
+        vigilar(procesar_existentes=args.procesar_existentes)
+    else:
+        main(args.fecha)
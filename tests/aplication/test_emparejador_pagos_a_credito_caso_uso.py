@@ -17,6 +17,10 @@ from domain.models.models import (
 )
 
 from application.emparejador_pagos_a_credito_caso_uso import EmparejadorPagosACreditoCasoUso
+from domain.services.aplicador_de_pagos import AplicadorDePagos
+from domain.services.indice_nit import calcular_digito_verificacion
+from infrastructure.extractors.extractor_pago_tabular import ExtractorPagosTabular
+from infrastructure.extractors.resolutor_referencias import ResolutorReferencias
 from infrastructure.repositories.firebase_repositorio_pedidos import FirebaseRepositorioPedidos
 
 
@@ -225,3 +229,262 @@ def test_integracion_emparejador_pagos_a_credito(container):
     assert resultado.deuda_restante == Decimal("0.00")
     assert len(resultado.facturas_pagadas) == 2
     assert len(resultado.facturas_pendientes) == 0
+
+
+def test_ejecutar_empareja_pago_con_digito_de_verificacion(pedidos_ejemplo):
+    # 12345 + DV (8) tal como llega en la referencia bancaria
+    pago_con_dv = Pago(
+        id_pago="p2",
+        nit_cliente="0123458",
+        cuenta_ingreso_banco="",
+        cuenta_egreso_banco="",
+        monto=Decimal("300.00"),
+        fecha_pago=date(2025, 3, 30),
+    )
+    extractor_mock = MagicMock()
+    extractor_mock.obtener_pagos.return_value = [pago_con_dv]
+    repositorio_mock = MagicMock()
+    repositorio_mock.obtener_pedidos_credito.return_value = pedidos_ejemplo
+    aplicador_de_pagos_mock = MagicMock()
+
+    caso_uso = EmparejadorPagosACreditoCasoUso(
+        extractor_pagos=extractor_mock,
+        repositorio_pedidos=repositorio_mock,
+        generador_reporte=MagicMock(),
+        aplicador_pagos=aplicador_de_pagos_mock,
+    )
+    caso_uso.ejecutar(fecha_pago=date(2025, 3, 30), tipo_cuenta="ahorros")
+
+    pedidos, cliente, pago = aplicador_de_pagos_mock.aplicar_pago_a_pedidos_cliente.call_args[0]
+    assert cliente.nit_cliente == "12345"
+    assert pago.nit_cliente == "12345"
+    assert pago.id_pago == "p2"
+    assert pedidos == pedidos_ejemplo
+
+
+def test_materializacion_perezosa_pide_solo_los_nit_de_los_pagos(pedidos_ejemplo):
+    pago_con_dv = Pago(
+        id_pago="p3",
+        nit_cliente="0123458",
+        cuenta_ingreso_banco="",
+        cuenta_egreso_banco="",
+        monto=Decimal("300.00"),
+        fecha_pago=date(2025, 3, 30),
+    )
+    extractor_mock = MagicMock()
+    extractor_mock.obtener_pagos.return_value = [pago_con_dv]
+    repositorio_mock = MagicMock()
+    repositorio_mock.obtener_pedidos_credito_para_nits.return_value = pedidos_ejemplo
+    aplicador_de_pagos_mock = MagicMock()
+
+    caso_uso = EmparejadorPagosACreditoCasoUso(
+        extractor_pagos=extractor_mock,
+        repositorio_pedidos=repositorio_mock,
+        generador_reporte=MagicMock(),
+        aplicador_pagos=aplicador_de_pagos_mock,
+        materializacion_perezosa=True,
+    )
+    caso_uso.ejecutar(fecha_pago=date(2025, 3, 30), tipo_cuenta="ahorros")
+
+    repositorio_mock.obtener_pedidos_credito.assert_not_called()
+    assert repositorio_mock.obtener_pedidos_credito_para_nits.call_args[0][0] == {"123458", "12345"}
+    pedidos, cliente, pago = aplicador_de_pagos_mock.aplicar_pago_a_pedidos_cliente.call_args[0]
+    assert cliente.nit_cliente == "12345"
+    assert pedidos == pedidos_ejemplo
+
+
+def test_flujo_por_nit_pagadores_equivale_al_completo():
+    from benchmarks.generador_pedidos import generar_pedidos_crudos
+    from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+
+    referencia = ReferenciaEnMemoria(
+        {"pedidos": generar_pedidos_crudos(300, numero_clientes=30, dias_historia=60, semilla=11)}
+    ).child("pedidos")
+    nits = sorted({d["nit"] for d in referencia.get().values()})[:5]
+    pagos = [
+        Pago(nit_cliente=nit, cuenta_ingreso_banco="", cuenta_egreso_banco="",
+             monto=Decimal("100000.00"), fecha_pago=date(2025, 3, 30))
+        for nit in nits
+    ]
+
+    def aplicar(repositorio, **opciones):
+        extractor_mock = MagicMock()
+        extractor_mock.obtener_pagos.return_value = pagos
+        aplicador_mock = MagicMock()
+        EmparejadorPagosACreditoCasoUso(
+            extractor_pagos=extractor_mock,
+            repositorio_pedidos=repositorio,
+            generador_reporte=MagicMock(),
+            aplicador_pagos=aplicador_mock,
+            **opciones,
+        ).ejecutar(fecha_pago=date(2025, 3, 30), tipo_cuenta="ahorros")
+        return [
+            (cliente.nit_cliente, sorted(p.id_pedido for p in pedidos))
+            for pedidos, cliente, _ in (c[0] for c in aplicador_mock.aplicar_pago_a_pedidos_cliente.call_args_list)
+        ]
+
+    completo = aplicar(FirebaseRepositorioPedidos(firebase_reference=referencia))
+    por_nit = aplicar(
+        FirebaseRepositorioPedidos(firebase_reference=referencia, consulta_por_nit=True),
+        materializacion_perezosa=True,
+    )
+
+    assert completo and por_nit == completo
+
+
+def test_solapar_descarga_pedidos_descarga_mientras_extrae():
+    import threading
+
+    extraccion_en_curso = threading.Event()
+    descarga_en_curso = threading.Event()
+
+    def obtener_pagos(fecha, tipo_cuenta):
+        extraccion_en_curso.set()
+        # Sólo termina si la descarga corre al mismo tiempo
+        assert descarga_en_curso.wait(timeout=5)
+        return []
+
+    def obtener_pedidos_credito():
+        descarga_en_curso.set()
+        assert extraccion_en_curso.wait(timeout=5)
+        return []
+
+    extractor_mock = MagicMock()
+    extractor_mock.obtener_pagos.side_effect = obtener_pagos
+    repositorio_mock = MagicMock(spec=FirebaseRepositorioPedidos)
+    repositorio_mock.obtener_pedidos_credito.side_effect = obtener_pedidos_credito
+
+    EmparejadorPagosACreditoCasoUso(
+        extractor_pagos=extractor_mock,
+        repositorio_pedidos=repositorio_mock,
+        generador_reporte=MagicMock(),
+        aplicador_pagos=MagicMock(),
+        solapar_descarga_pedidos=True,
+    ).ejecutar(fecha_pago=date(2025, 3, 30), tipo_cuenta="ahorros")
+
+    repositorio_mock.obtener_pedidos_credito.assert_called_once()
+
+
+def test_ejecutar_todas_obtiene_los_pedidos_una_vez_para_todas_las_cuentas(pagos_ejemplo, pedidos_ejemplo):
+    extractor_mock = MagicMock()
+    extractor_mock.obtener_pagos.return_value = pagos_ejemplo
+    repositorio_mock = MagicMock(spec=FirebaseRepositorioPedidos)
+    repositorio_mock.obtener_pedidos_credito.return_value = pedidos_ejemplo
+    generador_mock = MagicMock()
+    cobrado_al_aplicar = []
+
+    def aplicar(pedidos, cliente, pago):
+        # Como AplicadorDePagos, modifica los pedidos en sitio
+        cobrado_al_aplicar.append([p.valor_cobrado for p in pedidos])
+        for pedido in pedidos:
+            pedido.valor_cobrado = pedido.valor_neto
+        return MagicMock()
+
+    aplicador_mock = MagicMock()
+    aplicador_mock.aplicar_pago_a_pedidos_cliente.side_effect = aplicar
+
+    EmparejadorPagosACreditoCasoUso(
+        extractor_pagos=extractor_mock,
+        repositorio_pedidos=repositorio_mock,
+        generador_reporte=generador_mock,
+        aplicador_pagos=aplicador_mock,
+    ).ejecutar_todas(fecha_pago=date(2025, 3, 30), tipos_cuenta=["Ahorros", "corriente"])
+
+    repositorio_mock.obtener_pedidos_credito.assert_called_once()
+    assert [c.args[1] for c in extractor_mock.obtener_pagos.call_args_list] == ["ahorros", "corriente"]
+    assert [c.args[1] for c in generador_mock.generar.call_args_list] == ["ahorros", "corriente"]
+    # La segunda pasada no ve los abonos aplicados en memoria por la primera
+    assert cobrado_al_aplicar == [[Decimal("0.00")] * 2, [Decimal("0.00")] * 2]
+
+
+def test_ejecutar_todas_con_materializacion_perezosa_une_los_nit_de_todas_las_cuentas(pedidos_ejemplo):
+    def pago(nit):
+        return Pago(nit_cliente=nit, cuenta_ingreso_banco="", cuenta_egreso_banco="",
+                    monto=Decimal("100.00"), fecha_pago=date(2025, 3, 30))
+
+    extractor_mock = MagicMock()
+    extractor_mock.obtener_pagos.side_effect = lambda fecha, tipo_cuenta: {
+        "ahorros": [pago("12345")], "corriente": [pago("777")],
+    }[tipo_cuenta]
+    repositorio_mock = MagicMock()
+    repositorio_mock.obtener_pedidos_credito_para_nits.return_value = pedidos_ejemplo
+
+    caso_uso = EmparejadorPagosACreditoCasoUso(
+        extractor_pagos=extractor_mock,
+        repositorio_pedidos=repositorio_mock,
+        generador_reporte=MagicMock(),
+        aplicador_pagos=MagicMock(),
+        materializacion_perezosa=True,
+    )
+    caso_uso.ejecutar_todas(fecha_pago=date(2025, 3, 30))
+
+    repositorio_mock.obtener_pedidos_credito_para_nits.assert_called_once()
+    assert {"12345", "777"} <= repositorio_mock.obtener_pedidos_credito_para_nits.call_args[0][0]
+    with pytest.raises(ValueError):
+        caso_uso.ejecutar_todas(fecha_pago=date(2025, 3, 30), tipos_cuenta=["nomina"])
+
+
+def test_ejecutar_todas_sin_extracto_de_una_cuenta_procesa_las_demas(pagos_ejemplo, pedidos_ejemplo):
+    def obtener_pagos(fecha, tipo_cuenta):
+        if tipo_cuenta == "corriente":
+            raise FileNotFoundError("No hay extracto de corriente")
+        return pagos_ejemplo
+
+    extractor_mock = MagicMock()
+    extractor_mock.obtener_pagos.side_effect = obtener_pagos
+    repositorio_mock = MagicMock(spec=FirebaseRepositorioPedidos)
+    repositorio_mock.obtener_pedidos_credito.return_value = pedidos_ejemplo
+    generador_mock = MagicMock()
+
+    caso_uso = EmparejadorPagosACreditoCasoUso(
+        extractor_pagos=extractor_mock,
+        repositorio_pedidos=repositorio_mock,
+        generador_reporte=generador_mock,
+        aplicador_pagos=MagicMock(),
+    )
+    caso_uso.ejecutar_todas(fecha_pago=date(2025, 3, 30), tipos_cuenta=["corriente", "ahorros"])
+
+    repositorio_mock.obtener_pedidos_credito.assert_called_once()
+    assert generador_mock.generar.call_count > 0
+    assert {c.args[1] for c in generador_mock.generar.call_args_list} == {"ahorros"}
+
+    # Si no se pudo extraer ninguna cuenta, el error se propaga
+    with pytest.raises(FileNotFoundError):
+        caso_uso.ejecutar_todas(fecha_pago=date(2025, 3, 30), tipos_cuenta=["corriente"])
+
+
+@pytest.mark.parametrize("materializacion_perezosa", [False, True])
+def test_referencia_con_ceros_del_extracto_se_empareja_con_el_nit(
+    tmp_path, pedidos_ejemplo, materializacion_perezosa
+):
+    # Extracto real -> extractor -> caso de uso, con la referencia como NIT+DV con ceros
+    referencia = "00" + "12345" + str(calcular_digito_verificacion("12345"))
+    (tmp_path / "ahorros").mkdir()
+    (tmp_path / "ahorros" / "20250330.csv").write_text(
+        "FECHA;DESCRIPCION;REFERENCIA 1;VALOR\n"
+        f"2025/03/30;PAGO PSE;{referencia};800.00\n",
+        encoding="utf-8",
+    )
+    resolutor = ResolutorReferencias(ruta_indice=None, nits_conocidos=lambda: ["12345", "67890"])
+    resolutor._mapeo = {}
+    resolutor._proxima_revision = float("inf")
+
+    repositorio_mock = MagicMock(spec=FirebaseRepositorioPedidos)
+    repositorio_mock.obtener_pedidos_credito.return_value = pedidos_ejemplo
+    repositorio_mock.obtener_pedidos_credito_para_nits.return_value = pedidos_ejemplo
+    generador_mock = MagicMock()
+
+    caso_uso = EmparejadorPagosACreditoCasoUso(
+        extractor_pagos=ExtractorPagosTabular(str(tmp_path), resolutor=resolutor),
+        repositorio_pedidos=repositorio_mock,
+        generador_reporte=generador_mock,
+        aplicador_pagos=AplicadorDePagos(),
+        materializacion_perezosa=materializacion_perezosa,
+    )
+    # main.py pasa la fecha del extracto como texto YYYYMMDD
+    caso_uso.ejecutar(fecha_pago="20250330", tipo_cuenta="ahorros")
+
+    generador_mock.generar.assert_called_once()
+    resultado: ResultadoPagoCliente = generador_mock.generar.call_args[0][0]
+    assert resultado.nit_cliente == "12345"
+    assert resultado.pago_extracto == Decimal("800.00")
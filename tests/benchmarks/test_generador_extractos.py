@@ -0,0 +1,38 @@
+# tests\benchmarks\test_generador_extractos.py
+
+import io
+
+from pypdf import PdfReader
+
+from benchmarks.generador_extractos import generar_extracto_pdf, generar_textos_extracto
+from infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia import (
+    ExtractorDePagosPorNitBancolombia,
+    iterar_filas_por_pagina,
+)
+from infrastructure.extractors.resolutor_referencias import ResolutorReferencias
+
+
+def test_textos_generados_respetan_el_formato_del_parser():
+    textos = generar_textos_extracto(paginas=3, filas_por_pagina=25, semilla=7)
+
+    assert len(textos) == 3
+    assert len(list(iterar_filas_por_pagina(textos))) == 75
+    assert textos == generar_textos_extracto(paginas=3, filas_por_pagina=25, semilla=7)
+
+
+def test_pdf_generado_se_extrae_completo(tmp_path):
+    ruta = tmp_path / "corriente" / "20250401.pdf"
+    filas = generar_extracto_pdf(str(ruta), paginas=4, filas_por_pagina=30)
+
+    reader = PdfReader(io.BytesIO(ruta.read_bytes()))
+    assert len(reader.pages) == 4
+    assert len(list(iterar_filas_por_pagina(page.extract_text() for page in reader.pages))) == filas
+
+    resolutor = ResolutorReferencias(ruta_indice=None)
+    resolutor._mapeo = {}
+    resolutor._proxima_revision = float("inf")
+    extractor = ExtractorDePagosPorNitBancolombia(directorio_bancolombia_data=str(tmp_path), resolutor=resolutor)
+    tabla = extractor.extract_transacciones("20250401", "corriente")
+    # Los débitos y los abonos de intereses (referencia "0") se descartan
+    assert 0 < len(tabla) < filas
+    assert (tabla.montos_centavos > 0).all()
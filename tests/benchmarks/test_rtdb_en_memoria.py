@@ -0,0 +1,49 @@
+# tests\benchmarks\test_rtdb_en_memoria.py
+
+import pytest
+
+from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+
+
+@pytest.fixture
+def referencia():
+    return ReferenciaEnMemoria({
+        "pedidos": {
+            "b": {"estado": 2, "fecha": "2025-04-10 10:00"},
+            "a": {"estado": 5, "fecha": "2025-01-01 08:00"},
+            "10": {"estado": 2},
+            "9": {"estado": "2", "fecha": "2025-04-11 09:00"},
+            "c": {"estado": 3, "fecha": "2024-12-31 23:59"},
+        }
+    }).child("pedidos")
+
+
+def test_order_by_child_equal_to_compara_tipos(referencia):
+    # El número 2 y la cadena "2" son valores distintos; los empates se ordenan por llave
+    assert list(referencia.order_by_child("estado").equal_to(2).get()) == ["10", "b"]
+
+
+def test_order_by_child_rango_excluye_hijos_sin_clave(referencia):
+    resultado = referencia.order_by_child("fecha").start_at("2025-01-01").end_at("2025-04-10").get()
+    assert list(resultado) == ["a", "b"]
+
+
+def test_order_by_key_enteros_primero_y_limites(referencia):
+    assert list(referencia.order_by_key().get()) == ["9", "10", "a", "b", "c"]
+    assert list(referencia.order_by_key().start_at("a").limit_to_first(2).get()) == ["a", "b"]
+    assert list(referencia.order_by_key().limit_to_last(1).get()) == ["c"]
+
+
+def test_get_devuelve_copias_y_cuenta_lecturas(referencia):
+    datos = referencia.get()
+    datos["b"]["estado"] = 99
+    assert referencia.child("b/estado").get() == 2
+    assert referencia.get(shallow=True) == {"b": True, "a": True, "10": True, "9": True, "c": True}
+    assert referencia.estadisticas.lecturas == 3
+
+
+def test_set_y_update(referencia):
+    referencia.child("d").set({"estado": 2})
+    referencia.update({"d/fecha": "2025-05-01 00:00", "e": {"estado": 1}})
+    assert referencia.child("d").get() == {"estado": 2, "fecha": "2025-05-01 00:00"}
+    assert referencia.child("e/estado").get() == 1
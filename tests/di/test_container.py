@@ -5,6 +5,7 @@ import pytest
 from di.container import Container
 from application.emparejador_pagos_a_credito_caso_uso import EmparejadorPagosACreditoCasoUso
 from infrastructure.extractors.extractor_pago_pdf import ExtractorPagosPDF
+from infrastructure.extractors.extractor_pago_tabular import ExtractorPagosTabular
 from infrastructure.report_generators.generador_reporte_txt import GeneradorReporteTxt
 from infrastructure.repositories.firebase_repositorio_pedidos import (
     FirebaseRepositorioPedidos,
@@ -44,6 +45,15 @@ def test_extractor_pagos(container):
     assert isinstance(extractor_pagos, ExtractorPagosPDF)
 
 
+def test_extractor_pagos_tabular_si_existe_exportacion(container, tmp_path):
+    (tmp_path / "ahorros").mkdir()
+    (tmp_path / "ahorros" / "20230401.csv").write_text("FECHA,REFERENCIA 1,VALOR\n")
+    container.config.directorio_pagos.from_value(str(tmp_path))
+
+    extractor_pagos = container.extractor_pagos()
+    assert isinstance(extractor_pagos, ExtractorPagosTabular)
+
+
 def test_generador_reporte(container):
     generador_reporte = container.generador_reporte()
     assert isinstance(generador_reporte, GeneradorReporteTxt)
@@ -78,3 +88,17 @@ def test_obtener_pedidos_credito(container):
     assert len(pedidos) == 2
     assert pedidos[0]["nit"] == "12345"
     assert pedidos[1]["valor_neto"] == 2000
+
+
+def test_backend_rest_de_pedidos():
+    from infrastructure.repositories.firebase_rest_repositorio_pedidos import FirebaseRestRepositorioPedidos
+
+    container = Container()
+    container.config.override(
+        {"backend_pedidos": "rest", "firebase_database_url": "http://127.0.0.1:9", "max_conexiones_rest_pedidos": 4}
+    )
+
+    repositorio = container.repositorio_pedidos_origen()
+
+    assert isinstance(repositorio, FirebaseRestRepositorioPedidos)
+    assert repositorio.hilos_consulta == 4
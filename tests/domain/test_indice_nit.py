@@ -0,0 +1,54 @@
+# tests\domain\test_indice_nit.py
+
+import pytest
+
+from domain.services.indice_nit import (
+    IndiceNit,
+    calcular_digito_verificacion,
+    normalizar_nit,
+)
+
+
+@pytest.mark.parametrize(
+    "nit, digito",
+    [("830500960", 2), ("901113155", 7), ("901608075", 1), ("901373206", 9)],
+)
+def test_calcular_digito_verificacion(nit, digito):
+    assert calcular_digito_verificacion(nit) == digito
+
+
+def test_normalizar_nit():
+    assert normalizar_nit(" 000830.500.960-2 ") == "8305009602"
+
+
+@pytest.fixture
+def indice():
+    return IndiceNit(["830500960", "901113155", "12345"])
+
+
+@pytest.mark.parametrize(
+    "referencia, esperado",
+    [
+        ("830500960", "830500960"),
+        ("8305009602", "830500960"),
+        ("008305009602", "830500960"),
+        ("00830500960", "830500960"),
+        ("9011131557", "901113155"),
+        ("8305009603", None),  # DV incorrecto
+        ("999", None),
+    ],
+)
+def test_resolver_variantes(indice, referencia, esperado):
+    assert indice.resolver(referencia) == esperado
+
+
+def test_nit_canonico_tiene_prioridad_sobre_variante_con_dv():
+    # "8305009602" es a la vez un NIT conocido y la variante NIT+DV de "830500960"
+    indice = IndiceNit(["830500960", "8305009602"])
+    assert indice.resolver("8305009602") == "8305009602"
+    assert indice.resolver("830500960") == "830500960"
+
+
+def test_candidatos():
+    assert IndiceNit.candidatos("008305009602") == ["8305009602", "830500960"]
+    assert IndiceNit.candidatos("8305009603") == ["8305009603"]
@@ -362,3 +362,41 @@ def test_pedido_model_invalid_data():
             fecha_pedido="2023-01-01",  # Invalid type, should be date
             forma_pago_raw="A 30 días"
         )
+
+
+def _campos_pedido(i):
+    return dict(
+        id_pedido=f"P{i}",
+        estado_pedido=EstadoPedido.DESPACHADO,
+        nit_cliente="900123456",
+        plazo_dias_credito=30,
+        valor_neto=Decimal("1000.50"),
+        fecha_pedido=date(2025, 1, 1) + timedelta(days=i),
+        razon_social="Empresa S.A.",
+    )
+
+
+def test_pedido_validar_lote_equivale_a_validar_uno_a_uno():
+    from pydantic import ValidationError
+
+    lista_campos = [_campos_pedido(i) for i in range(3)]
+    assert Pedido.validar_lote(lista_campos) == [Pedido(**campos) for campos in lista_campos]
+
+    lista_campos[1]["nit_cliente"] = 900123456  # strict: no se convierte a str
+    with pytest.raises(ValidationError) as error:
+        Pedido.validar_lote(lista_campos)
+    assert error.value.errors()[0]["loc"][0] == 1
+
+
+def test_pedido_construir_confiable_equivale_al_validado():
+    validado = Pedido(**_campos_pedido(0))
+    confiable = Pedido.construir_confiable(_campos_pedido(0))
+    otro = Pedido.construir_confiable(_campos_pedido(1))
+
+    assert confiable == validado
+    assert repr(confiable) == repr(validado)
+    assert confiable.model_fields_set == validado.model_fields_set
+    confiable.fechas_abono.append(date(2025, 2, 1))
+    assert otro.fechas_abono == []  # Cada pedido tiene su propia lista
+    confiable.plazo_dias_credito = 0
+    assert confiable.factura_vencida  # __setattr__ sigue recalculando el vencimiento
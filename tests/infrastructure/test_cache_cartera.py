@@ -0,0 +1,123 @@
+# tests\infrastructure\test_cache_cartera.py
+
+import os
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from infrastructure.repositories import cache_cartera
+from infrastructure.repositories.cache_cartera import CacheCartera, crear_cache_cartera
+from infrastructure.repositories.firebase_repositorio_pedidos import FirebaseRepositorioPedidos
+from infrastructure.repositories.r1108_repositorio_cartera import RepositorioCartera
+
+
+@pytest.fixture
+def ruta_csv(tmp_path):
+    csv_file = tmp_path / "cartera.csv"
+    csv_file.write_text(
+        "nit,Número,Razón Social,Valor,Aplicado,Saldo,Fecha\n"
+        "123.456.789,001,ACME,\"1,000.00\",500.00,500.00,2025-02-27 00:00:00\n"
+        "987654321,002,,2000.00,2000.00,0,2023-03-14 00:00:00\n"
+        "555555555,004,OTRO,300.00,0,300.00,\n"
+    )
+    return str(csv_file)
+
+
+def _cargar(ruta_csv, cache):
+    return RepositorioCartera(MagicMock(spec=FirebaseRepositorioPedidos), ruta_csv, cache=cache).df
+
+
+def test_segunda_carga_sale_de_la_cache_sin_leer_el_csv(ruta_csv, tmp_path):
+    cache = CacheCartera(str(tmp_path / "cache"))
+    preparado = _cargar(ruta_csv, cache)
+
+    with patch("infrastructure.repositories.r1108_repositorio_cartera.pd.read_csv") as read_csv:
+        desde_cache = _cargar(ruta_csv, cache)
+
+    read_csv.assert_not_called()
+    pd.testing.assert_frame_equal(desde_cache, preparado)
+    assert len(os.listdir(cache.directorio)) == 1
+
+
+def test_csv_modificado_reconstruye_y_reemplaza_la_entrada(ruta_csv, tmp_path):
+    cache = CacheCartera(str(tmp_path / "cache"))
+    _cargar(ruta_csv, cache)
+
+    with open(ruta_csv, "a", encoding="utf-8") as f:
+        f.write("111111111,003,NUEVO,1500.00,,1500.00,2024-01-15 00:00:00\n")
+    recargado = _cargar(ruta_csv, cache)
+
+    assert list(recargado["numero"]) == ["001", "002", "003", "004"]
+    assert len(os.listdir(cache.directorio)) == 1
+
+
+def test_cambio_de_version_invalida_la_cache(ruta_csv, tmp_path, monkeypatch):
+    cache = CacheCartera(str(tmp_path / "cache"))
+    _cargar(ruta_csv, cache)
+
+    monkeypatch.setattr(cache_cartera, "VERSION_PREPARACION", "otra")
+
+    assert cache.obtener(ruta_csv) is None
+
+
+def test_cambio_de_encoding_configurado_no_reutiliza_la_entrada(tmp_path):
+    ruta = tmp_path / "cartera.csv"
+    ruta.write_text(
+        "nit,Numero,Razon Social,Valor,Aplicado,Saldo,Fecha\n"
+        "123456789,001,Peña,100.00,0,100.00,2025-02-27 00:00:00\n",
+        encoding="utf-8",
+    )
+    cache = CacheCartera(str(tmp_path / "cache"))
+
+    def razon_social(encoding):
+        repositorio = RepositorioCartera(
+            MagicMock(spec=FirebaseRepositorioPedidos), str(ruta), cache=cache, encoding=encoding
+        )
+        return repositorio.df["razon_social"].iloc[0]
+
+    # Encoding mal configurado: el texto queda mal decodificado (y en caché)
+    assert razon_social("latin-1") == "PeÃ±a"
+    # Al corregir la configuración no se sirve la entrada anterior
+    assert razon_social("utf-8") == "Peña"
+    assert razon_social("utf-8") == "Peña"
+    assert CacheCartera.clave(str(ruta), "utf-8") != CacheCartera.clave(str(ruta), "latin-1")
+    assert CacheCartera.clave(str(ruta)) != CacheCartera.clave(str(ruta), "utf-8")
+
+
+def test_entrada_npz_sin_pickle(ruta_csv, tmp_path):
+    cache = CacheCartera(str(tmp_path / "cache"))
+    preparado = _cargar(ruta_csv, cache)
+    (nombre,) = os.listdir(cache.directorio)
+    assert nombre.endswith(".npz")
+
+    # La entrada se lee sin pickle: ni los nulos de texto ni los tipos cambian
+    with patch("infrastructure.repositories.cache_cartera.np.load", wraps=cache_cartera.np.load) as np_load:
+        desde_cache = cache.obtener(ruta_csv)
+    assert np_load.call_args.kwargs["allow_pickle"] is False
+    pd.testing.assert_frame_equal(desde_cache, preparado)
+    assert desde_cache["aplicado_centavos"].dtype == "int64"
+    assert desde_cache["razon_social"].isna().tolist() == [False, True, False]
+
+
+def test_columnas_de_objetos_no_se_guardan(ruta_csv, tmp_path):
+    cache = CacheCartera(str(tmp_path / "cache"))
+    df = pd.DataFrame({"nit": ["1", None], "valor": [Decimal("1.00"), Decimal("2.00")]})
+
+    cache.guardar(ruta_csv, df)
+
+    assert not os.path.exists(cache.directorio) or os.listdir(cache.directorio) == []
+    assert cache.obtener(ruta_csv) is None
+
+
+def test_entrada_corrupta_se_reconstruye(ruta_csv, tmp_path):
+    cache = CacheCartera(str(tmp_path / "cache"))
+    preparado = _cargar(ruta_csv, cache)
+    for nombre in os.listdir(cache.directorio):
+        with open(os.path.join(cache.directorio, nombre), "wb") as f:
+            f.write(b"no es una entrada")
+
+    assert cache.obtener(ruta_csv) is None
+    pd.testing.assert_frame_equal(_cargar(ruta_csv, cache), preparado)
+    assert crear_cache_cartera(None) is None
@@ -0,0 +1,81 @@
+# tests\infrastructure\test_cache_extractos.py
+
+import os
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from infrastructure.extractors.cache_extractos import CacheExtractos, crear_cache_extractos
+from infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia import (
+    ExtractorDePagosPorNitBancolombia,
+)
+
+FILAS = [("2025/04/01", "123456789", "1,000.50"), ("2025/04/02", "987654321", "20.00")]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheExtractos(str(tmp_path / "cache"))
+
+
+def test_clave_depende_del_contenido_y_la_version():
+    assert CacheExtractos.clave(b"pdf", "1") != CacheExtractos.clave(b"pdf", "2")
+    assert CacheExtractos.clave(b"pdf", "1") != CacheExtractos.clave(b"otro", "1")
+    assert CacheExtractos.clave(b"pdf", "1") == CacheExtractos.clave(b"pdf", "1")
+
+
+def test_obtener_y_guardar_actualiza_estadisticas(cache):
+    clave = CacheExtractos.clave(b"pdf", "1")
+    assert cache.obtener(clave, tamano_pdf=3) is None
+
+    cache.guardar(clave, FILAS)
+    assert cache.obtener(clave, tamano_pdf=3) == FILAS
+
+    estadisticas = cache.estadisticas()
+    assert estadisticas.aciertos == 1
+    assert estadisticas.fallos == 1
+    assert estadisticas.bytes_ahorrados == 3
+    assert estadisticas.entradas == 1
+    assert estadisticas.bytes_en_disco > 0
+
+
+def test_desaloja_la_entrada_menos_usada(tmp_path):
+    cache = CacheExtractos(str(tmp_path), tamano_maximo_bytes=10_000)
+    cache.guardar("a", FILAS)
+    tamano_entrada = os.path.getsize(tmp_path / "a.json")
+    cache.tamano_maximo_bytes = tamano_entrada * 2
+
+    cache.guardar("b", FILAS)
+    antiguo = time.time() - 100
+    os.utime(tmp_path / "a.json", (antiguo, antiguo))
+    os.utime(tmp_path / "b.json", (antiguo + 1, antiguo + 1))
+    cache.obtener("a")  # "a" pasa a ser la más reciente
+    cache.guardar("c", FILAS)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+
+
+def test_crear_cache_extractos_sin_directorio():
+    assert crear_cache_extractos(None) is None
+
+
+def test_extractor_omite_pypdf_en_acierto(tmp_path, cache):
+    (tmp_path / "ahorros").mkdir()
+    (tmp_path / "ahorros" / "20250401.pdf").write_bytes(b"%PDF-1.4 contenido")
+    extractor = ExtractorDePagosPorNitBancolombia(
+        directorio_bancolombia_data=str(tmp_path), cache=cache
+    )
+    page = MagicMock()
+    page.extract_text.return_value = "2025/04/01 PAGO 123456789 0 1,000.50\n"
+    reader = MagicMock(pages=[page])
+
+    with patch(
+        "infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia.PdfReader",
+        return_value=reader,
+    ) as mock_pdf_reader:
+        primero = extractor.extract_data("20250401", "ahorros")
+        segundo = extractor.extract_data("20250401", "ahorros")
+
+    assert primero == segundo == {"123456789": 1000.50}
+    mock_pdf_reader.assert_called_once()
+    assert cache.estadisticas().aciertos == 1
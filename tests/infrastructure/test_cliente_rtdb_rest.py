@@ -0,0 +1,109 @@
+# tests\infrastructure\test_cliente_rtdb_rest.py
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+from benchmarks.servidor_rtdb_local import ServidorRTDBLocal
+from infrastructure.repositories.cliente_rtdb_rest import ClienteRTDBRest, DecodificadorHijosJSON
+
+DATOS = {
+    "a": {"nit": "1", "valor": {"neto": 12345.5}, "texto": "coma, llave } y \"comillas\""},
+    "b": 17,
+    "c": [1, 2, {"x": None}],
+    "d": "ñandú",
+}
+
+
+@pytest.mark.parametrize("tamano", [1, 3, 7, 1000])
+def test_decodificador_entrega_los_hijos_con_cualquier_fragmentacion(tamano):
+    texto = json.dumps(DATOS, ensure_ascii=False, indent=1)
+    decodificador = DecodificadorHijosJSON()
+    pares = []
+    for inicio in range(0, len(texto), tamano):
+        pares.extend(decodificador.alimentar(texto[inicio:inicio + tamano]))
+    pares.extend(decodificador.terminar())
+
+    assert dict(pares) == DATOS
+    assert len(pares) == len(DATOS)
+
+
+def test_decodificador_no_corta_numeros_entre_fragmentos():
+    decodificador = DecodificadorHijosJSON()
+    assert decodificador.alimentar('{"a": 12') == []
+    assert decodificador.alimentar('34') == []
+    assert decodificador.alimentar('}') == [("a", 1234)]
+    assert decodificador.terminar() == []
+
+
+def test_decodificador_raices_que_no_son_objeto():
+    for texto, esperado in (("null", []), ("[null, 5, 6]", [("1", 5), ("2", 6)])):
+        decodificador = DecodificadorHijosJSON()
+        assert decodificador.alimentar(texto) == []
+        assert decodificador.terminar() == esperado
+
+
+def test_decodificador_falla_con_respuesta_incompleta():
+    decodificador = DecodificadorHijosJSON()
+    decodificador.alimentar('{"a": 1, "b"')
+    with pytest.raises(ValueError):
+        decodificador.terminar()
+
+
+@pytest.fixture
+def servidor():
+    raiz = ReferenciaEnMemoria({"pedidos": {
+        f"p{i:03d}": {"nit": str(i % 5), "estado": 2 if i % 2 else 3, "valor": {"neto": i * 1000}}
+        for i in range(200)
+    }})
+    with ServidorRTDBLocal(raiz) as servidor:
+        yield servidor
+
+
+def _ejecutar(servidor, corutina_de, **opciones):
+    async def ejecutar():
+        async with ClienteRTDBRest(servidor.url, espera_inicial_s=0.01, **opciones) as cliente:
+            return await corutina_de(cliente)
+    return asyncio.run(ejecutar())
+
+
+def test_cliente_descarga_y_consulta_como_la_base_en_memoria(servidor):
+    referencia = servidor.raiz.child("pedidos")
+
+    completo = _ejecutar(servidor, lambda c: c.obtener("/pedidos"))
+    claves = _ejecutar(servidor, lambda c: c.obtener_claves("pedidos"))
+    por_nit = _ejecutar(servidor, lambda c: c.obtener("pedidos", order_by="nit", equal_to="3"))
+    rango = _ejecutar(servidor, lambda c: c.obtener("pedidos", order_by="$key", start_at="p010", limit_to_first=5))
+
+    assert completo == referencia.get()
+    assert sorted(claves) == sorted(referencia.get(shallow=True))
+    assert por_nit == dict(referencia.order_by_child("nit").equal_to("3").get())
+    assert list(rango) == ["p010", "p011", "p012", "p013", "p014"]
+
+
+def test_cliente_obtiene_hijos_concurrentemente_sobre_el_pool(servidor):
+    hijos = _ejecutar(servidor, lambda c: c.obtener_hijos("pedidos", ["p001", "p150", "no-existe"]), max_conexiones=2)
+
+    assert set(hijos) == {"p001", "p150"}
+    assert hijos["p150"]["valor"]["neto"] == 150000
+    assert servidor.peticiones == 3
+
+
+def test_cliente_reintenta_errores_transitorios(servidor):
+    servidor.fallos_pendientes = 2
+
+    completo = _ejecutar(servidor, lambda c: c.obtener("pedidos"), reintentos=3)
+
+    assert len(completo) == 200
+    assert servidor.peticiones == 3
+
+
+def test_cliente_propaga_el_error_al_agotar_los_reintentos(servidor):
+    servidor.fallos_pendientes = 5
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _ejecutar(servidor, lambda c: c.obtener("pedidos"), reintentos=1)
+    assert servidor.peticiones == 2
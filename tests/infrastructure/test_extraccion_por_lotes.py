@@ -0,0 +1,77 @@
+# tests\infrastructure\test_extraccion_por_lotes.py
+
+import pytest
+
+from benchmarks.generador_extractos import escribir_pdf
+from infrastructure.extractors import extraccion_por_lotes
+from infrastructure.extractors.extraccion_por_lotes import (
+    extraer_pagos_por_lote,
+    fechas_en_rango,
+)
+
+
+@pytest.fixture
+def directorio_pagos(tmp_path):
+    for tipo_cuenta, fecha in [("ahorros", "20250401"), ("ahorros", "20250403"), ("corriente", "20250402")]:
+        carpeta = tmp_path / tipo_cuenta
+        carpeta.mkdir(exist_ok=True)
+        (carpeta / f"{fecha}.pdf").write_bytes(b"%PDF-1.4")
+    return str(tmp_path)
+
+
+def test_fechas_en_rango_incluye_extremos():
+    assert fechas_en_rango("20250430", "20250502") == ["20250430", "20250501", "20250502"]
+
+
+def test_fechas_en_rango_invertido():
+    with pytest.raises(ValueError):
+        fechas_en_rango("20250402", "20250401")
+
+
+def test_extraer_pagos_por_lote_solo_archivos_existentes(directorio_pagos, monkeypatch):
+    llamadas = []
+
+    def extraer_falso(directorio, fecha, tipo_cuenta, directorio_cache=None):
+        llamadas.append((fecha, tipo_cuenta))
+        return {"123": float(fecha[-1])}
+
+    monkeypatch.setattr(extraccion_por_lotes, "_extraer_un_pdf", extraer_falso)
+
+    resultados = extraer_pagos_por_lote(directorio_pagos, "20250401", "20250403", max_procesos=1)
+
+    assert list(resultados) == [
+        ("20250401", "ahorros"),
+        ("20250402", "corriente"),
+        ("20250403", "ahorros"),
+    ]
+    assert resultados[("20250402", "corriente")] == {"123": 2.0}
+    assert len(llamadas) == 3
+
+
+def test_extraer_pagos_por_lote_con_pool_igual_al_serial_y_tolera_un_pdf_danado(tmp_path):
+    for tipo_cuenta, fecha, valor in [
+        ("ahorros", "20250401", "1,000.50"),
+        ("ahorros", "20250402", "250.00"),
+        ("corriente", "20250401", "2,000.25"),
+        ("corriente", "20250403", "75.10"),
+    ]:
+        carpeta = tmp_path / tipo_cuenta
+        carpeta.mkdir(exist_ok=True)
+        (carpeta / f"{fecha}.pdf").write_bytes(escribir_pdf([
+            f"{fecha[:4]}/{fecha[4:6]}/{fecha[6:]} PAGO PROVEEDOR 123456789 0 {valor}\n"
+            f"{fecha[:4]}/{fecha[4:6]}/{fecha[6:]} TRANSFERENCIA 0084146038 0 500.00\n"
+        ]))
+    # PDF dañado: falla sólo su extracción
+    (tmp_path / "ahorros" / "20250403.pdf").write_bytes(b"%PDF-1.4 truncado")
+
+    serial = extraer_pagos_por_lote(str(tmp_path), "20250401", "20250403", max_procesos=1)
+    paralelo = extraer_pagos_por_lote(str(tmp_path), "20250401", "20250403", max_procesos=2)
+
+    assert paralelo == serial
+    assert list(paralelo) == [
+        ("20250401", "ahorros"),
+        ("20250401", "corriente"),
+        ("20250402", "ahorros"),
+        ("20250403", "corriente"),
+    ]
+    assert paralelo[("20250401", "corriente")] == {"123456789": 2000.25, "70825190": 500.00}
@@ -0,0 +1,121 @@
+# tests\infrastructure\test_extractor_de_pagos_por_nit_bancolombia.py
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from benchmarks.generador_extractos import escribir_pdf
+from infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia import (
+    MINIMO_PAGINAS_POR_PROCESO,
+    ExtractorDePagosPorNitBancolombia,
+    TransaccionBancaria,
+    iterar_filas_por_pagina,
+    rangos_de_paginas,
+)
+
+
+PAGINA_1 = (
+    "2025/04/01 PAGO PROVEEDOR 123456789 0 1,000.50\n"
+    "2025/04/01 ABONO INTERESES AHORROS 987654321 0 -20.00\n"
+)
+PAGINA_2 = (
+    "2025/04/02 PAGO PROVEEDOR 123456789 0 2,000.25\n"
+    "2025/04/02 TRANSFERENCIA 0084146038 0 500.00\n"
+)
+
+
+def _mock_reader(paginas):
+    reader = MagicMock()
+    reader.pages = []
+    for texto in paginas:
+        page = MagicMock()
+        page.extract_text.return_value = texto
+        reader.pages.append(page)
+    return reader
+
+
+@pytest.fixture
+def extractor():
+    return ExtractorDePagosPorNitBancolombia(directorio_bancolombia_data="bancolombia_data")
+
+
+def test_iterar_filas_por_pagina_equivale_al_texto_concatenado():
+    paginas = [PAGINA_1, PAGINA_2]
+    filas = list(iterar_filas_por_pagina(paginas))
+    assert filas == [
+        ("2025/04/01", "123456789", "1,000.50"),
+        ("2025/04/01", "987654321", "-20.00"),
+        ("2025/04/02", "123456789", "2,000.25"),
+        ("2025/04/02", "0084146038", "500.00"),
+    ]
+
+
+def test_iterar_filas_por_pagina_fila_partida_entre_paginas():
+    paginas = ["2025/04/01 PAGO PROVEEDOR 1234", "56789 0 1,000.50\n"]
+    assert list(iterar_filas_por_pagina(paginas)) == [
+        ("2025/04/01", "123456789", "1,000.50")
+    ]
+
+
+def test_iter_transacciones_es_perezoso(extractor):
+    reader = _mock_reader([PAGINA_1, PAGINA_2])
+    with patch(
+        "infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia.PdfReader",
+        return_value=reader,
+    ):
+        transacciones = extractor.iter_transacciones("20250401", "ahorros")
+        primera = next(transacciones)
+
+        assert primera == TransaccionBancaria("2025/04/01", "123456789", "123456789", 100050)
+        # La segunda página aún no se ha leído
+        reader.pages[1].extract_text.assert_not_called()
+
+
+def test_extract_data_suma_por_nit_y_resuelve_referencias(extractor):
+    with patch(
+        "infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia.PdfReader",
+        return_value=_mock_reader([PAGINA_1, PAGINA_2]),
+    ):
+        resultado = extractor.extract_data("20250401", "ahorros")
+
+    assert resultado == {"123456789": 3000.75, "70825190": 500.00}
+
+
+def test_extract_data_omite_filas_con_valor_invalido(extractor):
+    pagina = PAGINA_2 + "2025/04/02 TRANSFERENCIA 123456789 0 1.2.3\n"
+    with patch(
+        "infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia.PdfReader",
+        return_value=_mock_reader([PAGINA_1, pagina]),
+    ):
+        resultado = extractor.extract_data("20250401", "ahorros")
+
+    assert resultado == {"123456789": 3000.75, "70825190": 500.00}
+
+
+def test_extract_data_archivo_no_encontrado(tmp_path):
+    extractor = ExtractorDePagosPorNitBancolombia(directorio_bancolombia_data=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        extractor.extract_data("20250401", "ahorros")
+
+
+def test_rangos_de_paginas_contiguos_y_completos():
+    rangos = rangos_de_paginas(10, 4)
+    assert rangos == [(0, 3), (3, 6), (6, 8), (8, 10)]
+    assert rangos_de_paginas(2, 8) == [(0, 1), (1, 2)]
+
+
+def test_extraccion_paralela_por_paginas_conserva_el_orden(tmp_path):
+    textos = [
+        f"2025/04/01 PAGO PROVEEDOR {100 + i} 0 {i + 1},000.00\n2025/04/01 TRANSFERENCIA {200 + i} 0 5.0{i % 10}"
+        for i in range(2 * MINIMO_PAGINAS_POR_PROCESO)
+    ]
+    (tmp_path / "corriente").mkdir()
+    (tmp_path / "corriente" / "20250401.pdf").write_bytes(escribir_pdf(textos))
+
+    secuencial = ExtractorDePagosPorNitBancolombia(directorio_bancolombia_data=str(tmp_path))
+    paralelo = ExtractorDePagosPorNitBancolombia(directorio_bancolombia_data=str(tmp_path), procesos_paginas=2)
+
+    filas_secuenciales = list(secuencial._iter_filas(secuencial._ruta_pdf("20250401", "corriente")))
+    filas_paralelas = list(paralelo._iter_filas(paralelo._ruta_pdf("20250401", "corriente")))
+
+    assert len(filas_secuenciales) == 2 * len(textos)
+    assert filas_paralelas == filas_secuenciales
@@ -8,6 +8,7 @@ import uuid
 
 from domain.models.models import Pago
 from infrastructure.extractors.extractor_pago_pdf import ExtractorPagosPDF
+from infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia import TransaccionBancaria
 
 
 @pytest.fixture
@@ -67,3 +68,20 @@ def test_extraer_pagos_handles_empty_data(extractor_pagos_pdf, mock_procesador_p
     )
 
     assert pagos == []
+
+
+def test_obtener_pagos_streaming_consume_transacciones(mock_procesador_pdf):
+    mock_procesador_pdf.iter_transacciones.return_value = iter([
+        TransaccionBancaria("2023/10/10", "123456789", "123456789", 100025),
+        TransaccionBancaria("2023/10/10", "123456789", "123456789", 25),
+        TransaccionBancaria("2023/10/10", "987654321", "987654321", 200075),
+    ])
+    extractor = ExtractorPagosPDF(procesador_pdf=mock_procesador_pdf, streaming=True)
+
+    pagos = extractor.obtener_pagos(fecha_pdf="20231010", tipo_cuenta="ahorros")
+
+    mock_procesador_pdf.extract_data.assert_not_called()
+    assert {p.nit_cliente: p.monto for p in pagos} == {
+        "123456789": Decimal("1000.5"),
+        "987654321": Decimal("2000.75"),
+    }
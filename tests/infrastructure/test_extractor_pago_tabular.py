@@ -0,0 +1,165 @@
+# tests\infrastructure\test_extractor_pago_tabular.py
+
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from openpyxl import Workbook
+
+from domain.models import Pago
+from infrastructure.extractors.extractor_pago_tabular import (
+    ExtractorPagosTabular,
+    formato_extracto,
+    iterar_filas_csv,
+)
+from infrastructure.extractors.resolutor_referencias import ResolutorReferencias
+
+
+@pytest.fixture
+def resolutor():
+    # Sin índice en disco: sólo se normalizan las referencias
+    resolutor = ResolutorReferencias(ruta_indice=None)
+    resolutor._mapeo = {"84146038": "900100200"}
+    resolutor._proxima_revision = float("inf")
+    return resolutor
+
+
+@pytest.fixture
+def directorio_pagos(tmp_path):
+    (tmp_path / "ahorros").mkdir()
+    (tmp_path / "corriente").mkdir()
+    return tmp_path
+
+
+CSV_EXTRACTO = (
+    "Extracto de movimientos\n"
+    "Cuenta;Ahorros\n"
+    "FECHA;DESCRIPCION;SUCURSAL;REFERENCIA 1;VALOR;SALDO\n"
+    "2025/04/10;PAGO PSE;MEDELLIN;0084146038;1,500,000.50;9,000,000.00\n"
+    "2025/04/10;PAGO PSE;MEDELLIN;12345;200.00;9,000,200.00\n"
+    "2025/04/10;PAGO PSE;MEDELLIN;12345;300.10;9,000,500.10\n"
+    "2025/04/10;COMISION;MEDELLIN;0;-20.00;9,000,480.10\n"
+)
+
+
+def test_iterar_filas_csv_proyecta_columnas(directorio_pagos):
+    ruta = directorio_pagos / "ahorros" / "20250410.csv"
+    ruta.write_text(CSV_EXTRACTO, encoding="utf-8")
+
+    filas = list(iterar_filas_csv(str(ruta)))
+
+    assert filas[0] == ("2025/04/10", "0084146038", "1,500,000.50")
+    assert len(filas) == 4
+
+
+def test_iterar_filas_csv_utf8_con_bom_y_latin1_a_mitad_de_archivo(directorio_pagos):
+    ruta = directorio_pagos / "ahorros" / "20250410.csv"
+    ruta.write_text(CSV_EXTRACTO, encoding="utf-8-sig")
+    assert list(iterar_filas_csv(str(ruta)))[0] == ("2025/04/10", "0084146038", "1,500,000.50")
+
+    # El primer byte que no es UTF-8 aparece después de varios bloques de lectura, con
+    # filas ya generadas
+    relleno = "".join(f"2025/04/10;PAGO PSE;MEDELLIN;{n};1.00;0\n" for n in range(1000, 2000))
+    ruta.write_bytes(
+        CSV_EXTRACTO.encode("latin-1")
+        + relleno.encode("latin-1")
+        + "2025/04/10;ABONO NIÑO;MEDELLIN;777;10.00;0\n".encode("latin-1")
+        + b"2025/04/10;PAGO PSE;MEDELLIN;888;20.00;0\n"
+    )
+    filas = list(iterar_filas_csv(str(ruta)))
+
+    referencias = [referencia for _, referencia, _ in filas]
+    assert referencias == ["0084146038", "12345", "12345", "0"] + [str(n) for n in range(1000, 2000)] + ["777", "888"]
+
+
+def test_obtener_pagos_csv(directorio_pagos, resolutor):
+    (directorio_pagos / "ahorros" / "20250410.csv").write_text(CSV_EXTRACTO, encoding="latin-1")
+    extractor = ExtractorPagosTabular(str(directorio_pagos), resolutor=resolutor)
+
+    pagos = extractor.obtener_pagos("20250410", "ahorros")
+
+    assert all(isinstance(pago, Pago) for pago in pagos)
+    assert [(pago.nit_cliente, pago.monto, pago.fecha_pago) for pago in pagos] == [
+        ("900100200", Decimal("1500000.50"), date(2025, 4, 10)),
+        ("12345", Decimal("500.10"), date(2025, 4, 10)),
+    ]
+
+
+def test_obtener_pagos_csv_con_coma_decimal(directorio_pagos, resolutor):
+    # Los valores sin separador o ambiguos ("1.000") antes del primero que determina el
+    # separador decimal se interpretan con el separador deducido
+    (directorio_pagos / "ahorros" / "20250410.csv").write_text(
+        "FECHA;REFERENCIA 1;VALOR\n"
+        "2025/04/10;12345;1.000\n"
+        "2025/04/10;12345;200\n"
+        "2025/04/10;0084146038;1.234,56\n",
+        encoding="utf-8",
+    )
+    extractor = ExtractorPagosTabular(str(directorio_pagos), resolutor=resolutor)
+
+    pagos = {pago.nit_cliente: pago.monto for pago in extractor.obtener_pagos("20250410", "ahorros")}
+
+    assert pagos == {"12345": Decimal("1200.00"), "900100200": Decimal("1234.56")}
+
+
+def test_obtener_pagos_csv_omite_valores_invalidos_o_ambiguos(directorio_pagos, resolutor, caplog):
+    ruta = directorio_pagos / "ahorros" / "20250410.csv"
+    ruta.write_text(
+        "FECHA;REFERENCIA 1;VALOR\n"
+        "2025/04/10;12345;N/A\n"
+        "2025/04/10;12345;1,500.50\n"
+        "2025/04/10;12345;1.234,56\n"  # otro separador decimal que el del archivo
+        "2025/04/10;0084146038;300.00\n",
+        encoding="utf-8",
+    )
+    extractor = ExtractorPagosTabular(str(directorio_pagos), resolutor=resolutor)
+
+    pagos = {pago.nit_cliente: pago.monto for pago in extractor.obtener_pagos("20250410", "ahorros")}
+
+    assert pagos == {"12345": Decimal("1500.50"), "900100200": Decimal("300.00")}
+    assert sum("Fila omitida" in r.getMessage() for r in caplog.records) == 2
+
+    # Sin ningún valor que determine el separador, "1.234" no se puede interpretar
+    ruta.write_text("FECHA;REFERENCIA 1;VALOR\n2025/04/10;12345;1.234\n2025/04/10;12345;15\n", encoding="utf-8")
+    pagos = {pago.nit_cliente: pago.monto for pago in extractor.obtener_pagos("20250410", "ahorros")}
+    assert pagos == {"12345": Decimal("15.00")}
+
+    # Con el separador configurado no hay ambigüedad
+    extractor = ExtractorPagosTabular(str(directorio_pagos), resolutor=resolutor, separador_decimal=",")
+    pagos = {pago.nit_cliente: pago.monto for pago in extractor.obtener_pagos("20250410", "ahorros")}
+    assert pagos == {"12345": Decimal("1249.00")}
+
+
+def test_obtener_pagos_xlsx_con_celdas_tipadas(directorio_pagos, resolutor):
+    libro = Workbook()
+    hoja = libro.active
+    hoja.append(["Extracto de movimientos"])
+    hoja.append(["FECHA", "DESCRIPCION", "REFERENCIA 1", "VALOR", "SALDO"])
+    hoja.append([datetime(2025, 4, 10), "PAGO PSE", 84146038, 1500000.5, 9000000])
+    hoja.append([datetime(2025, 4, 10), "PAGO PSE", "12345", 200, 9000200])
+    hoja.append([datetime(2025, 4, 10), "RETIRO", "12345", -50, 9000150])
+    libro.save(directorio_pagos / "corriente" / "20250410.xlsx")
+    extractor = ExtractorPagosTabular(str(directorio_pagos), resolutor=resolutor)
+
+    pagos = {pago.nit_cliente: pago.monto for pago in extractor.obtener_pagos("20250410", "corriente")}
+
+    assert pagos == {"900100200": Decimal("1500000.50"), "12345": Decimal("200.00")}
+
+
+def test_usa_extractor_de_respaldo_sin_archivo_tabular(directorio_pagos, resolutor):
+    respaldo = MagicMock()
+    respaldo.obtener_pagos.return_value = []
+    extractor = ExtractorPagosTabular(str(directorio_pagos), resolutor=resolutor, extractor_respaldo=respaldo)
+
+    assert extractor.obtener_pagos("20250410", "ahorros") == []
+    respaldo.obtener_pagos.assert_called_once_with("20250410", "ahorros")
+
+
+def test_formato_extracto(directorio_pagos):
+    (directorio_pagos / "ahorros" / "20250409.pdf").write_bytes(b"%PDF")
+    (directorio_pagos / "corriente" / "20250410.xlsx").write_bytes(b"")
+
+    assert formato_extracto(str(directorio_pagos), "20250409") == "pdf"
+    assert formato_extracto(str(directorio_pagos), "20250410") == "tabular"
+    assert formato_extracto(None, None) == "pdf"
@@ -6,6 +6,7 @@ from datetime import datetime
 from decimal import Decimal
 from infrastructure.repositories.firebase_repositorio_pedidos import (
     FirebaseRepositorioPedidos,
+    variantes_literales_nit,
 )
 from domain.models.models import EstadoPedido
 
@@ -118,3 +119,325 @@ def test_dias_en_forma_pago(firebase_repo):
     assert firebase_repo._dias_en_forma_pago("Efectivo") is False
     assert firebase_repo._dias_en_forma_pago("60 DIAS") is True
     assert firebase_repo._dias_en_forma_pago("") is False
+
+
+def _pedidos_en_memoria():
+    from benchmarks.generador_pedidos import generar_pedidos_crudos
+    from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+
+    pedidos = generar_pedidos_crudos(400, numero_clientes=50, dias_historia=365, semilla=3)
+    return ReferenciaEnMemoria({"pedidos": pedidos}).child("pedidos")
+
+
+def test_modo_estado_filtra_en_el_servidor_sin_cambiar_el_resultado():
+    referencia = _pedidos_en_memoria()
+    completo = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito()
+    nodos_completo = referencia.estadisticas.nodos
+
+    referencia.estadisticas.reiniciar()
+    por_estado = FirebaseRepositorioPedidos(firebase_reference=referencia, modo_consulta="estado").obtener_pedidos_credito()
+
+    assert sorted(p.id_pedido for p in por_estado) == sorted(p.id_pedido for p in completo)
+    assert referencia.estadisticas.nodos < nodos_completo
+
+
+def test_modo_fecha_trae_solo_la_ventana_de_dias_maximo_pedido():
+    from datetime import timedelta
+    from config.app_config import config
+
+    referencia = _pedidos_en_memoria()
+    completo = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito()
+    fecha_limite = datetime.now().date() - timedelta(days=config.dias_maximo_pedido)
+
+    por_fecha = FirebaseRepositorioPedidos(
+        firebase_reference=referencia, modo_consulta="fecha", clave_fecha_ordenable="fecha_despacho"
+    ).obtener_pedidos_credito()
+
+    assert por_fecha
+    assert sorted(p.id_pedido for p in por_fecha) == sorted(
+        p.id_pedido for p in completo if p.fecha_pedido >= fecha_limite
+    )
+
+
+def test_modo_consulta_invalido():
+    with pytest.raises(ValueError):
+        FirebaseRepositorioPedidos(firebase_reference=MagicMock(), modo_consulta="todo")
+
+
+def test_obtener_pedidos_por_nit_usa_indice_compartido():
+    referencia = _pedidos_en_memoria()
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia)
+    credito = repositorio.obtener_pedidos_credito()
+    nits = {p.nit_cliente for p in credito}
+    referencia.estadisticas.reiniciar()
+
+    total = sum(len(repositorio.obtener_pedidos_por_nit(nit)) for nit in nits)
+
+    assert total == len(credito)
+    assert referencia.estadisticas.lecturas == 0  # Todas las consultas salen del índice
+    assert repositorio.obtener_pedidos_por_nit("no-existe") == []
+
+
+def test_indice_por_nit_devuelve_copias_y_expira():
+    referencia = _pedidos_en_memoria()
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia, segundos_vigencia_indice=0)
+    nit = repositorio.obtener_pedidos_credito()[0].nit_cliente
+
+    pedido = repositorio.obtener_pedidos_por_nit(nit)[0]
+    pedido.valor_cobrado = pedido.valor_neto
+    pedido.fechas_abono.append(datetime(2025, 1, 1).date())
+    referencia.estadisticas.reiniciar()
+
+    # Vigencia 0: se vuelve a descargar y las modificaciones del llamador no se ven
+    otra = next(p for p in repositorio.obtener_pedidos_por_nit(nit) if p.id_pedido == pedido.id_pedido)
+    assert referencia.estadisticas.lecturas == 1
+    assert otra.valor_cobrado == Decimal("0.0") and otra.fechas_abono == []
+
+
+def test_obtener_pedidos_credito_para_nits_materializa_solo_esos_nit():
+    referencia = _pedidos_en_memoria()
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia)
+    completo = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito()
+    nits = sorted({p.nit_cliente for p in completo})[:3]
+
+    with patch.object(repositorio, "_mapear_pedido", wraps=repositorio._mapear_pedido) as mapear:
+        perezosos = repositorio.obtener_pedidos_credito_para_nits(["000" + nits[0], nits[1], nits[2]])
+
+    esperados = [p for p in completo if p.nit_cliente in nits]
+    assert sorted(p.id_pedido for p in perezosos) == sorted(p.id_pedido for p in esperados)
+    assert mapear.call_count == len(esperados)
+
+
+def test_consulta_por_nit_descarga_solo_los_pedidos_de_los_pagadores():
+    referencia = _pedidos_en_memoria()
+    completo = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito()
+    nits = sorted({p.nit_cliente for p in completo})[:4]
+    referencia.estadisticas.reiniciar()
+
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia, consulta_por_nit=True, hilos_consulta=3)
+    pedidos = repositorio.obtener_pedidos_credito_para_nits(nits + ["sin-pedidos"])
+
+    assert sorted(p.id_pedido for p in pedidos) == sorted(p.id_pedido for p in completo if p.nit_cliente in nits)
+    # Una consulta por variante literal de cada NIT
+    assert referencia.estadisticas.lecturas == len(
+        {v for nit in nits + ["sin-pedidos"] for v in variantes_literales_nit(nit)}
+    )
+    assert referencia.estadisticas.nodos < len(referencia.get(shallow=True))
+
+
+def test_variantes_literales_nit():
+    # 900123456 tiene DV 8; 9001234568 termina en un DV válido
+    assert variantes_literales_nit("900123456") == ["900123456", "900.123.456"]
+    assert variantes_literales_nit("000900.123.456-8") == [
+        "9001234568", "9.001.234.568", "900123456-8", "900.123.456-8",
+    ]
+    assert variantes_literales_nit("123") == ["123"]
+    assert variantes_literales_nit("sin-pedidos") == ["sinpedidos"]
+
+
+def test_consulta_por_nit_encuentra_nit_guardados_sin_normalizar():
+    from benchmarks.generador_pedidos import generar_pedidos_crudos
+    from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+    from domain.services.indice_nit import calcular_digito_verificacion
+
+    pedidos = generar_pedidos_crudos(400, numero_clientes=50, dias_historia=365, semilla=3)
+    nits = sorted({p.nit_cliente for p in FirebaseRepositorioPedidos(
+        firebase_reference=ReferenciaEnMemoria({"pedidos": pedidos}).child("pedidos")
+    ).obtener_pedidos_credito()})
+    con_puntos, con_dv = nits[0], nits[1]
+    dv = calcular_digito_verificacion(con_dv)
+    for data in pedidos.values():
+        if data["nit"] == con_puntos:
+            data["nit"] = f"{int(con_puntos):,}".replace(",", ".")
+        elif data["nit"] == con_dv:
+            data["nit"] = f"{int(con_dv):,}".replace(",", ".") + f"-{dv}"
+    referencia = ReferenciaEnMemoria({"pedidos": pedidos}).child("pedidos")
+    # Los NIT que llegan del extracto ya normalizados (el segundo como NIT+DV)
+    pagadores = [con_puntos, f"{con_dv}{dv}"]
+
+    por_nit = FirebaseRepositorioPedidos(
+        firebase_reference=referencia, consulta_por_nit=True
+    ).obtener_pedidos_credito_para_nits(pagadores)
+    desde_indice = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito_para_nits(pagadores)
+
+    assert {p.nit_cliente.split("-")[0].replace(".", "") for p in por_nit} == {con_puntos, con_dv}
+    assert sorted(p.id_pedido for p in por_nit) == sorted(p.id_pedido for p in desde_indice)
+
+
+def test_rangos_de_claves_cubren_todas_las_claves_en_orden_de_llave():
+    from infrastructure.repositories.firebase_repositorio_pedidos import rangos_de_claves
+
+    claves = ["b", "10", "a", "2", "-Nx1", "c", "d"]
+
+    # Orden de llave: 2, 10, -Nx1, a, b, c, d; cada rango termina donde empieza el siguiente
+    assert rangos_de_claves(claves, 3) == [(None, "a"), ("a", "d"), ("d", None)]
+    assert rangos_de_claves(claves, 10) == [(None, None)]
+    assert rangos_de_claves([], 3) == []
+    # Sin huecos entre rangos: "b" o "d" creadas después del listado caen en algún rango
+    assert rangos_de_claves(["a", "c", "e"], 1) == [(None, "c"), ("c", "e"), ("e", None)]
+
+
+def test_modo_fragmentos_descarga_claves_creadas_despues_del_listado():
+    referencia = _pedidos_en_memoria()
+    completo = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito()
+    todas = list(referencia.get(shallow=True))
+    get_original = referencia.get
+
+    def get(etag=False, shallow=False):
+        if shallow:
+            # El listado no ve una de cada tres claves (creadas después de listar)
+            return {clave: True for numero, clave in enumerate(todas) if numero % 3}
+        return get_original(etag=etag, shallow=shallow)
+
+    referencia.get = get
+    repositorio = FirebaseRepositorioPedidos(
+        firebase_reference=referencia, modo_consulta="fragmentos", tamano_fragmento=7, hilos_consulta=2
+    )
+    ids = [p.id_pedido for p in repositorio.iter_pedidos_credito()]
+
+    assert len(ids) == len(set(ids))  # La clave compartida entre rangos llega una sola vez
+    assert sorted(ids) == sorted(p.id_pedido for p in completo)
+
+
+def test_modo_fragmentos_descarga_por_rangos_de_claves():
+    referencia = _pedidos_en_memoria()
+    completo = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito()
+
+    referencia.estadisticas.reiniciar()
+    repositorio = FirebaseRepositorioPedidos(
+        firebase_reference=referencia, modo_consulta="fragmentos", tamano_fragmento=50, hilos_consulta=3
+    )
+    iterador = repositorio.iter_pedidos_credito()
+    primero = next(iterador)
+    # El primer pedido llega antes de descargar todos los fragmentos
+    assert referencia.estadisticas.lecturas <= 1 + 3
+    por_fragmentos = [primero, *iterador]
+
+    assert sorted(p.id_pedido for p in por_fragmentos) == sorted(p.id_pedido for p in completo)
+    assert referencia.estadisticas.lecturas == 1 + 400 // 50
+    assert repositorio.obtener_pedidos_por_nit(completo[0].nit_cliente)
+
+
+def test_plazo_y_fecha_de_despacho_memoizados():
+    from infrastructure.repositories.firebase_repositorio_pedidos import fecha_despacho, plazo_forma_pago
+
+    assert plazo_forma_pago("Crédito A 30 días") == 30
+    assert plazo_forma_pago("60 DIAS") == 0
+    assert plazo_forma_pago("Contado") is None
+    assert fecha_despacho("05/03/2025 14:30") == datetime(2025, 3, 5).date()
+    with pytest.raises(ValueError):
+        fecha_despacho("05/03/2025 25:00")
+    with pytest.raises(ValueError):
+        fecha_despacho("2025-03-05 14:30")
+
+
+def test_descartes_por_motivo_sin_print_por_pedido(capsys):
+    base = {"nit": "1", "estado": 2, "valor": {"neto": 1000}, "hora_despacho": "01/01/2025 10:00", "forma_pago": "A 30 días"}
+    referencia = MagicMock()
+    referencia.get.return_value = {
+        "ok": base,
+        "contado": {**base, "forma_pago": "Contado"},
+        "anulado": {**base, "estado": 3},
+        "sin_nit": {**base, "nit": ""},
+        "fecha_mala": {**base, "hora_despacho": "ayer"},
+        "valor_malo": {**base, "valor": {"neto": "abc"}},
+        "vacio": None,
+    }
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia)
+
+    pedidos = repositorio.obtener_pedidos_credito()
+
+    assert [p.id_pedido for p in pedidos] == ["ok"]
+    assert pedidos[0].plazo_dias_credito == 30
+    assert repositorio.ultimos_descartes == {
+        "forma_pago_no_credito": 1, "estado_no_credito": 1, "sin_nit": 1, "error_conversion": 2, "sin_datos": 1,
+    }
+    assert len(capsys.readouterr().out.strip().splitlines()) == 1
+
+
+@pytest.mark.parametrize("validacion", ["individual", "lote", "confiable"])
+def test_validaciones_de_pedidos_producen_los_mismos_pedidos(validacion):
+    referencia = _pedidos_en_memoria()
+    esperados = FirebaseRepositorioPedidos(firebase_reference=referencia, validacion_pedidos="individual").obtener_pedidos_credito()
+
+    pedidos = FirebaseRepositorioPedidos(firebase_reference=referencia, validacion_pedidos=validacion).obtener_pedidos_credito()
+
+    assert pedidos == esperados
+
+
+def test_validacion_en_lote_descarta_solo_los_invalidos():
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=MagicMock(), validacion_pedidos="lote")
+    campos, _ = repositorio._campos_pedido(
+        "1", {"nit": "1", "estado": 2, "valor": {"neto": 1000}, "hora_despacho": "01/01/2025 10:00", "forma_pago": "A 30 días"}
+    )
+
+    pedidos = repositorio._construir_pedidos([campos, {**campos, "id_pedido": "2", "fecha_pedido": "2025-01-01"}, {**campos, "id_pedido": "3"}])
+
+    assert [p.id_pedido if p else None for p in pedidos] == ["1", None, "3"]
+    with pytest.raises(ValueError):
+        FirebaseRepositorioPedidos(firebase_reference=MagicMock(), validacion_pedidos="rapida")
+
+
+def test_tabla_pedidos_credito_equivale_a_los_pedidos_mapeados():
+    referencia = _pedidos_en_memoria()
+    base = {"nit": "1", "estado": 5, "valor": {"neto": 1000}, "hora_despacho": "01/01/2025 10:00", "forma_pago": "A 30 días"}
+    referencia.update({
+        "centavos": {**base, "valor": {"neto": "12.345"}},
+        "espacios": {**base, "hora_despacho": " 1/2/2025   9:05 "},
+        "dia_invalido": {**base, "hora_despacho": "31/02/2025 10:00"},
+        "hora_invalida": {**base, "hora_despacho": "01/01/2025 24:00"},
+        "negativo": {**base, "valor": {"neto": -5}},
+        "nit_numerico": {**base, "nit": 123},
+        "razon_nula": {**base, "razon": None},
+        "vacio": None,
+    })
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia)
+    pedidos = repositorio.obtener_pedidos_credito()
+    descartes = repositorio.ultimos_descartes
+
+    tabla = repositorio.obtener_tabla_pedidos_credito()
+
+    assert repositorio.ultimos_descartes == descartes
+    assert list(tabla.ids) == [p.id_pedido for p in pedidos]
+    assert list(tabla.nits) == [p.nit_cliente for p in pedidos]
+    assert tabla.estados.tolist() == [p.estado_pedido.value for p in pedidos]
+    assert tabla.valores_centavos.tolist() == [
+        int((p.valor_neto * 100).quantize(Decimal(1), rounding="ROUND_HALF_UP")) for p in pedidos
+    ]
+    assert tabla.fechas.tolist() == [p.fecha_pedido for p in pedidos]
+    assert tabla.plazos.tolist() == [p.plazo_dias_credito for p in pedidos]
+    assert tabla.fechas_vencimiento().tolist() == [p.fecha_vencimiento for p in pedidos]
+    assert tabla.valores_centavos[list(tabla.ids).index("centavos")] == 1235
+
+
+def test_tabla_pedidos_credito_por_fragmentos():
+    referencia = _pedidos_en_memoria()
+    completa = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_tabla_pedidos_credito()
+
+    por_fragmentos = FirebaseRepositorioPedidos(
+        firebase_reference=referencia, modo_consulta="fragmentos", tamano_fragmento=50, hilos_consulta=3
+    ).obtener_tabla_pedidos_credito()
+
+    assert sorted(por_fragmentos.ids) == sorted(completa.ids)
+    assert por_fragmentos.totales_por_nit() == {nit: completa.totales_por_nit()[nit] for nit in por_fragmentos.totales_por_nit()}
+
+
+def test_tabla_pedidos_credito_con_valor_neto_malformado():
+    from infrastructure.repositories.firebase_repositorio_pedidos import centavos_valores_netos
+
+    centavos, validos = centavos_valores_netos([5, [1, 2]])
+    assert centavos.tolist() == [500, 0]
+    assert validos.tolist() == [True, False]
+
+    referencia = _pedidos_en_memoria()
+    base = {"nit": "1", "estado": 5, "valor": {"neto": 1000}, "hora_despacho": "01/01/2025 10:00", "forma_pago": "A 30 días"}
+    referencia.update({"lista": {**base, "valor": {"neto": [1, 2]}}})
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia)
+    pedidos = repositorio.obtener_pedidos_credito()
+    descartes = repositorio.ultimos_descartes
+
+    tabla = repositorio.obtener_tabla_pedidos_credito()
+
+    assert descartes["error_conversion"] == 1
+    assert repositorio.ultimos_descartes == descartes
+    assert list(tabla.ids) == [p.id_pedido for p in pedidos]
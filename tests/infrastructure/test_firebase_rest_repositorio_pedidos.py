@@ -0,0 +1,46 @@
+# tests\infrastructure\test_firebase_rest_repositorio_pedidos.py
+
+import asyncio
+
+import pytest
+
+from benchmarks.generador_pedidos import generar_pedidos_crudos
+from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+from benchmarks.servidor_rtdb_local import ServidorRTDBLocal
+from infrastructure.repositories.firebase_repositorio_pedidos import FirebaseRepositorioPedidos, variantes_literales_nit
+from infrastructure.repositories.firebase_rest_repositorio_pedidos import FirebaseRestRepositorioPedidos
+
+
+@pytest.fixture
+def servidor():
+    raiz = ReferenciaEnMemoria({"pedidos": generar_pedidos_crudos(400, numero_clientes=50, dias_historia=365, semilla=3)})
+    with ServidorRTDBLocal(raiz) as servidor:
+        yield servidor
+
+
+def _ids(pedidos):
+    return sorted(p.id_pedido for p in pedidos)
+
+
+@pytest.mark.parametrize("modo_consulta", ["completo", "estado", "fecha", "fragmentos"])
+def test_rest_devuelve_los_mismos_pedidos_que_el_sdk(servidor, modo_consulta):
+    referencia = servidor.raiz.child("pedidos")
+    sdk = FirebaseRepositorioPedidos(firebase_reference=referencia, modo_consulta=modo_consulta)
+    rest = FirebaseRestRepositorioPedidos(servidor.url, modo_consulta=modo_consulta, tamano_fragmento=60)
+
+    assert _ids(rest.obtener_pedidos_credito()) == _ids(sdk.obtener_pedidos_credito())
+
+
+def test_rest_async_y_consulta_por_nit(servidor):
+    referencia = servidor.raiz.child("pedidos")
+    completo = FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito()
+    nits = sorted({p.nit_cliente for p in completo})[:6]
+    repositorio = FirebaseRestRepositorioPedidos(servidor.url, consulta_por_nit=True, max_conexiones=3)
+
+    asincronos = asyncio.run(repositorio.obtener_pedidos_credito_async())
+    servidor.peticiones = 0
+    por_nit = repositorio.obtener_pedidos_credito_para_nits(nits)
+
+    assert _ids(asincronos) == _ids(completo)
+    assert _ids(por_nit) == _ids(p for p in completo if p.nit_cliente in nits)
+    assert servidor.peticiones == len({v for nit in nits for v in variantes_literales_nit(nit)})
@@ -5,7 +5,11 @@ import pytest
 from unittest.mock import MagicMock, patch
 import pandas as pd
 from decimal import Decimal
-from infrastructure.repositories.r1108_repositorio_cartera import RepositorioCartera
+from infrastructure.repositories.r1108_repositorio_cartera import (
+    RepositorioCartera,
+    centavos_de_columna,
+    detectar_encoding,
+)
 from domain.models.models import EstadoPedido, Pedido, EstadoPago
 from infrastructure.repositories.firebase_repositorio_pedidos import FirebaseRepositorioPedidos
 
@@ -183,8 +187,8 @@ def test_obtener_pedidos_credito_multiple_matches_in_csv(repositorio_cartera, mo
     repositorio_cartera.df = pd.DataFrame({
         "nit": ["123456789", "123456789"],
         "numero": ["001", "001"],
-        "valor": [Decimal("1000.00"), Decimal("1000.00")],
-        "aplicado": [Decimal("500.00"), Decimal("600.00")]
+        "valor_centavos": [100000, 100000],
+        "aplicado_centavos": [50000, 60000]
     })
     mock_firebase_repo.obtener_pedidos_credito.return_value = [
         Pedido(
@@ -202,3 +206,112 @@ def test_obtener_pedidos_credito_multiple_matches_in_csv(repositorio_cartera, mo
     pedidos = repositorio_cartera.obtener_pedidos_credito()
     assert len(pedidos) == 1
     assert pedidos[0].valor_cobrado == Decimal("500.00")  # First match used
+
+# A configured encoding is used as-is, without running chardet.
+def test_encoding_configurado_omite_la_deteccion(mock_firebase_repo, tmp_path):
+    csv_file = tmp_path / "cartera.csv"
+    csv_file.write_bytes("nit,Número,Valor,Aplicado,Fecha\n123456789,001,1000.00,500.00,2025-02-27\n".encode("cp1252"))
+    with patch("infrastructure.repositories.r1108_repositorio_cartera.detectar_encoding") as mock_detectar:
+        repo = RepositorioCartera(mock_firebase_repo, str(csv_file), encoding="cp1252")
+    mock_detectar.assert_not_called()
+    assert repo.df["numero"].tolist() == ["001"]
+
+# The detected encoding is remembered per file fingerprint and redetected once the file changes.
+def test_encoding_detectado_se_recuerda_por_huella(mock_firebase_repo, mock_csv_path, monkeypatch):
+    monkeypatch.setattr(RepositorioCartera, "_encodings_por_huella", {})
+    with patch(
+        "infrastructure.repositories.r1108_repositorio_cartera.detectar_encoding", return_value="utf-8"
+    ) as mock_detectar:
+        RepositorioCartera(mock_firebase_repo, mock_csv_path)
+        RepositorioCartera(mock_firebase_repo, mock_csv_path)
+        assert mock_detectar.call_count == 1
+        with open(mock_csv_path, "a", encoding="utf-8") as f:
+            f.write("\n333333333,005,100.00,,2024-07-01")
+        RepositorioCartera(mock_firebase_repo, mock_csv_path)
+        assert mock_detectar.call_count == 2
+
+# Detection stops at the sample; an accented latin-1 row beyond it falls back to a full-file detection.
+def test_muestra_engañosa_recurre_a_deteccion_completa(mock_firebase_repo, tmp_path, monkeypatch):
+    monkeypatch.setattr(RepositorioCartera, "_encodings_por_huella", {})
+    filas = "".join(f"1{i:08d},{i:07d},1000.00,0.00,2025-02-27\n" for i in range(3000))
+    csv_file = tmp_path / "cartera.csv"
+    csv_file.write_bytes(("nit,Numero,Valor,Aplicado,Fecha\n" + filas + "999999999,ÑANDÚ,10.00,0.00,2025-02-27\n").encode("latin-1"))
+    assert detectar_encoding(str(csv_file), bytes_muestra=16 * 1024) == "utf-8"
+    with patch(
+        "infrastructure.repositories.r1108_repositorio_cartera.detectar_encoding", return_value="utf-8"
+    ):
+        repo = RepositorioCartera(mock_firebase_repo, str(csv_file))
+    assert len(repo.df) == 3001
+    assert "999999999" in repo.df["nit"].tolist()
+
+# Money columns are parsed to exact int64 cents, rounding half up.
+def test_centavos_de_columna_exactos():
+    valores = pd.Series(["1,234.56", "0.005", "-10.125", "7", ".5", "", None, "99999999999999.99"])
+    centavos = centavos_de_columna(valores)
+    assert centavos.dtype == "int64"
+    assert centavos.tolist() == [123456, 1, -1013, 700, 50, 0, 0, 9999999999999999]
+
+# Non-numeric money values are rejected with a ValueError naming the column.
+def test_centavos_de_columna_invalidos():
+    with pytest.raises(ValueError, match="aplicado"):
+        centavos_de_columna(pd.Series(["1.00", "abc", "1e3"]), "aplicado")
+
+# The prepared frame holds int64 cents and the Pedido gets a Decimal.
+def test_cartera_en_centavos(repositorio_cartera, mock_firebase_repo):
+    assert repositorio_cartera.df["aplicado_centavos"].dtype == "int64"
+    assert "aplicado" not in repositorio_cartera.df.columns
+    mock_firebase_repo.obtener_pedidos_credito.return_value = [
+        Pedido(
+            nit_cliente="123456789",
+            id_pedido="001",
+            valor_neto=Decimal("1000.00"),
+            valor_cobrado=Decimal("0.00"),
+            estado_pago=EstadoPago.PENDIENTE,
+            estado_pedido=EstadoPedido.DESPACHADO,
+            fecha_pedido=datetime.strptime("2025-02-27", "%Y-%m-%d").date(),
+            forma_pago_raw="A 20 días (10%)"
+        )
+    ]
+    pedido = repositorio_cartera.obtener_pedidos_credito()[0]
+    assert isinstance(pedido.valor_cobrado, Decimal)
+    assert pedido.valor_cobrado == Decimal("500.00")
+
+def _pedido_001(valor_neto="1000.00"):
+    return Pedido(
+        nit_cliente="123456789",
+        id_pedido="001",
+        valor_neto=Decimal(valor_neto),
+        valor_cobrado=Decimal("0.00"),
+        estado_pago=EstadoPago.PENDIENTE,
+        estado_pedido=EstadoPedido.DESPACHADO,
+        fecha_pedido=datetime.strptime("2025-02-27", "%Y-%m-%d").date(),
+        forma_pago_raw="A 20 días (10%)"
+    )
+
+# The (nit, numero) lookup is built once and rebuilt when the DataFrame is replaced.
+def test_lookup_se_reconstruye_al_reemplazar_df(repositorio_cartera, mock_firebase_repo):
+    mock_firebase_repo.obtener_pedidos_credito.side_effect = lambda: [_pedido_001()]
+    assert repositorio_cartera.obtener_pedidos_credito()[0].valor_cobrado == Decimal("500.00")
+    lookup = repositorio_cartera._lookup_cartera
+    repositorio_cartera.obtener_pedidos_credito()
+    assert repositorio_cartera._lookup_cartera is lookup
+
+    repositorio_cartera.df = pd.DataFrame({
+        "nit": ["123456789"], "numero": ["001"], "valor_centavos": [100000], "aplicado_centavos": [100000]
+    })
+    pedido = repositorio_cartera.obtener_pedidos_credito()[0]
+    assert pedido.valor_cobrado == Decimal("1000.00")
+    assert pedido.estado_pago == EstadoPago.PAGADO
+
+# Repeated (nit, numero) rows in the CSV resolve to the earliest fecha, whatever the file order.
+def test_duplicados_del_csv_se_resuelven_por_fecha(mock_firebase_repo, tmp_path):
+    csv_file = tmp_path / "cartera.csv"
+    csv_file.write_text(
+        "nit,Número,Valor,Aplicado,Fecha\n"
+        "123456789,001,1000.00,700.00,2025-03-01 00:00:00\n"
+        "123456789,001,1000.00,300.00,2025-01-01 00:00:00\n"
+        "123456789,001,1000.00,900.00,2025-02-01 00:00:00\n"
+    )
+    repo = RepositorioCartera(mock_firebase_repo, str(csv_file))
+    mock_firebase_repo.obtener_pedidos_credito.return_value = [_pedido_001()]
+    assert repo.obtener_pedidos_credito()[0].valor_cobrado == Decimal("300.00")
@@ -0,0 +1,72 @@
+# tests\infrastructure\test_repositorio_pedidos_en_cache.py
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from domain.models.models import EstadoPedido, Pedido
+from infrastructure.repositories.repositorio_pedidos_en_cache import RepositorioPedidosEnCache
+
+
+def _pedido():
+    return Pedido(
+        id_pedido="f1",
+        nit_cliente="12345",
+        valor_neto=Decimal("300.00"),
+        fecha_pedido=date(2025, 3, 1),
+        estado_pedido=EstadoPedido.DESPACHADO,
+        plazo_dias_credito=15,
+    )
+
+
+def test_carga_una_sola_vez_mientras_esta_vigente():
+    repositorio = MagicMock()
+    repositorio.obtener_pedidos_credito.return_value = [_pedido()]
+    fabrica = MagicMock(return_value=repositorio)
+    en_cache = RepositorioPedidosEnCache(fabrica, segundos_vigencia=60)
+
+    en_cache.obtener_pedidos_credito()
+    en_cache.obtener_pedidos_credito()
+
+    fabrica.assert_called_once()
+    repositorio.obtener_pedidos_credito.assert_called_once()
+
+
+def test_devuelve_copias_independientes():
+    repositorio = MagicMock()
+    repositorio.obtener_pedidos_credito.return_value = [_pedido()]
+    en_cache = RepositorioPedidosEnCache(lambda: repositorio)
+
+    primera = en_cache.obtener_pedidos_credito()
+    primera[0].valor_cobrado = Decimal("300.00")
+
+    assert en_cache.obtener_pedidos_credito()[0].valor_cobrado == Decimal("0.0")
+
+
+def test_recarga_al_vencer_o_invalidar():
+    repositorio = MagicMock()
+    repositorio.obtener_pedidos_credito.return_value = [_pedido()]
+    fabrica = MagicMock(return_value=repositorio)
+
+    vencido = RepositorioPedidosEnCache(fabrica, segundos_vigencia=0)
+    vencido.obtener_pedidos_credito()
+    vencido.obtener_pedidos_credito()
+    assert fabrica.call_count == 2
+
+    fabrica.reset_mock()
+    vigente = RepositorioPedidosEnCache(fabrica, segundos_vigencia=60)
+    vigente.obtener_pedidos_credito()
+    vigente.invalidar()
+    vigente.obtener_pedidos_credito()
+    assert fabrica.call_count == 2
+
+
+def test_obtener_pedidos_credito_para_nits_filtra_por_nit_normalizado():
+    repositorio = MagicMock()
+    otro = _pedido().model_copy(update={"id_pedido": "f2", "nit_cliente": "999"})
+    repositorio.obtener_pedidos_credito.return_value = [_pedido(), otro]
+    en_cache = RepositorioPedidosEnCache(lambda: repositorio)
+
+    pedidos = en_cache.obtener_pedidos_credito_para_nits(["0012345"])
+
+    assert [p.id_pedido for p in pedidos] == ["f1"]
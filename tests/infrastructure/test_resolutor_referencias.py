@@ -0,0 +1,98 @@
+# tests\infrastructure\test_resolutor_referencias.py
+
+import os
+import subprocess
+import sys
+import pytest
+
+from infrastructure.extractors.resolutor_referencias import (
+    ResolutorReferencias,
+    construir_indice,
+    normalizar_referencia,
+)
+
+
+@pytest.fixture
+def ruta_indice(tmp_path):
+    ruta = str(tmp_path / "referencias.sqlite")
+    construir_indice(ruta, [("0084146038", "70825190"), ("8305009602", "830500960")])
+    return ruta
+
+
+def test_normalizar_referencia():
+    assert normalizar_referencia("000123") == "123"
+    assert normalizar_referencia(" 123 ") == "123"
+
+
+def test_resolver_con_y_sin_ceros(ruta_indice):
+    resolutor = ResolutorReferencias(ruta_indice)
+    assert resolutor.resolver("0084146038") == "70825190"
+    assert resolutor.resolver("84146038") == "70825190"
+    assert resolutor.resolver("8305009602") == "830500960"
+
+
+def test_resolver_sin_mapeo(ruta_indice):
+    resolutor = ResolutorReferencias(ruta_indice)
+    assert resolutor.resolver("123456789") == "123456789"
+    # Una referencia con ceros sin mapeo suele ser un número de cuenta, no un NIT
+    assert resolutor.resolver("00999") == ""
+
+
+def test_resolver_referencia_con_ceros_contra_nits_conocidos(ruta_indice):
+    llamadas = []
+
+    def nits_conocidos():
+        llamadas.append(1)
+        return ["900123456", "12345"]
+
+    resolutor = ResolutorReferencias(ruta_indice, nits_conocidos=nits_conocidos)
+    # NIT con ceros y NIT+DV con ceros (DV de 900123456 = 8)
+    assert resolutor.resolver("000900123456") == "900123456"
+    assert resolutor.resolver("0009001234568") == "900123456"
+    assert resolutor.resolver("0012345") == "12345"
+    # Sin NIT conocido sigue descartándose
+    assert resolutor.resolver("00999") == ""
+    # El mapeo tiene prioridad y los NIT conocidos se piden una sola vez
+    assert resolutor.resolver("0084146038") == "70825190"
+    assert len(llamadas) == 1
+
+
+def test_resolver_con_fallo_al_obtener_nits_conocidos(ruta_indice):
+    def nits_conocidos():
+        raise FileNotFoundError("cartera.csv")
+
+    resolutor = ResolutorReferencias(ruta_indice, nits_conocidos=nits_conocidos)
+    assert resolutor.resolver("000900123456") == ""
+    assert resolutor.resolver("123456789") == "123456789"
+
+
+def test_carga_perezosa_y_recarga_al_cambiar_el_archivo(ruta_indice):
+    resolutor = ResolutorReferencias(ruta_indice, intervalo_revision_s=0)
+    assert resolutor._mapeo is None
+    assert len(resolutor) == 2
+
+    construir_indice(ruta_indice, [("555", "111"), ("556", "112"), ("557", "113")])
+    stat = os.stat(ruta_indice)
+    os.utime(ruta_indice, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert resolutor.resolver("555") == "111"
+    assert len(resolutor) == 3
+
+
+def test_sin_indice_usa_semilla_extra_ref(tmp_path):
+    resolutor = ResolutorReferencias(str(tmp_path / "no_existe.sqlite"))
+    assert resolutor.resolver("0084146038") == "70825190"
+    assert not os.path.exists(tmp_path / "no_existe.sqlite")
+
+
+def test_el_extractor_no_importa_extra_ref():
+    codigo = (
+        "import sys;"
+        "import infrastructure.extractors.extractor_de_pagos_por_nit_bancolombia;"
+        "print('infrastructure.extractors.EXTRA_REF' in sys.modules)"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    )
+    assert salida.stdout.strip() == "False"
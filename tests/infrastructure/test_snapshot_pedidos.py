@@ -0,0 +1,87 @@
+# tests\infrastructure\test_snapshot_pedidos.py
+
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+from benchmarks.generador_pedidos import generar_pedidos_crudos
+from benchmarks.rtdb_en_memoria import ReferenciaEnMemoria
+from infrastructure.repositories.firebase_repositorio_pedidos import FirebaseRepositorioPedidos
+from infrastructure.repositories.snapshot_pedidos import SnapshotPedidos, crear_snapshot_pedidos
+
+
+@pytest.fixture
+def referencia():
+    pedidos = generar_pedidos_crudos(300, numero_clientes=40, dias_historia=200, semilla=5)
+    return ReferenciaEnMemoria({"pedidos": pedidos}).child("pedidos")
+
+
+def _ids(pedidos):
+    return sorted(p.id_pedido for p in pedidos)
+
+
+def _marca_siguiente(referencia):
+    return max(data["actualizado_en"] for data in referencia.get().values()) + 1
+
+
+def test_arranque_en_frio_y_luego_delta(referencia, tmp_path):
+    ruta = str(tmp_path / "pedidos.json.gz")
+    repositorio = FirebaseRepositorioPedidos(firebase_reference=referencia, snapshot=SnapshotPedidos(ruta))
+    repositorio.obtener_pedidos_credito()
+    assert repositorio.snapshot.ultima_sincronizacion["modo"] == "completo"
+
+    # Cambios en Firebase: un pedido nuevo a crédito y uno existente que se anula
+    marca = _marca_siguiente(referencia)
+    candidato = next(i for i, d in referencia.get().items() if d["estado"] == 2 and "DIAS" in d["forma_pago"].upper())
+    referencia.update({
+        "-NUEVO": {
+            "nit": "900100200", "estado": 2, "valor": {"neto": 1000}, "forma_pago": "CREDITO A 30 DIAS",
+            "hora_despacho": datetime.now().strftime("%d/%m/%Y %H:%M"), "actualizado_en": marca,
+        },
+        f"{candidato}/estado": 4,
+        f"{candidato}/actualizado_en": marca,
+    })
+
+    # Nueva ejecución: el snapshot se lee del disco y sólo se descargan los cambios
+    snapshot = SnapshotPedidos(ruta)
+    referencia.estadisticas.reiniciar()
+    pedidos = FirebaseRepositorioPedidos(firebase_reference=referencia, snapshot=snapshot).obtener_pedidos_credito()
+
+    # start_at es inclusivo: además de los 2 cambios vuelve el pedido de la marca de agua anterior
+    assert snapshot.ultima_sincronizacion == {"modo": "delta", "cambios": 3}
+    assert referencia.estadisticas.nodos == 3
+    assert _ids(pedidos) == _ids(FirebaseRepositorioPedidos(firebase_reference=referencia).obtener_pedidos_credito())
+    assert "-NUEVO" in _ids(pedidos) and candidato not in _ids(pedidos)
+
+
+def test_archivo_compacto_solo_con_candidatos(referencia, tmp_path):
+    ruta = tmp_path / "pedidos.json.gz"
+    snapshot = SnapshotPedidos(str(ruta))
+    FirebaseRepositorioPedidos(firebase_reference=referencia, snapshot=snapshot).obtener_pedidos_credito()
+
+    with gzip.open(ruta, "rt", encoding="utf-8") as f:
+        contenido = json.load(f)
+    assert contenido["marca_agua"] == _marca_siguiente(referencia) - 1
+    assert len(contenido["pedidos"]) < len(referencia.get())
+    assert all("productos" not in data for data in contenido["pedidos"].values())
+
+
+def test_sin_marca_de_agua_o_vencido_descarga_completo(tmp_path):
+    referencia = ReferenciaEnMemoria({"pedidos": {"a": {"estado": 2}}}).child("pedidos")
+    sin_marca = SnapshotPedidos(str(tmp_path / "a.json.gz"))
+    sin_marca.sincronizar(referencia, referencia.get, lambda item: True)
+    sin_marca.sincronizar(referencia, referencia.get, lambda item: True)
+    assert sin_marca.ultima_sincronizacion["modo"] == "completo"
+
+    referencia.child("a/actualizado_en").set(1)
+    vencido = SnapshotPedidos(str(tmp_path / "b.json.gz"), max_edad_s=-1)
+    vencido.sincronizar(referencia, referencia.get, lambda item: True)
+    vencido.sincronizar(referencia, referencia.get, lambda item: True)
+    assert vencido.ultima_sincronizacion["modo"] == "completo"
+
+
+def test_crear_snapshot_desactivado_sin_ruta():
+    assert crear_snapshot_pedidos(None) is None
+    assert isinstance(crear_snapshot_pedidos("x.json.gz"), SnapshotPedidos)
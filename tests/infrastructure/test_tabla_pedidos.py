@@ -0,0 +1,56 @@
+# tests\infrastructure\test_tabla_pedidos.py
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from infrastructure.repositories.firebase_repositorio_pedidos import centavos_valores_netos, fechas_despacho
+from infrastructure.repositories.tabla_pedidos import TablaPedidos
+
+
+def _tabla() -> TablaPedidos:
+    return TablaPedidos(
+        ids=np.array(["a", "b", "c"]),
+        nits=np.array(["900", "800", "900"]),
+        estados=np.array([2, 5, 2], dtype=np.int8),
+        valores_centavos=np.array([100_000, 250_050, 50], dtype=np.int64),
+        fechas=np.array(["2025-04-01", "2025-04-02", "2025-04-03"], dtype="datetime64[D]"),
+        plazos=np.array([30, 0, 15], dtype=np.int32),
+    )
+
+
+def test_tabla_pedidos_agrega_y_filtra_por_nit():
+    tabla = _tabla()
+
+    assert tabla.totales_por_nit() == {"900": 100_050, "800": 250_050}
+    assert list(tabla.de_nits(["800"]).ids) == ["b"]
+    assert tabla.fechas_vencimiento(dias_gracia=2).tolist() == [date(2025, 5, 3), date(2025, 4, 4), date(2025, 4, 20)]
+    assert list(tabla.a_dataframe().columns) == [
+        "nit", "id_pedido", "estado", "valor_neto_centavos", "fecha_pedido", "plazo_dias",
+    ]
+
+
+def test_tabla_pedidos_concatenar_y_vacia():
+    tabla = _tabla()
+
+    unida = TablaPedidos.concatenar([tabla.filtrar(np.array([0])), TablaPedidos.vacia(), tabla.filtrar(np.array([1, 2]))])
+
+    assert list(unida.ids) == ["a", "b", "c"]
+    assert len(TablaPedidos.concatenar([])) == 0
+    assert TablaPedidos.vacia().totales_por_nit() == {}
+    with pytest.raises(ValueError):
+        TablaPedidos(tabla.ids[:2], tabla.nits, tabla.estados, tabla.valores_centavos, tabla.fechas, tabla.plazos)
+
+
+def test_conversion_vectorizada_de_valores_y_fechas():
+    centavos, validos = centavos_valores_netos([1000, 0, -1])
+    assert centavos.tolist()[:2] == [100_000, 0] and validos.tolist() == [True, True, False]
+
+    centavos, validos = centavos_valores_netos([1000, "12.345", 0.125, "abc", float("inf")])
+    assert centavos[validos].tolist() == [100_000, 1235, 13]
+    assert validos.tolist() == [True, True, True, False, False]
+
+    fechas = fechas_despacho(["05/03/2025 14:30", " 5/3/2025  9:05 ", "05/03/2025 25:00", "31/02/2025 10:00", 7])
+    assert fechas[:2].tolist() == [date(2025, 3, 5), date(2025, 3, 5)]
+    assert np.isnat(fechas[2:]).all()
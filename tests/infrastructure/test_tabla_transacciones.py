@@ -0,0 +1,89 @@
+# tests\infrastructure\test_tabla_transacciones.py
+
+import numpy as np
+import pytest
+
+from infrastructure.extractors.tabla_transacciones import (
+    TablaTransacciones,
+    TransaccionBancaria,
+    separador_decimal_de_valor,
+    valor_a_centavos,
+)
+
+
+@pytest.mark.parametrize(
+    "valor_str, esperado",
+    [
+        ("1,234,567.89", 123456789),
+        ("-20.00", -2000),
+        ("0.1", 10),
+        ("15", 1500),
+        ("0.005", 1),  # mitad hacia arriba
+        ("9,999,999,999,999.99", 999999999999999),
+    ],
+)
+def test_valor_a_centavos(valor_str, esperado):
+    assert valor_a_centavos(valor_str) == esperado
+
+
+def test_valor_a_centavos_invalido():
+    with pytest.raises(ValueError):
+        valor_a_centavos("1.2.3")
+
+
+def test_valor_a_centavos_con_coma_decimal():
+    assert valor_a_centavos("1.234.567,89", separador_decimal=",") == 123456789
+    assert valor_a_centavos("-20,5", separador_decimal=",") == -2050
+    # Con el separador equivocado el valor se rechaza en lugar de truncarse
+    with pytest.raises(ValueError):
+        valor_a_centavos("1.234,56")
+    with pytest.raises(ValueError):
+        valor_a_centavos("1,500.50", separador_decimal=",")
+
+
+@pytest.mark.parametrize(
+    "valor_str, esperado",
+    [
+        ("1,234.56", "."),
+        ("1.234,56", ","),
+        ("1.234.567", ","),
+        ("1,234,567", "."),
+        ("12,5", ","),
+        ("200.00", "."),
+        ("1.234", None),
+        ("1500", None),
+    ],
+)
+def test_separador_decimal_de_valor(valor_str, esperado):
+    assert separador_decimal_de_valor(valor_str) == esperado
+
+
+@pytest.fixture
+def tabla():
+    return TablaTransacciones.desde_transacciones([
+        TransaccionBancaria("2025/04/01", "987654321", "987654321", 10),
+        TransaccionBancaria("2025/04/01", "0084146038", "70825190", 50000),
+        TransaccionBancaria("2025/04/02", "987654321", "987654321", 20),
+    ])
+
+
+def test_columnas_tipadas(tabla):
+    assert len(tabla) == 3
+    assert tabla.montos_centavos.dtype == np.int64
+    assert tabla.fechas.dtype == np.dtype("datetime64[D]")
+    assert tabla.fechas[2] == np.datetime64("2025-04-02")
+    assert tabla.referencias[1] == "0084146038"
+
+
+def test_totales_por_nit_en_orden_de_aparicion(tabla):
+    assert tabla.totales_por_nit() == {"987654321": 30, "70825190": 50000}
+
+
+def test_iteracion_reconstruye_transacciones(tabla):
+    assert list(tabla)[1] == TransaccionBancaria("2025/04/01", "0084146038", "70825190", 50000)
+
+
+def test_tabla_vacia():
+    tabla = TablaTransacciones.desde_transacciones([])
+    assert len(tabla) == 0
+    assert tabla.totales_por_nit() == {}
@@ -0,0 +1,125 @@
+# tests\infrastructure\test_vigilante_directorio_pagos.py
+
+import json
+import os
+import pytest
+from unittest.mock import patch
+
+from infrastructure.watchers.vigilante_directorio_pagos import VigilanteDirectorioPagos
+
+
+@pytest.fixture
+def directorio_pagos(tmp_path):
+    (tmp_path / "ahorros").mkdir()
+    (tmp_path / "corriente").mkdir()
+    return tmp_path
+
+
+def _escribir(directorio, tipo_cuenta, fecha, contenido):
+    ruta = directorio / tipo_cuenta / f"{fecha}.pdf"
+    ruta.write_bytes(contenido)
+    return ruta
+
+
+def test_reporta_extracto_nuevo_cuando_esta_estable(directorio_pagos):
+    vigilante = VigilanteDirectorioPagos(str(directorio_pagos))
+    _escribir(directorio_pagos, "ahorros", "20250410", b"pdf 1")
+
+    assert vigilante.escanear() == []  # Primera observación: puede estar copiándose
+    assert vigilante.escanear() == [("20250410", "ahorros")]
+
+
+def test_no_reporta_procesados_ni_archivos_ajenos(directorio_pagos):
+    vigilante = VigilanteDirectorioPagos(str(directorio_pagos))
+    _escribir(directorio_pagos, "corriente", "20250410", b"pdf 1")
+    (directorio_pagos / "corriente" / "notas.txt").write_text("x")
+    vigilante.escanear()
+    vigilante.marcar_procesado("20250410", "corriente")
+
+    assert vigilante.escanear() == []
+    assert vigilante.escanear() == []
+
+
+def test_mismo_contenido_con_otro_mtime_no_se_reprocesa(directorio_pagos):
+    vigilante = VigilanteDirectorioPagos(str(directorio_pagos))
+    ruta = _escribir(directorio_pagos, "ahorros", "20250410", b"pdf 1")
+    vigilante.marcar_procesado("20250410", "ahorros")
+
+    os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 5_000_000_000))
+    assert vigilante.escanear() == []
+    assert vigilante.escanear() == []
+
+
+def test_contenido_modificado_se_reprocesa(directorio_pagos):
+    vigilante = VigilanteDirectorioPagos(str(directorio_pagos))
+    ruta = _escribir(directorio_pagos, "ahorros", "20250410", b"pdf 1")
+    vigilante.marcar_procesado("20250410", "ahorros")
+
+    ruta.write_bytes(b"pdf 1 con mas filas")
+    vigilante.escanear()
+    assert vigilante.escanear() == [("20250410", "ahorros")]
+
+
+def test_estado_persistido_y_linea_base(directorio_pagos, tmp_path):
+    ruta_estado = str(tmp_path / "estado" / "vigilante.json")
+    _escribir(directorio_pagos, "ahorros", "20250409", b"pdf viejo")
+    vigilante = VigilanteDirectorioPagos(str(directorio_pagos), ruta_estado=ruta_estado)
+    assert not vigilante.tiene_estado_previo
+    vigilante.establecer_linea_base()
+
+    reiniciado = VigilanteDirectorioPagos(str(directorio_pagos), ruta_estado=ruta_estado)
+    assert reiniciado.tiene_estado_previo
+    _escribir(directorio_pagos, "corriente", "20250410", b"pdf nuevo")
+    reiniciado.escanear()
+    assert reiniciado.escanear() == [("20250410", "corriente")]
+
+
+def test_fallo_se_reintenta_con_espera_y_se_abandona_tras_max_intentos(directorio_pagos, tmp_path):
+    ruta_estado = str(tmp_path / "vigilante.json")
+    vigilante = VigilanteDirectorioPagos(
+        str(directorio_pagos), ruta_estado=ruta_estado, max_intentos=2, espera_reintento_s=60
+    )
+    _escribir(directorio_pagos, "ahorros", "20250410", b"pdf que falla")
+    vigilante.escanear()
+    assert vigilante.escanear() == [("20250410", "ahorros")]
+
+    with patch("infrastructure.watchers.vigilante_directorio_pagos.time.time", return_value=1000.0):
+        assert vigilante.registrar_fallo("20250410", "ahorros")
+        # Dentro de la espera no se reporta ni se vuelve a leer el archivo
+        with patch("infrastructure.watchers.vigilante_directorio_pagos._hash_archivo") as hash_archivo:
+            assert vigilante.escanear() == []
+            hash_archivo.assert_not_called()
+
+    with patch("infrastructure.watchers.vigilante_directorio_pagos.time.time", return_value=1061.0):
+        assert vigilante.escanear() == [("20250410", "ahorros")]
+        assert not vigilante.registrar_fallo("20250410", "ahorros")
+
+    # Intentos agotados: no se reporta aunque pase el tiempo, ni tras reiniciar
+    with patch("infrastructure.watchers.vigilante_directorio_pagos.time.time", return_value=10 ** 9):
+        assert vigilante.escanear() == []
+        reiniciado = VigilanteDirectorioPagos(str(directorio_pagos), ruta_estado=ruta_estado, max_intentos=2)
+        reiniciado.escanear()
+        assert reiniciado.escanear() == []
+
+    # Un contenido nuevo vuelve a procesarse con los intentos desde cero
+    ruta = _escribir(directorio_pagos, "ahorros", "20250410", b"pdf corregido")
+    os.utime(ruta, ns=(os.stat(ruta).st_atime_ns, os.stat(ruta).st_mtime_ns + 1_000_000_000))
+    reiniciado.escanear()
+    assert reiniciado.escanear() == [("20250410", "ahorros")]
+    reiniciado.marcar_procesado("20250410", "ahorros")
+    with open(ruta_estado, encoding="utf-8") as f:
+        assert json.load(f)["fallos"] == {}
+
+
+def test_lee_el_estado_en_el_formato_anterior(directorio_pagos, tmp_path):
+    ruta = _escribir(directorio_pagos, "ahorros", "20250409", b"pdf viejo")
+    ruta_estado = tmp_path / "vigilante.json"
+    VigilanteDirectorioPagos(str(directorio_pagos), ruta_estado=str(ruta_estado)).establecer_linea_base()
+    procesados = json.loads(ruta_estado.read_text(encoding="utf-8"))["procesados"]
+    ruta_estado.write_text(json.dumps(procesados), encoding="utf-8")
+
+    vigilante = VigilanteDirectorioPagos(str(directorio_pagos), ruta_estado=str(ruta_estado))
+    vigilante.escanear()
+    assert vigilante.tiene_estado_previo
+    assert vigilante.escanear() == []
+    assert str(ruta) in procesados
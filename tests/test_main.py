@@ -2,7 +2,7 @@ from annotated_types import T
 import pytest
 from unittest.mock import patch, MagicMock
 from domain.models.models import TipoCuentaBancaria
-from main import main
+from main import main, vigilar
 
 @pytest.fixture
 def mock_app_config():
@@ -24,6 +24,7 @@ def mock_container():
         mock_container_instance.config.directorio_reportes.from_value = MagicMock()
         mock_container_instance.config.fecha_pdf.from_value = MagicMock()
         mock_container_instance.emparejador_pagos.return_value.ejecutar = MagicMock()
+        mock_container_instance.emparejador_pagos.return_value.ejecutar_todas = MagicMock()
         yield mock_container_instance
 
 
@@ -54,21 +55,56 @@ def test_main_success(mock_app_config, mock_container, mock_logger):
         )
         mock_container.config.fecha_pdf.from_value.assert_called_once_with("20250410")
 
-        # Verify use case execution
-        mock_container.emparejador_pagos.return_value.ejecutar.assert_any_call(
-            "20250410", tipo_cuenta=TipoCuentaBancaria.AHORROS.value
-        )
-        mock_container.emparejador_pagos.return_value.ejecutar.assert_any_call(
-            "20250410", tipo_cuenta=TipoCuentaBancaria.CORRIENTE.value
+        # Verify use case execution: both account types in a single run
+        mock_container.emparejador_pagos.assert_called_once()
+        mock_container.emparejador_pagos.return_value.ejecutar_todas.assert_called_once_with(
+            "20250410",
+            tipos_cuenta=[TipoCuentaBancaria.AHORROS.value, TipoCuentaBancaria.CORRIENTE.value],
         )
 
 
 def test_main_exception_handling(mock_app_config, mock_container, mock_logger):
     with patch("main.sys.stdout", new_callable=MagicMock):
         # Simulate an exception during use case execution
-        mock_container.emparejador_pagos.return_value.ejecutar.side_effect = Exception(
+        mock_container.emparejador_pagos.return_value.ejecutar_todas.side_effect = Exception(
             "Mocked exception"
         )
 
         with pytest.raises(Exception, match="Mocked exception"):
-            main("20250410")
\ No newline at end of file
+            main("20250410")
+
+def test_vigilar_procesa_solo_extractos_nuevos(mock_app_config, mock_container, mock_logger):
+    with patch("main.sys.stdout", new_callable=MagicMock), \
+            patch("main.VigilanteDirectorioPagos") as mock_vigilante_class, \
+            patch("main.time.sleep"):
+        vigilante = mock_vigilante_class.return_value
+        vigilante.tiene_estado_previo = False
+        vigilante.escanear.side_effect = [[("20250411", "ahorros")], []]
+
+        vigilar(max_iteraciones=2)
+
+        vigilante.establecer_linea_base.assert_called_once()
+        mock_container.config.fecha_pdf.from_value.assert_called_once_with("20250411")
+        mock_container.emparejador_pagos.return_value.ejecutar.assert_called_once_with(
+            "20250411", tipo_cuenta="ahorros"
+        )
+        vigilante.marcar_procesado.assert_called_once_with("20250411", "ahorros")
+
+
+def test_vigilar_reintenta_el_extracto_si_falla(mock_app_config, mock_container, mock_logger):
+    with patch("main.sys.stdout", new_callable=MagicMock), \
+            patch("main.VigilanteDirectorioPagos") as mock_vigilante_class, \
+            patch("main.time.sleep"):
+        vigilante = mock_vigilante_class.return_value
+        vigilante.tiene_estado_previo = True
+        # Un extracto no marcado sigue apareciendo en las revisiones siguientes
+        vigilante.escanear.side_effect = [[("20250411", "ahorros")], [("20250411", "ahorros")]]
+        mock_container.emparejador_pagos.return_value.ejecutar.side_effect = [
+            ConnectionError("Firebase no disponible"), None,
+        ]
+
+        vigilar(max_iteraciones=2)
+
+        assert mock_container.emparejador_pagos.return_value.ejecutar.call_count == 2
+        vigilante.registrar_fallo.assert_called_once_with("20250411", "ahorros")
+        vigilante.marcar_procesado.assert_called_once_with("20250411", "ahorros")